@@ -0,0 +1,204 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+try:
+    from .http_clients import upstream_clients
+    from .services import congress_service
+    from .snapshot import DATA_CACHE_DIR
+except ImportError:
+    from http_clients import upstream_clients
+    from services import congress_service
+    from snapshot import DATA_CACHE_DIR
+
+load_dotenv()
+
+ACTIVITY_PATH = Path(os.getenv("ACTIVITY_PATH", str(DATA_CACHE_DIR / "member-activity.sqlite3")))
+
+# Congress.gov's largest page
+ACTIVITY_PAGE_SIZE = 250
+
+# Activity kind -> (path segment under /member/{id}, key of the item list in the response)
+ACTIVITY_LISTS = {
+    "sponsored": ("sponsored-legislation", "sponsoredLegislation"),
+    "cosponsored": ("cosponsored-legislation", "cosponsoredLegislation"),
+}
+
+# First matching rule wins; phrases are matched against the lowercased latest action text
+STATUS_RULES = (
+    ("became_law", ("became public law", "became private law", "signed by president")),
+    ("vetoed", ("vetoed", "veto message")),
+    ("passed_chamber", ("passed", "agreed to", "presented to president", "resolving differences")),
+    ("reported", ("reported by", "ordered to be reported", "placed on", "calendar")),
+    ("in_committee", ("referred to", "subcommittee")),
+)
+
+
+def bill_status(latest_action: Optional[dict]) -> str:
+    """Coarse status of a bill from the text of its latest action"""
+    text = ((latest_action or {}).get("text") or "").lower()
+    for status, phrases in STATUS_RULES:
+        if any(p in text for p in phrases):
+            return status
+    return "introduced"
+
+
+def _ranked(counts: Counter) -> Dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+def summarize(items: List[dict]) -> dict:
+    """Counts of sponsored or cosponsored items by Congress, policy area and status"""
+    by_congress: Counter = Counter()
+    by_policy_area: Counter = Counter()
+    by_status: Counter = Counter()
+    amendments = 0
+    latest = None
+    for item in items:
+        by_congress[str(item.get("congress") or "unknown")] += 1
+        introduced = item.get("introducedDate")
+        if introduced and (latest is None or introduced > latest):
+            latest = introduced
+        # Amendments carry an amendmentNumber instead of a bill type, and no policy area
+        if item.get("amendmentNumber") and not item.get("type"):
+            amendments += 1
+            continue
+        by_policy_area[((item.get("policyArea") or {}).get("name")) or "Unspecified"] += 1
+        by_status[bill_status(item.get("latestAction"))] += 1
+    return {
+        "total": len(items),
+        "bills": len(items) - amendments,
+        "amendments": amendments,
+        "latest_introduced": latest,
+        # Newest Congress first, numerically; items without one go last
+        "by_congress": dict(sorted(
+            by_congress.items(), key=lambda kv: (kv[0] != "unknown", int(kv[0]) if kv[0].isdigit() else -1), reverse=True
+        )),
+        "by_policy_area": _ranked(by_policy_area),
+        "by_status": _ranked(by_status),
+    }
+
+
+class ActivityStore:
+    """Computed member activity keyed by bioguide ID, tagged with the updateDate it was computed for"""
+
+    def __init__(self, path: Path = ACTIVITY_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS activity (bioguide_id TEXT PRIMARY KEY, update_date TEXT, "
+            "computed_at REAL NOT NULL, data BLOB NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, bioguide_id: str) -> Optional[Tuple[Optional[str], dict]]:
+        """(updateDate, activity) as last stored for a member"""
+        row = self._conn().execute(
+            "SELECT update_date, data FROM activity WHERE bioguide_id = ?", (bioguide_id,)
+        ).fetchone()
+        return (row[0], from_json(row[1])) if row else None
+
+    def put(self, bioguide_id: str, update_date: Optional[str], activity: dict) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO activity (bioguide_id, update_date, computed_at, data) VALUES (?, ?, ?, ?)",
+            (bioguide_id, update_date, activity["computed_at"], to_json(activity)),
+        )
+
+
+class ActivityService:
+    """Sponsorship activity per member, recomputed only when Congress.gov's updateDate for them changes"""
+
+    def __init__(self):
+        self._store: Optional[ActivityStore] = None
+        self._store_failed = False
+        # (bioguide ID, updateDate) -> computation in flight
+        self._inflight: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
+
+    def _open_store(self) -> Optional[ActivityStore]:
+        if self._store is None and not self._store_failed:
+            try:
+                self._store = ActivityStore()
+            except (OSError, sqlite3.Error):
+                # Still served, just recomputed on every request
+                self._store_failed = True
+        return self._store
+
+    async def _update_date(self, bioguide_id: str) -> Optional[str]:
+        on_roster, update_date = await congress_service.member_update_date(bioguide_id)
+        if on_roster:
+            return update_date
+        # Former members are not on the current roster; their own record has the date
+        response = await upstream_clients.congress.get(f"/member/{bioguide_id}")
+        response.raise_for_status()
+        return response.json().get("member", {}).get("updateDate")
+
+    async def _fetch_list(self, bioguide_id: str, path: str, key: str) -> List[dict]:
+        """Every item of one of a member's legislation lists; pages after the first are fetched together"""
+        client = upstream_clients.congress
+        url = f"/member/{bioguide_id}/{path}"
+
+        async def page(offset: int) -> dict:
+            response = await client.get(url, params={"offset": offset, "limit": ACTIVITY_PAGE_SIZE})
+            response.raise_for_status()
+            return response.json()
+
+        first = await page(0)
+        items = list(first.get(key, []))
+        count = first.get("pagination", {}).get("count", len(items))
+        for data in await asyncio.gather(*(page(o) for o in range(ACTIVITY_PAGE_SIZE, count, ACTIVITY_PAGE_SIZE))):
+            items.extend(data.get(key, []))
+        return items
+
+    async def _compute(self, bioguide_id: str, update_date: Optional[str]) -> dict:
+        lists = await asyncio.gather(
+            *(self._fetch_list(bioguide_id, path, key) for path, key in ACTIVITY_LISTS.values())
+        )
+        activity = {
+            "bioguide_id": bioguide_id,
+            "update_date": update_date,
+            "computed_at": time.time(),
+            **{kind: summarize(items) for kind, items in zip(ACTIVITY_LISTS, lists)},
+        }
+        store = self._open_store()
+        if store is not None:
+            await asyncio.to_thread(store.put, bioguide_id, update_date, activity)
+        return activity
+
+    async def activity(self, bioguide_id: str) -> dict:
+        bioguide_id = bioguide_id.upper()
+        update_date = await self._update_date(bioguide_id)
+        store = self._open_store()
+        if store is not None:
+            stored = await asyncio.to_thread(store.get, bioguide_id)
+            if stored is not None and stored[0] == update_date:
+                return stored[1]
+
+        # Concurrent requests for the same member share one fan-out
+        key = (bioguide_id, update_date)
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._compute(bioguide_id, update_date))
+            future.add_done_callback(lambda f: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+
+activity_service = ActivityService()
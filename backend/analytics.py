@@ -0,0 +1,187 @@
+import asyncio
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+try:
+    from .contributions import contribution_service, DIMENSIONS, SIZE_BUCKETS, from_day, split_donor
+except ImportError:
+    from contributions import contribution_service, DIMENSIONS, SIZE_BUCKETS, from_day, split_donor
+
+load_dotenv()
+
+# Committee frames kept in memory; the least recently used is dropped first
+ANALYTICS_CACHE_FRAMES = int(os.getenv("ANALYTICS_CACHE_FRAMES", "16"))
+
+METRICS = ("distribution", "small_dollar", "top_donors", "top_employers", "by_state", "timeseries")
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+# Lower edges of the amount histogram bins; the last bin is open-ended
+HISTOGRAM_EDGES = np.array([0, 25, 50, 100, 200, 500, 1000, 2000, 3300], dtype=np.float64)
+SMALL_DOLLAR_LIMIT = 200.0
+
+
+@dataclass(frozen=True)
+class ContributionFrame:
+    """A committee's stored Schedule A rows as NumPy columns"""
+    committee_id: str
+    cycle: int
+    # updated_at of the ledger the frame was loaded from
+    version: float
+    amount: np.ndarray
+    day: np.ndarray
+    size: np.ndarray
+    codes: Dict[str, np.ndarray]
+    values: Dict[str, List[str]]
+
+    @classmethod
+    def load(cls, committee_id: str, cycle: int, version: float, columns: dict, values: dict) -> "ContributionFrame":
+        # frombuffer shares memory with the arrays read from the store rather than copying them
+        return cls(
+            committee_id, cycle, version,
+            amount=np.frombuffer(columns["amount"], dtype=np.float64),
+            day=np.frombuffer(columns["day"], dtype=np.int32),
+            size=np.frombuffer(columns["size"], dtype=np.uint8),
+            codes={name: np.frombuffer(columns[name], dtype=np.uint32) for name in DIMENSIONS},
+            values={name: values.get(name, []) for name in DIMENSIONS},
+        )
+
+
+def _rounded(values: np.ndarray) -> List[float]:
+    return np.round(values, 2).tolist()
+
+
+def group_by(codes: np.ndarray, amount: np.ndarray, groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(total, count) per group code"""
+    return (
+        np.bincount(codes, weights=amount, minlength=groups),
+        np.bincount(codes, minlength=groups),
+    )
+
+
+def top_groups(frame: ContributionFrame, dimension: str, k: Optional[int]) -> List[dict]:
+    """Largest groups of a dimension by total, all of them when k is None"""
+    values = frame.values[dimension]
+    if not values:
+        return []
+    totals, counts = group_by(frame.codes[dimension], frame.amount, len(values))
+    if k is None or k >= len(values):
+        order = np.argsort(-totals, kind="stable")
+    else:
+        # Partition out the top k first so only they get sorted
+        head = np.argpartition(-totals, k - 1)[:k]
+        order = head[np.argsort(-totals[head], kind="stable")]
+    return [
+        {"name": values[i], "total": round(float(totals[i]), 2), "count": int(counts[i])}
+        for i in order.tolist()
+    ]
+
+
+def distribution(frame: ContributionFrame) -> dict:
+    """Quantiles and a histogram of contribution amounts; refunds are left out"""
+    amounts = frame.amount[frame.amount > 0]
+    if not amounts.size:
+        return {"count": 0, "mean": None, "quantiles": {}, "histogram": []}
+    bins = np.searchsorted(HISTOGRAM_EDGES, amounts, side="right") - 1
+    counts = np.bincount(bins, minlength=len(HISTOGRAM_EDGES))
+    totals = np.bincount(bins, weights=amounts, minlength=len(HISTOGRAM_EDGES))
+    edges = HISTOGRAM_EDGES.tolist()
+    return {
+        "count": int(amounts.size),
+        "mean": round(float(amounts.mean()), 2),
+        "quantiles": dict(zip((f"p{round(q * 100)}" for q in QUANTILES), _rounded(np.quantile(amounts, QUANTILES)))),
+        "histogram": [
+            {"min": lo, "max": hi, "count": int(c), "total": t}
+            for lo, hi, c, t in zip(edges, edges[1:] + [None], counts.tolist(), _rounded(totals))
+        ],
+    }
+
+
+def small_dollar(frame: ContributionFrame) -> dict:
+    """Share of itemized receipts at or under $200 (unitemized receipts never reach Schedule A)"""
+    totals, counts = group_by(frame.size, frame.amount, len(SIZE_BUCKETS))
+    total, count = float(totals.sum()), int(counts.sum())
+    return {
+        "limit": SMALL_DOLLAR_LIMIT,
+        "total": round(float(totals[0]), 2),
+        "share_of_total": round(float(totals[0]) / total, 4) if total else None,
+        "share_of_count": round(int(counts[0]) / count, 4) if count else None,
+    }
+
+
+def timeseries(frame: ContributionFrame, start: int, buckets: int, bucket_days: int, window: int) -> dict:
+    """Receipts per bucket on a shared axis with trailing `window`-bucket and cumulative sums"""
+    dated = frame.day > 0
+    index = (frame.day[dated] - start) // bucket_days
+    totals = np.bincount(index, weights=frame.amount[dated], minlength=buckets)[:buckets]
+    cumulative = np.concatenate(([0.0], np.cumsum(totals)))
+    lower = np.maximum(np.arange(1, buckets + 1) - window, 0)
+    return {
+        "totals": _rounded(totals),
+        "rolling": _rounded(cumulative[1:] - cumulative[lower]),
+        "cumulative": _rounded(cumulative[1:]),
+    }
+
+
+def compare(frames: Sequence[ContributionFrame], metrics: Sequence[str], top: int,
+            bucket_days: int, window: int) -> dict:
+    """Requested metrics for each frame; time series share one axis so committees line up"""
+    result: dict = {"committees": {}}
+    axis = None
+    if "timeseries" in metrics:
+        days = [f.day[f.day > 0] for f in frames]
+        days = [d for d in days if d.size]
+        if days:
+            first = int(min(d.min() for d in days))
+            last = int(max(d.max() for d in days))
+            axis = (first, (last - first) // bucket_days + 1)
+            result["axis"] = {"start": from_day(first), "bucket_days": bucket_days, "buckets": axis[1], "window": window}
+
+    for frame in frames:
+        out: dict = {"contributions": int(frame.amount.size), "total": round(float(frame.amount.sum()), 2)}
+        if "distribution" in metrics:
+            out["distribution"] = distribution(frame)
+        if "small_dollar" in metrics:
+            out["small_dollar"] = small_dollar(frame)
+        if "top_donors" in metrics:
+            out["top_donors"] = [split_donor(entry) for entry in top_groups(frame, "donor", top)]
+        if "top_employers" in metrics:
+            out["top_employers"] = top_groups(frame, "employer", top)
+        if "by_state" in metrics:
+            out["by_state"] = top_groups(frame, "state", None)
+        if "timeseries" in metrics:
+            out["timeseries"] = timeseries(frame, *axis, bucket_days, window) if axis else None
+        result["committees"][frame.committee_id] = out
+    return result
+
+
+class ContributionAnalytics:
+    """Loads committees' stored contributions as column frames and runs bulk analytics over them"""
+
+    def __init__(self, max_frames: int = ANALYTICS_CACHE_FRAMES):
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[Tuple[str, int], ContributionFrame]" = OrderedDict()
+
+    async def frame(self, committee_id: str, cycle: int, version: float) -> ContributionFrame:
+        """The committee's frame, reloaded when the ledger has been written since it was loaded"""
+        key = (committee_id.upper(), cycle)
+        frame = self._frames.get(key)
+        if frame is None or frame.version != version:
+            columns, values = await contribution_service.columns(*key)
+            frame = ContributionFrame.load(*key, version, columns, values)
+            self._frames[key] = frame
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+        return frame
+
+    async def compare(self, frames: Sequence[ContributionFrame], metrics: Sequence[str], top: int = 10,
+                      bucket_days: int = 7, window: int = 4) -> dict:
+        # NumPy releases the GIL for most of this, so keep it off the event loop
+        return await asyncio.to_thread(compare, frames, metrics, top, bucket_days, window)
+
+
+contribution_analytics = ContributionAnalytics()
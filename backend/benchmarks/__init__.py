@@ -0,0 +1 @@
+# Load/latency benchmark harness for the backend
@@ -0,0 +1,184 @@
+"""
+Local stand-in for api.congress.gov and api.open.fec.gov.
+
+Serves fixture data under /v3 (Congress.gov), /v1 (FEC), /legislators
+(congress-legislators files), /senate (senate.gov roll call XML) and /img
+(member portraits) with configurable
+latency and error injection, and counts every call so benchmarks can report
+upstream traffic. Configure with environment variables:
+
+    FAKE_LATENCY_MS          mean added latency per request (default 50)
+    FAKE_LATENCY_JITTER_MS   uniform +/- jitter around the mean (default 10)
+    FAKE_ERROR_RATE          fraction of requests answered with 503 (default 0)
+    FAKE_ROSTER_SNAPSHOT     recorded roster snapshot to replay instead of synthetic data
+
+Run: uvicorn benchmarks.fake_upstream:app --port 8900   (from backend/)
+"""
+
+import asyncio
+import os
+import random
+from collections import Counter
+from typing import List, Optional
+
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    from . import fixtures
+except ImportError:
+    import fixtures
+
+LATENCY_MS = float(os.getenv("FAKE_LATENCY_MS", "50"))
+LATENCY_JITTER_MS = float(os.getenv("FAKE_LATENCY_JITTER_MS", "10"))
+ERROR_RATE = float(os.getenv("FAKE_ERROR_RATE", "0"))
+
+ROSTER = fixtures.load_roster(os.getenv("FAKE_ROSTER_SNAPSHOT"))
+ROSTER_BY_ID = {m["bioguideId"]: m for m in ROSTER}
+LEGISLATORS = fixtures.legislators(ROSTER)
+
+calls: Counter = Counter()
+
+app = FastAPI(title="Fake upstream")
+
+
+@app.middleware("http")
+async def simulate_upstream(request: Request, call_next):
+    if request.url.path.startswith("/__"):
+        return await call_next(request)
+
+    calls[request.url.path.split("/")[1] + ":" + _route_name(request)] += 1
+    delay = max(0.0, LATENCY_MS + random.uniform(-LATENCY_JITTER_MS, LATENCY_JITTER_MS)) / 1000
+    if delay:
+        await asyncio.sleep(delay)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        return JSONResponse({"error": "injected failure"}, status_code=503)
+    response = await call_next(request)
+    response.headers["X-RateLimit-Limit"] = "1000000"
+    response.headers["X-RateLimit-Remaining"] = "999999"
+    return response
+
+
+def _route_name(request: Request) -> str:
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match.name == "FULL":
+            return route.name
+    return "unknown"
+
+
+@app.get("/__stats")
+async def stats():
+    return {"total": sum(calls.values()), "by_route": dict(calls)}
+
+
+@app.post("/__reset")
+async def reset():
+    calls.clear()
+    return {"ok": True}
+
+
+@app.get("/v3/member/congress/{congress}", name="member_list")
+async def member_list(congress: int, offset: int = 0, limit: int = 20):
+    return {
+        "members": ROSTER[offset:offset + limit],
+        "pagination": {"count": len(ROSTER)},
+    }
+
+
+@app.get("/v3/bill/{congress}", name="bill_list")
+async def bill_list(congress: int, offset: int = 0, limit: int = 20, fromDateTime: Optional[str] = None):
+    items = fixtures.bills(congress)
+    if fromDateTime:
+        items = [b for b in items if b["updateDate"] >= fromDateTime]
+    return {"bills": items[offset:offset + limit], "pagination": {"count": len(items)}}
+
+
+@app.get("/v3/bill/{congress}/{bill_type}/{number}", name="bill")
+async def bill(congress: int, bill_type: str, number: str):
+    return fixtures.bill_detail(congress, bill_type, number)
+
+
+@app.get("/v3/house-vote/{congress}/{session}", name="house_votes")
+async def house_votes(congress: int, session: int, offset: int = 0, limit: int = 20):
+    return fixtures.house_votes(congress, session, offset, limit)
+
+
+@app.get("/v3/house-vote/{congress}/{session}/{number}/members", name="house_vote_members")
+async def house_vote_members(congress: int, session: int, number: int):
+    return fixtures.house_vote_members(ROSTER, congress, session, number)
+
+
+@app.get("/senate/vote{congress_session}/vote_menu_{congress}_{session}.xml", name="senate_vote_menu")
+async def senate_vote_menu(congress_session: str, congress: int, session: int):
+    return Response(fixtures.senate_vote_menu(congress, session), media_type="application/xml")
+
+
+@app.get("/senate/vote{congress_session}/vote_{congress}_{session}_{number}.xml", name="senate_vote")
+async def senate_vote(congress_session: str, congress: int, session: int, number: int):
+    return Response(fixtures.senate_vote(ROSTER, congress, session, number), media_type="application/xml")
+
+
+@app.get("/img/member/{name}.jpg", name="portrait")
+async def portrait(name: str):
+    if name.split("_")[0].upper() not in ROSTER_BY_ID:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    return Response(fixtures.portrait(name), media_type="image/jpeg", headers={"ETag": f'"{name}"'})
+
+
+@app.get("/v3/member/{bioguide_id}/sponsored-legislation", name="sponsored_legislation")
+async def sponsored_legislation(bioguide_id: str, offset: int = 0, limit: int = 20):
+    return fixtures.member_legislation(bioguide_id, "sponsored", offset, limit)
+
+
+@app.get("/v3/member/{bioguide_id}/cosponsored-legislation", name="cosponsored_legislation")
+async def cosponsored_legislation(bioguide_id: str, offset: int = 0, limit: int = 20):
+    return fixtures.member_legislation(bioguide_id, "cosponsored", offset, limit)
+
+
+@app.get("/v3/member/{bioguide_id}", name="member")
+async def member(bioguide_id: str):
+    m = ROSTER_BY_ID.get(bioguide_id)
+    if m is None:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    return {"member": m}
+
+
+@app.get("/legislators/legislators-current.json", name="legislators_current")
+async def legislators_current():
+    return LEGISLATORS
+
+
+@app.get("/v1/candidates/search/", name="candidate_search")
+async def candidate_search(q: str = "", per_page: int = 1, candidate_id: List[str] = Query([])):
+    return fixtures.candidate_search(q, per_page, candidate_id)
+
+
+@app.get("/v1/candidate/{candidate_id}/totals/", name="candidate_totals")
+async def candidate_totals(candidate_id: str):
+    return fixtures.candidate_totals(candidate_id)
+
+
+@app.get("/v1/candidate/{candidate_id}/committees/", name="candidate_committees")
+async def candidate_committees(candidate_id: str):
+    return fixtures.candidate_committees(candidate_id)
+
+
+@app.get("/v1/candidates/totals/", name="candidates_totals")
+async def candidates_totals(candidate_id: List[str] = Query([])):
+    return fixtures.candidates_totals(candidate_id)
+
+
+@app.get("/v1/committees/", name="committees")
+async def committees(candidate_id: List[str] = Query([])):
+    return fixtures.committees_for(candidate_id)
+
+
+@app.get("/v1/schedules/schedule_a/", name="schedule_a")
+async def schedule_a(
+    committee_id: str = "", per_page: int = 20, sort: str = "", last_index: Optional[str] = None,
+    last_contribution_receipt_date: Optional[str] = None, min_date: Optional[str] = None,
+):
+    if sort == "contribution_receipt_date":
+        return fixtures.schedule_a_page(committee_id, per_page, last_index, last_contribution_receipt_date, min_date)
+    return fixtures.schedule_a(committee_id, per_page)
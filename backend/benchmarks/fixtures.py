@@ -0,0 +1,363 @@
+"""
+Fixture data served by the fake upstream.
+
+A recorded roster snapshot (see snapshot.py) is used when one is given, so
+benchmarks can replay real Congress.gov data; otherwise a deterministic
+synthetic roster of the same shape is generated.
+"""
+
+import random
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from ..roster_index import STATE_NAMES
+    from ..snapshot import read_snapshot
+except ImportError:
+    from roster_index import STATE_NAMES
+    from snapshot import read_snapshot
+
+PARTIES = ["Democratic", "Republican", "Independent"]
+
+
+def synthetic_roster(house_size: int = 435, seed: int = 119) -> List[dict]:
+    """Build a roster shaped like Congress.gov's member/congress/{n} listing"""
+    rng = random.Random(seed)
+    states = [name for abbr, name in STATE_NAMES.items() if abbr != "DC"]
+    members = []
+
+    def member(i: int, state: str, chamber: str, district: Optional[int]) -> dict:
+        bioguide_id = f"S{i:06d}"
+        m = {
+            "bioguideId": bioguide_id,
+            "name": f"Member{i}, Test",
+            "partyName": rng.choice(PARTIES[:2]) if rng.random() < 0.98 else PARTIES[2],
+            "state": state,
+            "updateDate": f"2025-{1 + i % 12:02d}-01T00:00:00Z",
+            "url": f"https://api.congress.gov/v3/member/{bioguide_id}",
+            "depiction": {"imageUrl": f"https://www.congress.gov/img/member/{bioguide_id.lower()}_200.jpg"},
+            "terms": {"item": [{"chamber": chamber, "startYear": 2025}]},
+        }
+        if district is not None:
+            m["district"] = district
+        return m
+
+    for state in states:
+        members.append(member(len(members), state, "Senate", None))
+        members.append(member(len(members), state, "Senate", None))
+    for i in range(house_size):
+        state = states[i % len(states)]
+        members.append(member(len(members), state, "House of Representatives", i // len(states) + 1))
+    return members
+
+
+def load_roster(snapshot_path: Optional[str] = None) -> List[dict]:
+    if snapshot_path:
+        snapshot = read_snapshot(Path(snapshot_path))
+        if snapshot is None:
+            raise SystemExit(f"Could not read roster snapshot {snapshot_path}")
+        return snapshot.members
+    return synthetic_roster()
+
+
+def candidate_totals(candidate_id: str) -> dict:
+    rng = random.Random(candidate_id)
+    receipts = round(rng.uniform(1e5, 2e7), 2)
+    return {
+        "results": [{
+            "candidate_id": candidate_id,
+            "cycle": 2026,
+            "receipts": receipts,
+            "disbursements": round(receipts * rng.uniform(0.3, 0.9), 2),
+            "individual_contributions": round(receipts * 0.7, 2),
+            "last_cash_on_hand_end_period": round(receipts * 0.2, 2),
+        }],
+        "pagination": {"count": 1, "page": 1, "pages": 1, "per_page": 20},
+    }
+
+
+def candidates_totals(candidate_ids: List[str]) -> dict:
+    """/candidates/totals/ rows for several candidates (one per candidate)"""
+    rows = [{**candidate_totals(c)["results"][0], "candidate_id": c} for c in candidate_ids]
+    return {"results": rows, "pagination": {"count": len(rows), "page": 1, "pages": 1, "per_page": 100}}
+
+
+def committees_for(candidate_ids: List[str]) -> dict:
+    """/committees/ rows linked to several candidates"""
+    rows = [
+        {"committee_id": principal_committee_id(c), "designation": "P", "name": f"{c} FOR CONGRESS", "candidate_ids": [c]}
+        for c in candidate_ids
+    ]
+    return {"results": rows, "pagination": {"count": len(rows), "page": 1, "pages": 1, "per_page": 100}}
+
+
+def candidate_committees(candidate_id: str) -> dict:
+    return {
+        "results": [{"committee_id": principal_committee_id(candidate_id), "designation": "P", "name": f"{candidate_id} FOR CONGRESS"}],
+        "pagination": {"count": 1, "page": 1, "pages": 1, "per_page": 20},
+    }
+
+
+def fec_candidate_id(bioguide_id: str, office: str) -> str:
+    return f"{office}0XX{bioguide_id[-5:]}"
+
+
+def principal_committee_id(candidate_id: str) -> str:
+    return "C" + candidate_id[1:].rjust(8, "0")[:8]
+
+
+def lis_member_id(bioguide_id: str) -> str:
+    return f"S{int(bioguide_id[1:]):03d}"
+
+
+def legislators(roster: List[dict]) -> List[dict]:
+    """congress-legislators style records (legislators-current.json) for a roster"""
+    records = []
+    for m in roster:
+        office = "S" if m["terms"]["item"][-1]["chamber"] == "Senate" else "H"
+        ids = {"bioguide": m["bioguideId"], "fec": [fec_candidate_id(m["bioguideId"], office)]}
+        if office == "S":
+            ids["lis"] = lis_member_id(m["bioguideId"])
+        records.append({
+            "id": ids,
+            "terms": [{"type": "sen" if office == "S" else "rep", "state": m["state"]}],
+        })
+    return records
+
+
+def candidate_search(q: str, per_page: int, candidate_ids: Optional[List[str]] = None) -> dict:
+    if candidate_ids:
+        results = [
+            {
+                "candidate_id": candidate_id,
+                "office": candidate_id[0],
+                "principal_committees": [{"committee_id": principal_committee_id(candidate_id), "designation": "P"}],
+            }
+            for candidate_id in candidate_ids[:per_page]
+        ]
+    else:
+        rng = random.Random(q)
+        results = [
+            {"candidate_id": f"H{rng.randint(0, 9)}XX{rng.randint(10000, 99999)}", "name": q.upper(), "office": "H"}
+            for _ in range(per_page)
+        ]
+    return {"results": results, "pagination": {"count": len(results), "page": 1, "pages": 1, "per_page": per_page}}
+
+
+def schedule_a(committee_id: str, per_page: int) -> dict:
+    rng = random.Random(committee_id)
+    rows = [
+        {
+            "committee_id": committee_id,
+            "contributor_name": f"DONOR {i}",
+            "contributor_employer": rng.choice(["SELF", "RETIRED", "ACME CORP", "NONE"]),
+            "contributor_state": rng.choice(list(STATE_NAMES)),
+            "contributor_zip": f"{rng.randint(10000, 99999)}",
+            "contribution_receipt_amount": round(rng.uniform(5, 3300), 2),
+            "contribution_receipt_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "sub_id": str(rng.randint(10**18, 10**19)),
+        }
+        for i in range(per_page)
+    ]
+    return {"results": rows, "pagination": {"count": per_page, "per_page": per_page, "last_indexes": None}}
+
+
+POLICY_AREAS = ["Health", "Taxation", "Armed Forces and National Security", "Education", "Energy", None]
+LATEST_ACTIONS = [
+    "Referred to the House Committee on Energy and Commerce.",
+    "Ordered to be Reported by Voice Vote.",
+    "Passed/agreed to in House: On passage Passed by recorded vote.",
+    "Became Public Law No: 118-42.",
+    "Introduced in House",
+]
+
+
+def member_legislation(bioguide_id: str, kind: str, offset: int, limit: int) -> dict:
+    """One page of /member/{id}/sponsored-legislation or cosponsored-legislation"""
+    rng = random.Random(f"{kind}:{bioguide_id}")
+    count = rng.randint(20, 600) if kind == "sponsored" else rng.randint(100, 1500)
+    items = []
+    for i in range(offset, min(offset + limit, count)):
+        item_rng = random.Random(f"{kind}:{bioguide_id}:{i}")
+        congress = 119 - item_rng.randint(0, 3)
+        if item_rng.random() < 0.05:
+            items.append({"congress": congress, "amendmentNumber": str(i), "introducedDate": f"{2024 - (119 - congress) * 2}-03-01"})
+            continue
+        area = item_rng.choice(POLICY_AREAS)
+        items.append({
+            "congress": congress,
+            "type": "HR",
+            "number": str(1000 + i),
+            "introducedDate": f"{2024 - (119 - congress) * 2}-{item_rng.randint(1, 12):02d}-01",
+            "latestAction": {"actionDate": "2025-01-01", "text": item_rng.choice(LATEST_ACTIONS)},
+            "policyArea": {"name": area} if area else None,
+        })
+    key = "sponsoredLegislation" if kind == "sponsored" else "cosponsoredLegislation"
+    return {key: items, "pagination": {"count": count}}
+
+
+BILL_WORDS = ["health", "care", "tax", "relief", "veterans", "energy", "water", "school", "safety", "border",
+              "farm", "credit", "housing", "research", "defense", "privacy", "rural", "broadband", "clean", "jobs"]
+
+
+def bills(congress: int, count: int = 3000) -> List[dict]:
+    """/bill/{congress} list items, oldest update first"""
+    rng = random.Random(f"bills:{congress}")
+    items = []
+    for i in range(count):
+        chamber = "House" if rng.random() < 0.7 else "Senate"
+        items.append({
+            "congress": congress,
+            "type": "HR" if chamber == "House" else "S",
+            "number": str(i + 1),
+            "title": " ".join(rng.sample(BILL_WORDS, 3)).capitalize() + f" Act of {2025 + i % 2}",
+            "originChamber": chamber,
+            "latestAction": {"actionDate": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "text": rng.choice(LATEST_ACTIONS)},
+            "updateDate": f"2025-{1 + i * 12 // count:02d}-{1 + i % 28:02d}T12:00:00Z",
+        })
+    items.sort(key=lambda b: b["updateDate"])
+    return items
+
+
+def bill_detail(congress: int, bill_type: str, number: str) -> dict:
+    rng = random.Random(f"bill:{congress}:{bill_type}:{number}")
+    sponsor = f"S{rng.randint(0, 534):06d}"
+    area = rng.choice(POLICY_AREAS)
+    return {"bill": {
+        "congress": congress, "type": bill_type.upper(), "number": number,
+        "sponsors": [{"bioguideId": sponsor, "fullName": f"Rep. Member{int(sponsor[1:])}, Test", "party": rng.choice("DDRRI")}],
+        "policyArea": {"name": area} if area else None,
+    }}
+
+
+def schedule_a_receipts(committee_id: str) -> List[dict]:
+    """A committee's full itemized receipts in FEC's date-sorted order"""
+    rng = random.Random(f"receipts:{committee_id}")
+    employers = ["SELF", "Self-Employed", "RETIRED", "ACME CORP", "ACME CORP.", "NONE", "STATE UNIVERSITY", ""]
+    rows = [
+        {
+            "committee_id": committee_id,
+            "contributor_name": f"DONOR {i}",
+            "contributor_employer": rng.choice(employers),
+            "contributor_state": rng.choice(list(STATE_NAMES)),
+            "contributor_zip": f"{rng.randint(10000, 99999)}{rng.randint(1000, 9999)}",
+            "contribution_receipt_amount": round(rng.choice([25, 50, 100, 250, 500, 1000, 3300]) * rng.uniform(0.5, 1), 2),
+            "contribution_receipt_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00",
+            "sub_id": str(4 * 10**18 + rng.randint(0, 10**17)),
+            "memo_code": "X" if rng.random() < 0.02 else None,
+        }
+        for i in range(rng.randint(300, 1200))
+    ]
+    rows.sort(key=lambda r: (r["contribution_receipt_date"], int(r["sub_id"])))
+    return rows
+
+
+def schedule_a_page(committee_id: str, per_page: int, last_index: Optional[str],
+                    last_date: Optional[str], min_date: Optional[str]) -> dict:
+    """One keyset page of schedule_a_receipts, continuing after FEC's last_indexes"""
+    rows = schedule_a_receipts(committee_id)
+    if min_date:
+        rows = [r for r in rows if r["contribution_receipt_date"][:10] >= min_date]
+    if last_index and last_date:
+        after = (last_date, int(last_index))
+        rows = [r for r in rows if (r["contribution_receipt_date"], int(r["sub_id"])) > after]
+    page = rows[:per_page]
+    last_indexes = None
+    if len(rows) > per_page:
+        last_indexes = {"last_index": page[-1]["sub_id"], "last_contribution_receipt_date": page[-1]["contribution_receipt_date"]}
+    return {"results": page, "pagination": {"count": len(rows), "per_page": per_page, "last_indexes": last_indexes}}
+
+
+# Roll calls per session in the synthetic vote fixtures
+ROLL_CALLS = {"house": {1: 360, 2: 120}, "senate": {1: 300, 2: 90}}
+VOTE_CASTS = {"house": ("Yea", "Nay", "Present", "Not Voting"), "senate": ("Yea", "Nay", "Present", "Not Voting")}
+
+
+def _party_code(member: dict) -> str:
+    return (member.get("partyName") or "I")[:1]
+
+
+def roll_call(roster: List[dict], chamber: str, congress: int, session: int, number: int) -> List[tuple]:
+    """(member, vote cast) for every sitting member; most votes split on party lines"""
+    rng = random.Random(f"vote:{chamber}:{congress}:{session}:{number}")
+    chamber_name = "Senate" if chamber == "senate" else "House of Representatives"
+    party_line = rng.random() < 0.6
+    lean = {"D": rng.random() < 0.5}
+    lean["R"] = not lean["D"] if party_line else rng.random() < 0.5
+    casts = []
+    for m in roster:
+        if m["terms"]["item"][-1]["chamber"] != chamber_name:
+            continue
+        party = _party_code(m)
+        if rng.random() < 0.03:
+            cast = "Not Voting"
+        else:
+            yea = lean.get(party, rng.random() < 0.5)
+            if rng.random() < 0.08:
+                yea = not yea
+            cast = "Yea" if yea else "Nay"
+        casts.append((m, cast))
+    return casts
+
+
+def house_votes(congress: int, session: int, offset: int, limit: int) -> dict:
+    """One page of /house-vote/{congress}/{session}"""
+    count = ROLL_CALLS["house"].get(session, 0)
+    items = [
+        {
+            "congress": congress, "sessionNumber": session, "rollCallNumber": n,
+            "startDate": f"{2023 + congress - 118 + session}-{1 + n % 12:02d}-{1 + n % 28:02d}T12:00:00-05:00",
+            "updateDate": f"2025-{1 + n % 12:02d}-{1 + n % 28:02d}T18:00:00-05:00",
+            "result": "Passed" if n % 3 else "Failed",
+        }
+        for n in range(offset + 1, min(offset + limit, count) + 1)
+    ]
+    return {"houseRollCallVotes": items, "pagination": {"count": count}}
+
+
+def house_vote_members(roster: List[dict], congress: int, session: int, number: int) -> dict:
+    return {"houseRollCallVoteMemberVotes": {
+        "congress": congress, "sessionNumber": session, "rollCallNumber": number,
+        "voteQuestion": "On Passage",
+        "results": [
+            {"bioguideID": m["bioguideId"], "firstName": "Test", "lastName": m["name"].split(",")[0],
+             "voteCast": {"Yea": "Aye", "Nay": "No"}.get(cast, cast), "voteParty": _party_code(m), "voteState": m["state"]}
+            for m, cast in roll_call(roster, "house", congress, session, number)
+        ],
+    }}
+
+
+def senate_vote_menu(congress: int, session: int) -> str:
+    numbers = range(ROLL_CALLS["senate"].get(session, 0), 0, -1)
+    votes = "".join(f"<vote><vote_number>{n:05d}</vote_number><question>On the Motion</question></vote>" for n in numbers)
+    return (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><vote_summary><congress>{congress}</congress>"
+            f"<session>{session}</session><votes>{votes}</votes></vote_summary>")
+
+
+def senate_vote(roster: List[dict], congress: int, session: int, number: int) -> str:
+    members = "".join(
+        f"<member><last_name>{m['name'].split(',')[0]}</last_name><first_name>Test</first_name>"
+        f"<party>{_party_code(m)}</party><state>{m['state']}</state><vote_cast>{cast}</vote_cast>"
+        f"<lis_member_id>{lis_member_id(m['bioguideId'])}</lis_member_id></member>"
+        for m, cast in roll_call(roster, "senate", congress, session, number)
+    )
+    return (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><roll_call_vote><congress>{congress}</congress>"
+            f"<session>{session}</session><vote_number>{number}</vote_number>"
+            f"<vote_date>March {1 + number % 28}, 2025, 02:15 PM</vote_date><question>On the Motion</question>"
+            f"<vote_result>Agreed to</vote_result><members>{members}</members></roll_call_vote>")
+
+
+def portrait(name: str) -> bytes:
+    """A 200x245 JPEG standing in for a Congress.gov member depiction"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(name)
+    img = Image.new("RGB", (200, 245), tuple(rng.randint(0, 255) for _ in range(3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randint(0, 180), rng.randint(0, 225)
+        draw.ellipse((x, y, x + rng.randint(10, 60), y + rng.randint(10, 60)), fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    out = BytesIO()
+    img.save(out, "JPEG", quality=90)
+    return out.getvalue()
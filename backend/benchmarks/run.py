@@ -0,0 +1,294 @@
+"""
+Load/latency benchmark for the backend.
+
+Starts the fake upstream and the API (each under uvicorn, in their own
+processes), points the API at the fake upstream, then drives each scenario
+at a fixed concurrency and records latency percentiles, throughput, API
+process memory and the upstream calls the scenario caused.
+
+    cd backend
+    python -m benchmarks.run --concurrency 50 --requests 2000 --out bench.json
+    python -m benchmarks.run --out new.json --compare bench.json
+
+Results are written as JSON so runs can be compared for regressions.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+STATES = ["CA", "TX", "NY", "FL", "PA", "OH", "VT", "WY", "AK", "GA"]
+
+
+def _cycle(paths: List[str]) -> Callable[[], Iterator[str]]:
+    return lambda: itertools.cycle(paths)
+
+
+# name -> factory for an endless iterator of request paths
+SCENARIOS: Dict[str, Callable[[], Iterator[str]]] = {
+    "house": _cycle(["/api/house"]),
+    "senate": _cycle(["/api/senate"]),
+    "state": _cycle([f"/api/state/{s}" for s in STATES]),
+    "house_filtered": _cycle([f"/api/house?state={s}&fields=first_name,last_name,party,district" for s in STATES]),
+    "search": _cycle([f"/api/search?q={q}" for q in ("last1", "lsat12", "texas", "first4 q", "vermont 3")]),
+    "bill_search": _cycle([f"/api/bills/search?q={q}" for q in ("health", "tax relief", "veterans hous", "clean water", "rural")]),
+    "vote_scores": _cycle(["/api/votes/house/scores", "/api/votes/senate/scores"]),
+    "vote_agreement": _cycle(
+        ["/api/votes/house/agreement", "/api/votes/senate/agreement"]
+        + [f"/api/votes/senate/agreement?member=S{i:06d}" for i in range(0, 100, 10)]
+    ),
+    "proxy_member": _cycle([f"/api/proxy/congress/member/S{i:06d}" for i in range(50)]),
+    "proxy_totals": _cycle([f"/api/proxy/fec/candidate/H0XX{i:05d}/totals" for i in range(50)]),
+    "batch_totals": _cycle([
+        "/api/fec/candidates/totals?candidate_id=" + ",".join(f"H0XX{i:05d}" for i in range(start, start + 40))
+        for start in range(0, 200, 40)
+    ]),
+    "member_finance": _cycle([f"/api/member/S{i:06d}/finance" for i in range(50)]),
+    "member_portrait": _cycle([f"/api/member/S{i:06d}/portrait?w={w}" for i in range(50) for w in (64, 200)]),
+    "member_activity": _cycle([f"/api/member/S{i:06d}/activity" for i in range(50)]),
+    "donations_summary": _cycle([f"/api/member/S{i:06d}/donations/summary" for i in range(20)]),
+    "contribution_analytics": _cycle([
+        f"/api/fec/analytics/contributions?committee_id=C{i:08d},C{i + 1:08d}" for i in range(0, 20, 2)
+    ]),
+    "proxy_schedule_a": _cycle([f"/api/proxy/fec/committee/C{i:08d}/schedule_a?per_page=20" for i in range(20)]),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    # Linux only; other platforms report null rather than pulling in psutil
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def _start(module_app: str, port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", module_app, "--app-dir", str(BACKEND_DIR),
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+
+
+async def _wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.time() < deadline:
+            try:
+                if (await client.get(url, timeout=5.0)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"{url} did not become ready within {timeout:.0f}s")
+
+
+async def run_scenario(client: httpx.AsyncClient, paths: Iterator[str], requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            path = next(paths)
+            start = time.perf_counter()
+            try:
+                status = str((await client.get(path)).status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_counts": statuses,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 1) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def benchmark(args) -> dict:
+    upstream_port, api_port = _free_port(), _free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    api_url = f"http://127.0.0.1:{api_port}"
+    workdir = tempfile.mkdtemp(prefix="ptp-bench-")
+
+    upstream_env = dict(os.environ,
+                        FAKE_LATENCY_MS=str(args.latency_ms),
+                        FAKE_LATENCY_JITTER_MS=str(args.jitter_ms),
+                        FAKE_ERROR_RATE=str(args.error_rate))
+    if args.roster_snapshot:
+        upstream_env["FAKE_ROSTER_SNAPSHOT"] = args.roster_snapshot
+
+    api_env = dict(os.environ,
+                   CONGRESS_API_BASE=f"{upstream_url}/v3",
+                   FEC_API_BASE=f"{upstream_url}/v1",
+                   LEGISLATORS_BASE=f"{upstream_url}/legislators",
+                   SENATE_VOTES_BASE=f"{upstream_url}/senate",
+                   PORTRAIT_BASE=upstream_url,
+                   CONGRESS_API_KEY="bench",
+                   NEXT_PUBLIC_FEC_API_KEY="bench",
+                   DATA_CACHE_DIR=workdir,
+                   SHARED_CACHE_BACKEND=args.shared_cache)
+    if not args.realistic_quotas:
+        # Measure the app itself rather than the production quota governor
+        for upstream in ("CONGRESS", "FEC"):
+            api_env.setdefault(f"{upstream}_RATE_PER_HOUR", "100000000")
+            api_env.setdefault(f"{upstream}_BURST", "100000")
+            api_env.setdefault(f"{upstream}_MAX_CONCURRENCY", "64")
+        api_env.setdefault("SENATE_VOTES_RATE_PER_HOUR", "100000000")
+        api_env.setdefault("PORTRAIT_RATE_PER_HOUR", "100000000")
+
+    upstream = _start("benchmarks.fake_upstream:app", upstream_port, upstream_env)
+    api = None
+    try:
+        await _wait_ready(f"{upstream_url}/__stats")
+        api = _start("main:app", api_port, api_env)
+        await _wait_ready(f"{api_url}/health")
+
+        results = {}
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=api_url, timeout=60.0, limits=limits) as client, \
+                httpx.AsyncClient(base_url=upstream_url) as control:
+            # Cold roster load is measured separately from steady state
+            started = time.perf_counter()
+            await client.get("/api/house")
+            cold_ms = round((time.perf_counter() - started) * 1000, 2)
+
+            for name in args.scenarios:
+                paths = SCENARIOS[name]()
+                await run_scenario(client, paths, args.warmup, min(args.concurrency, max(args.warmup, 1)))
+                await control.post("/__reset")
+                result = await run_scenario(client, paths, args.requests, args.concurrency)
+                result["upstream_calls"] = (await control.get("/__stats")).json()
+                result["api_rss_mb"] = _rss_mb(api.pid)
+                results[name] = result
+                print(_format_row(name, result), flush=True)
+
+        return {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "git_rev": _git_rev(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                "cold_roster_ms": cold_ms,
+            },
+            "scenarios": results,
+        }
+    finally:
+        for proc in (api, upstream):
+            if proc is not None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _format_row(name: str, r: dict) -> str:
+    lat = r["latency_ms"]
+    return (f"{name:<18} {r['throughput_rps']:>9.1f} rps  p50 {lat['p50']:>8.2f}  p95 {lat['p95']:>8.2f}  "
+            f"p99 {lat['p99']:>8.2f} ms  errors {r['errors']:>5}  upstream {r['upstream_calls']['total']:>5}  "
+            f"rss {r['api_rss_mb']} MB")
+
+
+def compare(baseline: dict, current: dict) -> None:
+    """Print per-scenario changes against a previous results file"""
+    print(f"\nvs {baseline['meta'].get('git_rev')} ({baseline['meta'].get('timestamp')})")
+    for name, cur in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+
+        def delta(a: float, b: float) -> str:
+            return f"{(b - a) / a * 100:+6.1f}%" if a else "   n/a"
+
+        print(f"{name:<18} rps {delta(base['throughput_rps'], cur['throughput_rps'])}  "
+              + "  ".join(f"{p} {delta(base['latency_ms'][p], cur['latency_ms'][p])}" for p in ("p50", "p95", "p99"))
+              + f"  upstream {base['upstream_calls']['total']} -> {cur['upstream_calls']['total']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API against a local fake upstream")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per scenario")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="fake upstream mean latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="fake upstream latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls failing with 503")
+    parser.add_argument("--roster-snapshot", help="recorded roster snapshot to serve instead of synthetic data")
+    parser.add_argument("--shared-cache", default="none", choices=["none", "sqlite"])
+    parser.add_argument("--realistic-quotas", action="store_true", help="keep the production upstream rate limits")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = asyncio.run(benchmark(args))
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+import asyncio
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    from .http_clients import upstream_clients
+    from .ratelimit import upstream_priority, BACKGROUND
+    from .shared_cache import shared_backend
+    from .snapshot import CURRENT_CONGRESS, DATA_CACHE_DIR
+except ImportError:
+    from http_clients import upstream_clients
+    from ratelimit import upstream_priority, BACKGROUND
+    from shared_cache import shared_backend
+    from snapshot import CURRENT_CONGRESS, DATA_CACHE_DIR
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BILL_STORE_PATH = Path(os.getenv("BILL_STORE_PATH", str(DATA_CACHE_DIR / "bills.sqlite3")))
+BILL_SYNC_CONGRESSES = tuple(
+    int(c) for c in os.getenv("BILL_SYNC_CONGRESSES", str(CURRENT_CONGRESS)).split(",") if c.strip()
+)
+BILL_SYNC_INTERVAL = float(os.getenv("BILL_SYNC_INTERVAL_SECONDS", "1800"))
+BILL_SYNC_RETRY_BACKOFF = float(os.getenv("BILL_SYNC_RETRY_BACKOFF_SECONDS", "300"))
+BILL_BACKGROUND_SYNC = os.getenv("BILL_BACKGROUND_SYNC", "true").lower() in ("1", "true", "yes")
+# Bill detail requests (sponsor, policy area) per sync; the rest are picked up by later syncs
+BILL_DETAILS_PER_SYNC = int(os.getenv("BILL_DETAILS_PER_SYNC", "500"))
+BILL_SYNC_LEASE_TTL = 900.0
+
+# Congress.gov's largest page
+BILL_PAGE_SIZE = 250
+BILL_DETAIL_CONCURRENCY = 8
+
+FACETS = ("congress", "chamber", "policy_area", "party")
+# Facet name -> column it counts
+_FACET_COLUMNS = {"congress": "congress", "chamber": "origin_chamber", "policy_area": "policy_area", "party": "sponsor_party"}
+# bm25 weights for the indexed columns: title, latest action, sponsor, policy area
+_RANK = "bm25(bills_fts, 10.0, 1.0, 3.0, 2.0)"
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query: str) -> Optional[str]:
+    """An FTS5 query requiring every word, the last one as a prefix so results follow typing"""
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    # Quoting makes operators and punctuation in user input plain text
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def bill_row(item: dict) -> tuple:
+    """Columns of the bills table from a /bill list item"""
+    action = item.get("latestAction") or {}
+    return (
+        item.get("congress"), (item.get("type") or "").upper(), str(item.get("number", "")),
+        item.get("title") or "", item.get("originChamber"), action.get("actionDate"), action.get("text"),
+        item.get("updateDate"),
+    )
+
+
+class BillStore:
+    """Bill metadata per Congress with an FTS5 index over titles, actions, sponsors and policy areas"""
+
+    def __init__(self, path: Path = BILL_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        # detail_update_date: updateDate the sponsor and policy area were last fetched for
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bills (id INTEGER PRIMARY KEY, congress INTEGER NOT NULL, "
+            "type TEXT NOT NULL, number TEXT NOT NULL, title TEXT NOT NULL, origin_chamber TEXT, "
+            "latest_action_date TEXT, latest_action_text TEXT, update_date TEXT, sponsor_id TEXT, "
+            "sponsor_name TEXT, sponsor_party TEXT, policy_area TEXT, detail_update_date TEXT, "
+            "UNIQUE (congress, type, number))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS bills_latest ON bills (latest_action_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS bills_stale_detail ON bills (congress, detail_update_date)")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS bills_fts USING fts5("
+            "title, latest_action_text, sponsor_name, policy_area, content='bills', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        # Keep the external-content index in step with the table
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS bills_ai AFTER INSERT ON bills BEGIN "
+            "INSERT INTO bills_fts (rowid, title, latest_action_text, sponsor_name, policy_area) "
+            "VALUES (new.id, new.title, new.latest_action_text, new.sponsor_name, new.policy_area); END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS bills_au AFTER UPDATE ON bills BEGIN "
+            "INSERT INTO bills_fts (bills_fts, rowid, title, latest_action_text, sponsor_name, policy_area) "
+            "VALUES ('delete', old.id, old.title, old.latest_action_text, old.sponsor_name, old.policy_area); "
+            "INSERT INTO bills_fts (rowid, title, latest_action_text, sponsor_name, policy_area) "
+            "VALUES (new.id, new.title, new.latest_action_text, new.sponsor_name, new.policy_area); END"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS syncs (congress INTEGER PRIMARY KEY, synced_at REAL NOT NULL, watermark TEXT)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def sync_state(self, congress: int) -> Optional[Tuple[float, Optional[str]]]:
+        """(synced_at, watermark) of the last sync of a Congress, or None if it was never synced"""
+        row = self._conn().execute("SELECT synced_at, watermark FROM syncs WHERE congress = ?", (congress,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def synced(self) -> bool:
+        return self._conn().execute("SELECT 1 FROM syncs LIMIT 1").fetchone() is not None
+
+    def apply_listing(self, congress: int, items: Sequence[dict], watermark: Optional[str]) -> int:
+        """Upsert one page of list items and advance the watermark; returns how many bills changed"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            # Bills whose updateDate did not move are left alone, so their index entries are too
+            conn.executemany(
+                "INSERT INTO bills (congress, type, number, title, origin_chamber, latest_action_date, "
+                "latest_action_text, update_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(congress, type, number) DO UPDATE SET title = excluded.title, "
+                "origin_chamber = excluded.origin_chamber, latest_action_date = excluded.latest_action_date, "
+                "latest_action_text = excluded.latest_action_text, update_date = excluded.update_date "
+                "WHERE bills.update_date IS NOT excluded.update_date",
+                [bill_row(item) for item in items],
+            )
+            changed = conn.total_changes - before
+            previous = self.sync_state(congress)
+            if previous is not None and previous[1] and (watermark is None or previous[1] > watermark):
+                watermark = previous[1]
+            conn.execute(
+                "INSERT OR REPLACE INTO syncs (congress, synced_at, watermark) VALUES (?, ?, ?)",
+                (congress, time.time(), watermark),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return changed
+
+    def stale_details(self, congress: int, limit: int) -> List[Tuple[int, str, str, Optional[str]]]:
+        """(id, type, number, update_date) of bills whose sponsor and policy area predate their updateDate"""
+        return self._conn().execute(
+            "SELECT id, type, number, update_date FROM bills WHERE congress = ? "
+            "AND detail_update_date IS NOT update_date ORDER BY update_date DESC LIMIT ?",
+            (congress, limit),
+        ).fetchall()
+
+    def apply_details(self, details: Sequence[tuple]) -> None:
+        """details: (sponsor_id, sponsor_name, sponsor_party, policy_area, detail_update_date, id)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE bills SET sponsor_id = ?, sponsor_name = ?, sponsor_party = ?, policy_area = ?, "
+                "detail_update_date = ? WHERE id = ?",
+                details,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def search(self, query: Optional[str], filters: Dict[str, object], sort: str, limit: int, offset: int) -> dict:
+        """Matching bills, their total and facet counts over the whole match"""
+        where, params = [], []
+        match = match_expression(query) if query else None
+        if match:
+            where.append("b.id IN (SELECT rowid FROM bills_fts WHERE bills_fts MATCH ?)")
+            params.append(match)
+        elif query:
+            # Nothing searchable in the query (only punctuation), so nothing matches
+            return {"total": 0, "results": [], "facets": {f: {} for f in FACETS}}
+        for name, value in filters.items():
+            where.append(f"b.{_FACET_COLUMNS[name]} = ?")
+            params.append(value)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM bills b {clause}", params).fetchone()[0]
+        if match and sort == "relevance":
+            # Rank inside the FTS query, then apply the column filters
+            sql = (
+                f"SELECT b.congress, b.type, b.number, b.title, b.origin_chamber, b.latest_action_date, "
+                f"b.latest_action_text, b.update_date, b.sponsor_id, b.sponsor_name, b.sponsor_party, b.policy_area "
+                f"FROM (SELECT rowid, {_RANK} AS score FROM bills_fts WHERE bills_fts MATCH ?) f "
+                f"JOIN bills b ON b.id = f.rowid {clause} "
+                f"ORDER BY f.score, b.latest_action_date DESC LIMIT ? OFFSET ?"
+            )
+            rows = conn.execute(sql, [match, *params, limit, offset]).fetchall()
+        else:
+            sql = (
+                f"SELECT b.congress, b.type, b.number, b.title, b.origin_chamber, b.latest_action_date, "
+                f"b.latest_action_text, b.update_date, b.sponsor_id, b.sponsor_name, b.sponsor_party, b.policy_area "
+                f"FROM bills b {clause} ORDER BY b.latest_action_date DESC, b.id DESC LIMIT ? OFFSET ?"
+            )
+            rows = conn.execute(sql, [*params, limit, offset]).fetchall()
+
+        facets = {}
+        for name in FACETS:
+            column = _FACET_COLUMNS[name]
+            facets[name] = {
+                str(value): count
+                for value, count in conn.execute(
+                    f"SELECT b.{column}, COUNT(*) AS n FROM bills b {clause} "
+                    f"GROUP BY b.{column} HAVING b.{column} IS NOT NULL ORDER BY n DESC, b.{column}",
+                    params,
+                )
+            }
+        return {
+            "total": total,
+            "results": [
+                {
+                    "congress": r[0], "type": r[1], "number": r[2], "title": r[3], "origin_chamber": r[4],
+                    "latest_action": {"date": r[5], "text": r[6]}, "update_date": r[7],
+                    "sponsor": {"bioguide_id": r[8], "name": r[9], "party": r[10]} if r[8] else None,
+                    "policy_area": r[11],
+                }
+                for r in rows
+            ],
+            "facets": facets,
+        }
+
+
+class BillIndexNotReady(Exception):
+    """No Congress has been synced into the bill store yet"""
+
+
+class BillService:
+    """Keeps the local bill store in step with Congress.gov and answers searches from it"""
+
+    def __init__(self, congresses: Sequence[int] = BILL_SYNC_CONGRESSES):
+        self.congresses = tuple(congresses)
+        self._store: Optional[BillStore] = None
+        self._store_failed = False
+        self._sync_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._last_sync = 0.0
+        self._lease_owner = f"{os.getpid()}:{id(self)}"
+
+    def _open_store(self) -> Optional[BillStore]:
+        if self._store is None and not self._store_failed:
+            try:
+                self._store = BillStore()
+            except (OSError, sqlite3.Error) as e:
+                # Searches answer 503 rather than 500 until the process is restarted with a usable path
+                logger.warning("Bill store unavailable, bill search disabled: %s", e)
+                self._store_failed = True
+        return self._store
+
+    async def _sync_listing(self, store: BillStore, congress: int) -> int:
+        """Page through bills updated since the watermark, oldest update first"""
+        state = await asyncio.to_thread(store.sync_state, congress)
+        params = {"sort": "updateDate asc", "limit": BILL_PAGE_SIZE}
+        if state is not None and state[1]:
+            # Congress.gov wants whole seconds with a Z suffix
+            params["fromDateTime"] = state[1][:19] + "Z"
+        client = upstream_clients.congress
+        changed = 0
+        offset = 0
+        while True:
+            response = await client.get(f"/bill/{congress}", params={**params, "offset": offset})
+            response.raise_for_status()
+            data = response.json()
+            items = data.get("bills", [])
+            # Sorted by updateDate, so the watermark can advance page by page
+            watermark = max((i["updateDate"] for i in items if i.get("updateDate")), default=None)
+            changed += await asyncio.to_thread(store.apply_listing, congress, items, watermark)
+            offset += BILL_PAGE_SIZE
+            if not items or offset >= data.get("pagination", {}).get("count", 0):
+                return changed
+
+    async def _sync_details(self, store: BillStore, congress: int) -> int:
+        """Fetch sponsor and policy area for bills whose updateDate moved since they were last fetched"""
+        stale = await asyncio.to_thread(store.stale_details, congress, BILL_DETAILS_PER_SYNC)
+        client = upstream_clients.congress
+        semaphore = asyncio.Semaphore(BILL_DETAIL_CONCURRENCY)
+
+        async def detail(bill_id: int, bill_type: str, number: str, update_date: Optional[str]) -> Optional[tuple]:
+            async with semaphore:
+                response = await client.get(f"/bill/{congress}/{bill_type.lower()}/{number}")
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            bill = response.json().get("bill", {})
+            sponsor = (bill.get("sponsors") or [{}])[0]
+            return (
+                sponsor.get("bioguideId"), sponsor.get("fullName"), sponsor.get("party"),
+                (bill.get("policyArea") or {}).get("name"), update_date, bill_id,
+            )
+
+        results = await asyncio.gather(*(detail(*row) for row in stale), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        details = [r for r in results if r is not None and not isinstance(r, BaseException)]
+        # Failed bills keep their old fetch date, so the next sync retries just those
+        if details:
+            await asyncio.to_thread(store.apply_details, details)
+        if errors:
+            logger.warning("Could not fetch %s of %s bill details: %s", len(errors), len(stale), errors[0])
+            if len(errors) == len(stale):
+                raise errors[0]
+        return len(details)
+
+    async def _try_acquire_lease(self, lease: str) -> bool:
+        try:
+            return await asyncio.to_thread(shared_backend.acquire_lease, lease, self._lease_owner, BILL_SYNC_LEASE_TTL)
+        except Exception:
+            # Without a working shared tier every worker syncs for itself
+            return True
+
+    async def sync(self, congress: int) -> Tuple[int, int]:
+        """Bring one Congress up to date; returns (bills changed, details fetched)"""
+        lease = f"bills:{congress}"
+        if not await self._try_acquire_lease(lease):
+            # Another worker is syncing this Congress into the same store
+            return 0, 0
+        try:
+            store = self._open_store()
+            if store is None:
+                return 0, 0
+            with upstream_priority(BACKGROUND):
+                changed = await self._sync_listing(store, congress)
+                details = await self._sync_details(store, congress)
+            logger.info("Synced bills for the %sth Congress: %s changed, %s details", congress, changed, details)
+            return changed, details
+        finally:
+            try:
+                await asyncio.to_thread(shared_backend.release_lease, lease, self._lease_owner)
+            except Exception:
+                pass
+
+    async def _sync_all(self) -> None:
+        try:
+            for congress in self.congresses:
+                await self.sync(congress)
+            self._last_sync = time.time()
+            self._failures = 0
+        except Exception:
+            self._failures += 1
+            raise
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Bill sync failed: %s", task.exception())
+
+    def _trigger_sync(self) -> asyncio.Task:
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.ensure_future(self._sync_all())
+            self._sync_task.add_done_callback(self._log_failure)
+        return self._sync_task
+
+    async def search(self, query: Optional[str], filters: Dict[str, object], sort: str = "relevance",
+                     limit: int = 20, offset: int = 0) -> dict:
+        store = self._open_store()
+        if store is None:
+            raise BillIndexNotReady("The bill store is unavailable on this server")
+        if not await asyncio.to_thread(store.synced):
+            self._trigger_sync()
+            raise BillIndexNotReady("The bill index is still being built")
+        return await asyncio.to_thread(store.search, query, filters, sort, limit, offset)
+
+    def _next_sync_delay(self) -> float:
+        if self._failures:
+            return min(BILL_SYNC_INTERVAL, BILL_SYNC_RETRY_BACKOFF * 2 ** (self._failures - 1)) * random.uniform(0.5, 1.0)
+        if not self._last_sync:
+            return 0.0
+        return max(0.0, self._last_sync + BILL_SYNC_INTERVAL - time.time()) + random.uniform(0, 30)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_sync_delay())
+            try:
+                await asyncio.shield(self._trigger_sync())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Logged by the sync task; the backoff is picked up from the failure count
+                pass
+
+    def start_background_sync(self) -> None:
+        if not BILL_BACKGROUND_SYNC:
+            return
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._sync_loop())
+
+    async def stop_background_sync(self) -> None:
+        tasks = [t for t in (self._loop_task, self._sync_task) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._sync_task = None
+
+
+bill_service = BillService()
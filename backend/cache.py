@@ -0,0 +1,308 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+try:
+    from .shared_cache import shared_backend, NullCacheBackend
+except ImportError:
+    from shared_cache import shared_backend, NullCacheBackend
+
+load_dotenv()
+
+PROXY_TTL = int(os.getenv("PROXY_TTL_SECONDS", "60"))
+PROXY_CACHE_MAX_ENTRIES = int(os.getenv("PROXY_CACHE_MAX_ENTRIES", "5000"))
+PROXY_CACHE_MAX_BYTES = int(os.getenv("PROXY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# How long past expiry an entry may still be served when the upstream is failing
+PROXY_STALE_MAX_SECONDS = int(os.getenv("PROXY_STALE_MAX_SECONDS", "86400"))
+
+
+def namespace_ttl(namespace: str, default: int = PROXY_TTL) -> int:
+    """TTL for a namespace, e.g. "fec:totals" reads PROXY_TTL_FEC_TOTALS"""
+    env_name = "PROXY_TTL_" + namespace.upper().replace(":", "_")
+    return int(os.getenv(env_name, str(default)))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+    expires_at: float
+    size: int
+
+
+class ProxyCache:
+    """Bounded in-process LRU (L1) with per-namespace TTLs and single-flight miss handling,
+    backed by an optional shared tier (L2) so one worker's fetch warms the others"""
+
+    def __init__(
+        self,
+        max_entries: int = PROXY_CACHE_MAX_ENTRIES,
+        max_bytes: int = PROXY_CACHE_MAX_BYTES,
+        ttls: Optional[Dict[str, int]] = None,
+        shared=None,
+    ):
+        self.shared = shared if shared is not None else NullCacheBackend()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._ttls: Dict[str, int] = dict(ttls or {})
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.shared_hits = 0
+        self.stale_served = 0
+
+    def ttl_for(self, namespace: str) -> int:
+        if namespace not in self._ttls:
+            self._ttls[namespace] = namespace_ttl(namespace)
+        return self._ttls[namespace]
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> str:
+        return f"{namespace}:{key}"
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        # Proxied values are decoded JSON, so the encoded length is a fair estimate
+        try:
+            return len(to_json(value))
+        except ValueError:
+            return 0
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return a fresh cached value or None, counting the hit or miss"""
+        full_key = self._key(namespace, key)
+        entry = self._entries.get(full_key)
+        if entry is None or entry.expires_at <= time.time():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(full_key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: Optional[float] = None, size: Optional[int] = None) -> None:
+        full_key = self._key(namespace, key)
+        now = time.time()
+        if size is None:
+            size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(full_key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        if expires_at is None:
+            expires_at = now + self.ttl_for(namespace)
+        self._entries[full_key] = _Entry(value, now, expires_at, size)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    async def get_or_fetch(self, namespace: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, or run `fetch` once for all concurrent callers of the same key"""
+        cached = self.get(namespace, key)
+        if cached is not None:
+            return cached
+
+        full_key = self._key(namespace, key)
+        task = self._inflight.get(full_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(namespace, key, fetch))
+            self._inflight[full_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(full_key, None))
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled caller does not abort the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    async def _fill(self, namespace: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        full_key = self._key(namespace, key)
+        shared_entry = await self._shared_get(full_key)
+        if shared_entry is not None and shared_entry[2] > time.time():
+            body, _, expires_at = shared_entry
+            self.shared_hits += 1
+            value = from_json(body)
+            self.set(namespace, key, value, expires_at=expires_at, size=len(body))
+            return value
+
+        value = await fetch()
+        body = to_json(value)
+        now = time.time()
+        expires_at = now + self.ttl_for(namespace)
+        self.set(namespace, key, value, expires_at=expires_at, size=len(body))
+        await self._shared_set(full_key, body, now, expires_at)
+        return value
+
+    async def get_or_fetch_many(
+        self,
+        namespace: str,
+        keys: Sequence[str],
+        fetch_many: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        batch_size: int,
+        concurrency: int,
+    ) -> Dict[str, Any]:
+        """Like get_or_fetch for many keys: misses are fetched `batch_size` at a time with at most
+        `concurrency` batches in flight. A failed batch yields its exception for each of its keys;
+        `fetch_many` may also return an exception as the value of an individual key."""
+        results: Dict[str, Any] = {}
+        waiting: Dict[str, asyncio.Task] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            cached = self.get(namespace, key)
+            if cached is not None:
+                results[key] = cached
+            elif self._key(namespace, key) in self._inflight:
+                self.coalesced += 1
+                waiting[key] = self._inflight[self._key(namespace, key)]
+            else:
+                missing.append(key)
+
+        if missing:
+            missing = await self._fill_from_shared(namespace, missing, results)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_batch(batch: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                values = await fetch_many(batch)
+            now = time.time()
+            expires_at = now + self.ttl_for(namespace)
+            bodies = {}
+            for key in batch:
+                if isinstance(values[key], BaseException):
+                    continue
+                body = to_json(values[key])
+                self.set(namespace, key, values[key], expires_at=expires_at, size=len(body))
+                bodies[self._key(namespace, key)] = body
+            await self._shared_set_many(bodies, now, expires_at)
+            return values
+
+        async def pick(batch_task: asyncio.Task, key: str) -> Any:
+            value = (await batch_task)[key]
+            if isinstance(value, BaseException):
+                raise value
+            return value
+
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            batch_task = asyncio.ensure_future(run_batch(batch))
+            for key in batch:
+                # Registered per key so single-key callers for the same entry join this batch
+                full_key = self._key(namespace, key)
+                task = asyncio.ensure_future(pick(batch_task, key))
+                self._inflight[full_key] = task
+                task.add_done_callback(lambda _, k=full_key: self._inflight.pop(k, None))
+                waiting[key] = task
+
+        if waiting:
+            outcomes = await asyncio.gather(*(asyncio.shield(t) for t in waiting.values()), return_exceptions=True)
+            results.update(zip(waiting, outcomes))
+        return results
+
+    async def _fill_from_shared(self, namespace: str, keys: List[str], results: Dict[str, Any]) -> List[str]:
+        """Move keys found fresh in the shared tier into L1 and `results`; return the rest"""
+        if isinstance(self.shared, NullCacheBackend):
+            return keys
+
+        def lookup():
+            return [self.shared.get(self._key(namespace, key)) for key in keys]
+
+        try:
+            entries = await asyncio.to_thread(lookup)
+        except Exception:
+            return keys
+        now = time.time()
+        remaining = []
+        for key, entry in zip(keys, entries):
+            if entry is not None and entry[2] > now:
+                self.shared_hits += 1
+                value = from_json(entry[0])
+                self.set(namespace, key, value, expires_at=entry[2], size=len(entry[0]))
+                results[key] = value
+            else:
+                remaining.append(key)
+        return remaining
+
+    async def get_stale(self, namespace: str, key: str) -> Optional[Any]:
+        """Return an expired entry still within PROXY_STALE_MAX_SECONDS, for use while the upstream is down"""
+        full_key = self._key(namespace, key)
+        cutoff = time.time() - PROXY_STALE_MAX_SECONDS
+        entry = self._entries.get(full_key)
+        if entry is not None and entry.expires_at > cutoff:
+            self.stale_served += 1
+            return entry.value
+        shared_entry = await self._shared_get(full_key)
+        if shared_entry is not None and shared_entry[2] > cutoff:
+            self.stale_served += 1
+            return from_json(shared_entry[0])
+        return None
+
+    async def _shared_get(self, full_key: str):
+        if isinstance(self.shared, NullCacheBackend):
+            return None
+        try:
+            return await asyncio.to_thread(self.shared.get, full_key)
+        except Exception:
+            # The shared tier is an optimization; never fail a request because of it
+            return None
+
+    async def _shared_set(self, full_key: str, body: bytes, stored_at: float, expires_at: float) -> None:
+        if isinstance(self.shared, NullCacheBackend):
+            return
+        try:
+            await asyncio.to_thread(self.shared.set, full_key, body, stored_at, expires_at)
+        except Exception:
+            pass
+
+    async def _shared_set_many(self, bodies: Dict[str, bytes], stored_at: float, expires_at: float) -> None:
+        if isinstance(self.shared, NullCacheBackend) or not bodies:
+            return
+
+        def store():
+            for full_key, body in bodies.items():
+                self.shared.set(full_key, body, stored_at, expires_at)
+
+        try:
+            await asyncio.to_thread(store)
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+            "shared_hits": self.shared_hits,
+            "stale_served": self.stale_served,
+            "shared_backend": type(self.shared).__name__,
+            "in_flight": len(self._inflight),
+            "ttls": dict(self._ttls),
+        }
+
+
+proxy_cache = ProxyCache(shared=shared_backend)
@@ -0,0 +1,545 @@
+import asyncio
+import heapq
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+try:
+    from .http_clients import upstream_clients
+    from .ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from .shared_cache import shared_backend
+    from .snapshot import DATA_CACHE_DIR
+except ImportError:
+    from http_clients import upstream_clients
+    from ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from shared_cache import shared_backend
+    from snapshot import DATA_CACHE_DIR
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_A_PATH = Path(os.getenv("SCHEDULE_A_PATH", str(DATA_CACHE_DIR / "schedule-a.sqlite3")))
+# A finished ledger is topped up with newer filings once it is this old
+SCHEDULE_A_REFRESH = float(os.getenv("SCHEDULE_A_REFRESH_SECONDS", "21600"))
+# Top-up passes re-read this many days before the newest stored receipt to catch late filings
+SCHEDULE_A_LOOKBACK_DAYS = int(os.getenv("SCHEDULE_A_LOOKBACK_DAYS", "30"))
+# Pages fetched per run; a large committee's ledger is completed over several runs
+SCHEDULE_A_MAX_PAGES_PER_RUN = int(os.getenv("SCHEDULE_A_MAX_PAGES_PER_RUN", "200"))
+SCHEDULE_A_TIMEOUT = float(os.getenv("SCHEDULE_A_TIMEOUT_SECONDS", "30"))
+# How long a summary request for a committee with nothing stored yet waits for the first pages
+SCHEDULE_A_FIRST_WAIT = float(os.getenv("SCHEDULE_A_FIRST_WAIT_SECONDS", "10"))
+
+# FEC's maximum page size
+SCHEDULE_A_PAGE_SIZE = 100
+# Progress is written out after the first page and then every this many pages
+SCHEDULE_A_PERSIST_PAGES = 10
+SCHEDULE_A_LEASE_TTL = 900.0
+# Entries kept in each ranked list of a precomputed summary
+SUMMARY_TOP = 50
+
+# Upper bounds of the contribution size buckets; the last bucket is open-ended
+SIZE_BUCKET_BOUNDS = (200.0, 499.99, 999.99, 1999.99)
+SIZE_BUCKETS = ("200_and_under", "200.01_to_499.99", "500_to_999.99", "1000_to_1999.99", "2000_and_over")
+
+# Stored columns and their array typecodes; the dimension columns are codes into that dimension's values
+COLUMNS = {
+    "sub_id": "Q",
+    "amount": "d",
+    "day": "i",
+    "size": "B",
+    "donor": "I",
+    "employer": "I",
+    "state": "I",
+    "zip": "I",
+}
+DIMENSIONS = ("donor", "employer", "state", "zip")
+# Bumped when the store layout changes; older stores are dropped and re-ingested
+SCHEMA_VERSION = 1
+
+_EPOCH = date(1970, 1, 1)
+
+_EMPLOYER_ALIASES = {
+    "": "NOT REPORTED",
+    "INFORMATION REQUESTED": "NOT REPORTED",
+    "INFORMATION REQUESTED PER BEST EFFORTS": "NOT REPORTED",
+    "REQUESTED": "NOT REPORTED",
+    "NONE": "NOT EMPLOYED",
+    "N/A": "NOT EMPLOYED",
+    "NA": "NOT EMPLOYED",
+    "UNEMPLOYED": "NOT EMPLOYED",
+    "SELF": "SELF-EMPLOYED",
+    "SELF EMPLOYED": "SELF-EMPLOYED",
+    "SELFEMPLOYED": "SELF-EMPLOYED",
+}
+
+
+def normalize_employer(value: Optional[str]) -> str:
+    key = " ".join((value or "").upper().replace(".", "").split())
+    return _EMPLOYER_ALIASES.get(key, key)
+
+
+def donor_key(name: Optional[str], zip5: str) -> str:
+    """Individuals have no FEC ID, so a donor is a normalized name within a ZIP code"""
+    return f"{' '.join((name or '').upper().split())}\t{zip5}"
+
+
+def split_donor(entry: dict) -> dict:
+    """A ranked donor entry with its key split back into name and ZIP"""
+    name, zip5 = entry["name"].split("\t")
+    return {**entry, "name": name, "zip": zip5}
+
+
+def size_bucket(amount: float) -> int:
+    return bisect_left(SIZE_BUCKET_BOUNDS, amount)
+
+
+def to_day(value: Optional[str]) -> int:
+    """Days since 1970-01-01 for an FEC date or datetime string, 0 when missing"""
+    try:
+        return (date.fromisoformat((value or "")[:10]) - _EPOCH).days
+    except ValueError:
+        return 0
+
+
+def from_day(day: int) -> Optional[str]:
+    return (_EPOCH + timedelta(days=day)).isoformat() if day else None
+
+
+class Dimension:
+    """Dictionary-encoded values of one column with a running total and count per value"""
+
+    def __init__(self, values: Iterable[str] = (), amounts: bytes = b"", counts: bytes = b""):
+        self.values: List[str] = list(values)
+        self.index = {v: i for i, v in enumerate(self.values)}
+        self.amounts = array("d", amounts)
+        self.counts = array("q", counts)
+
+    def add(self, value: str, amount: float) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+            self.amounts.append(0.0)
+            self.counts.append(0)
+        self.amounts[code] += amount
+        self.counts[code] += 1
+        return code
+
+    def top(self, n: int) -> List[dict]:
+        codes = heapq.nlargest(n, range(len(self.values)), key=self.amounts.__getitem__)
+        return [
+            {"name": self.values[c], "total": round(self.amounts[c], 2), "count": self.counts[c]}
+            for c in codes
+        ]
+
+
+class Ledger:
+    """Ingestion progress and aggregates for one committee and two-year cycle"""
+
+    def __init__(self, committee_id: str, cycle: int, state: Optional[dict] = None,
+                 dimensions: Optional[Dict[str, Dimension]] = None):
+        state = state or {}
+        self.committee_id = committee_id
+        self.cycle = cycle
+        # FEC's last_indexes for the next page of the current pass, None before the first page
+        self.cursor: Optional[dict] = state.get("cursor")
+        # min_date of the current pass, None for the initial full pass
+        self.since: Optional[str] = state.get("since")
+        self.complete: bool = state.get("complete", False)
+        self.completed_at: float = state.get("completed_at", 0.0)
+        self.updated_at: float = state.get("updated_at", 0.0)
+        self.rows: int = state.get("rows", 0)
+        self.total: float = state.get("total", 0.0)
+        self.first_day: int = state.get("first_day", 0)
+        self.last_day: int = state.get("last_day", 0)
+        self.sizes = array("d", state.get("size_totals", [0.0] * len(SIZE_BUCKETS)))
+        self.size_counts = array("q", state.get("size_counts", [0] * len(SIZE_BUCKETS)))
+        self.dimensions = dimensions or {name: Dimension() for name in DIMENSIONS}
+        self.pending = {name: array(code) for name, code in COLUMNS.items()}
+
+    def state(self) -> dict:
+        return {
+            "cursor": self.cursor, "since": self.since, "complete": self.complete,
+            "completed_at": self.completed_at, "updated_at": self.updated_at,
+            "rows": self.rows, "total": self.total, "first_day": self.first_day, "last_day": self.last_day,
+            "size_totals": list(self.sizes), "size_counts": list(self.size_counts),
+        }
+
+    def add(self, row: dict, seen: Set[int]) -> bool:
+        """Fold one Schedule A row into the aggregates and pending columns; False if already counted"""
+        # Memo entries restate contributions itemized elsewhere in the same filing
+        if row.get("memo_code") == "X":
+            return False
+        try:
+            sub_id = int(row.get("sub_id"))
+        except (TypeError, ValueError):
+            return False
+        if sub_id in seen:
+            return False
+        seen.add(sub_id)
+
+        amount = float(row.get("contribution_receipt_amount") or 0.0)
+        day = to_day(row.get("contribution_receipt_date"))
+        size = size_bucket(amount)
+        zip5 = (row.get("contributor_zip") or "")[:5]
+        codes = {
+            "donor": donor_key(row.get("contributor_name"), zip5),
+            "employer": normalize_employer(row.get("contributor_employer")),
+            "state": (row.get("contributor_state") or "").upper(),
+            "zip": zip5,
+        }
+        pending = self.pending
+        pending["sub_id"].append(sub_id)
+        pending["amount"].append(amount)
+        pending["day"].append(day)
+        pending["size"].append(size)
+        for name, value in codes.items():
+            pending[name].append(self.dimensions[name].add(value, amount))
+
+        self.rows += 1
+        self.total += amount
+        self.sizes[size] += amount
+        self.size_counts[size] += 1
+        if day:
+            self.first_day = min(self.first_day, day) if self.first_day else day
+            self.last_day = max(self.last_day, day)
+        return True
+
+    def take_pending(self) -> Dict[str, array]:
+        pending = self.pending
+        self.pending = {name: array(code) for name, code in COLUMNS.items()}
+        return pending
+
+    def summary(self) -> dict:
+        return {
+            "committee_id": self.committee_id,
+            "cycle": self.cycle,
+            "complete": self.complete,
+            "updated_at": self.updated_at,
+            "contributions": self.rows,
+            "total": round(self.total, 2),
+            "first_date": from_day(self.first_day),
+            "last_date": from_day(self.last_day),
+            "by_size": [
+                {"bucket": bucket, "total": round(self.sizes[i], 2), "count": self.size_counts[i]}
+                for i, bucket in enumerate(SIZE_BUCKETS)
+            ],
+            "top_donors": [split_donor(entry) for entry in self.dimensions["donor"].top(SUMMARY_TOP)],
+            "top_employers": self.dimensions["employer"].top(SUMMARY_TOP),
+            "by_state": self.dimensions["state"].top(len(self.dimensions["state"].values)),
+            "top_zips": self.dimensions["zip"].top(SUMMARY_TOP),
+        }
+
+
+class ContributionStore:
+    """Schedule A rows as appended column chunks, plus each ledger's dimensions and progress"""
+
+    def __init__(self, path: Path = SCHEDULE_A_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Everything here can be fetched again, so older layouts are dropped rather than migrated
+            for table in ("ledgers", "dimensions", "chunks"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ledgers (committee_id TEXT NOT NULL, cycle INTEGER NOT NULL, "
+            "state BLOB NOT NULL, summary BLOB NOT NULL, PRIMARY KEY (committee_id, cycle))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dimensions (committee_id TEXT NOT NULL, cycle INTEGER NOT NULL, "
+            "name TEXT NOT NULL, dvalues BLOB NOT NULL, amounts BLOB NOT NULL, counts BLOB NOT NULL, "
+            "PRIMARY KEY (committee_id, cycle, name))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks (committee_id TEXT NOT NULL, cycle INTEGER NOT NULL, "
+            "seq INTEGER NOT NULL, rows INTEGER NOT NULL, "
+            + ", ".join(f"{name} BLOB NOT NULL" for name in COLUMNS)
+            + ", PRIMARY KEY (committee_id, cycle, seq))"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def summary(self, committee_id: str, cycle: int) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT summary FROM ledgers WHERE committee_id = ? AND cycle = ?", (committee_id, cycle)
+        ).fetchone()
+        return from_json(row[0]) if row else None
+
+    def load(self, committee_id: str, cycle: int) -> Ledger:
+        """The stored ledger with its dimensions, or an empty one"""
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT state FROM ledgers WHERE committee_id = ? AND cycle = ?", (committee_id, cycle)
+        ).fetchone()
+        if row is None:
+            return Ledger(committee_id, cycle)
+        dimensions = {name: Dimension() for name in DIMENSIONS}
+        for name, values, amounts, counts in conn.execute(
+            "SELECT name, dvalues, amounts, counts FROM dimensions WHERE committee_id = ? AND cycle = ?",
+            (committee_id, cycle),
+        ):
+            dimensions[name] = Dimension(from_json(values), amounts, counts)
+        return Ledger(committee_id, cycle, from_json(row[0]), dimensions)
+
+    def sub_ids(self, committee_id: str, cycle: int) -> Set[int]:
+        ids: Set[int] = set()
+        for (blob,) in self._conn().execute(
+            "SELECT sub_id FROM chunks WHERE committee_id = ? AND cycle = ?", (committee_id, cycle)
+        ):
+            ids.update(array("Q", blob))
+        return ids
+
+    def columns(self, committee_id: str, cycle: int) -> Tuple[Dict[str, array], Dict[str, List[str]]]:
+        """Every stored row as columns, and the values the dimension codes refer to"""
+        columns = {name: array(code) for name, code in COLUMNS.items()}
+        conn = self._conn()
+        for chunk in conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM chunks WHERE committee_id = ? AND cycle = ? ORDER BY seq",
+            (committee_id, cycle),
+        ):
+            for name, blob in zip(COLUMNS, chunk):
+                columns[name].frombytes(blob)
+        values = {
+            name: from_json(dvalues)
+            for name, dvalues in conn.execute(
+                "SELECT name, dvalues FROM dimensions WHERE committee_id = ? AND cycle = ?", (committee_id, cycle)
+            )
+        }
+        return columns, values
+
+    def save(self, ledger: Ledger, pending: Dict[str, array], summary: dict) -> None:
+        """Append the new rows and write the ledger's progress and aggregates in one transaction"""
+        key = (ledger.committee_id, ledger.cycle)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if pending["sub_id"]:
+                seq = conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) + 1 FROM chunks WHERE committee_id = ? AND cycle = ?", key
+                ).fetchone()[0]
+                conn.execute(
+                    f"INSERT INTO chunks (committee_id, cycle, seq, rows, {', '.join(COLUMNS)}) "
+                    f"VALUES (?, ?, ?, ?, {', '.join('?' * len(COLUMNS))})",
+                    (*key, seq, len(pending["sub_id"]), *(pending[name].tobytes() for name in COLUMNS)),
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO dimensions (committee_id, cycle, name, dvalues, amounts, counts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, name, to_json(d.values), d.amounts.tobytes(), d.counts.tobytes())
+                    for name, d in ledger.dimensions.items()
+                ],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO ledgers (committee_id, cycle, state, summary) VALUES (?, ?, ?, ?)",
+                (*key, to_json(ledger.state()), to_json(summary)),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class ContributionStoreUnavailable(Exception):
+    """The Schedule A store could not be opened on this server"""
+
+
+class ContributionService:
+    """Incrementally ingests committees' Schedule A receipts and serves their precomputed aggregates"""
+
+    def __init__(self):
+        self._store: Optional[ContributionStore] = None
+        self._store_failed = False
+        self._summaries: Dict[Tuple[str, int], dict] = {}
+        self._runs: Dict[Tuple[str, int], asyncio.Task] = {}
+        # Set by a run once it has persisted its first pages, so waiting requests need not wait for the rest
+        self._persisted: Dict[Tuple[str, int], asyncio.Event] = {}
+        self._lease_owner = f"{os.getpid()}:{id(self)}"
+
+    def _open_store(self) -> Optional[ContributionStore]:
+        if self._store is None and not self._store_failed:
+            try:
+                self._store = ContributionStore()
+            except (OSError, sqlite3.Error) as e:
+                # Donation endpoints answer 503 rather than 500 until the process is restarted with a usable path
+                logger.warning("Schedule A store unavailable, donation summaries disabled: %s", e)
+                self._store_failed = True
+        return self._store
+
+    def _require_store(self) -> ContributionStore:
+        store = self._open_store()
+        if store is None:
+            raise ContributionStoreUnavailable("The contribution store is unavailable on this server")
+        return store
+
+    async def _fetch_page(self, ledger: Ledger) -> Tuple[List[dict], Optional[dict]]:
+        params = {
+            "committee_id": ledger.committee_id,
+            "two_year_transaction_period": ledger.cycle,
+            "contributor_type": "individual",
+            "sort": "contribution_receipt_date",
+            "per_page": SCHEDULE_A_PAGE_SIZE,
+        }
+        if ledger.since:
+            params["min_date"] = ledger.since
+        if ledger.cursor:
+            params.update(ledger.cursor)
+        response = await upstream_clients.fec.get("/schedules/schedule_a/", params=params, timeout=SCHEDULE_A_TIMEOUT)
+        response.raise_for_status()
+        body = response.json()
+        return body.get("results", []), (body.get("pagination") or {}).get("last_indexes")
+
+    async def _persist(self, store: ContributionStore, ledger: Ledger, lease: str) -> None:
+        ledger.updated_at = time.time()
+        summary = ledger.summary()
+        await asyncio.to_thread(store.save, ledger, ledger.take_pending(), summary)
+        key = (ledger.committee_id, ledger.cycle)
+        self._summaries[key] = summary
+        event = self._persisted.get(key)
+        if event is not None:
+            event.set()
+        # Renews the lease for the next stretch of pages
+        try:
+            await asyncio.to_thread(shared_backend.acquire_lease, lease, self._lease_owner, SCHEDULE_A_LEASE_TTL)
+        except Exception:
+            pass
+
+    async def _run(self, committee_id: str, cycle: int, interactive: bool) -> None:
+        store = self._open_store()
+        if store is None:
+            return
+        lease = f"schedule_a:{committee_id}:{cycle}"
+        try:
+            leased = await asyncio.to_thread(shared_backend.acquire_lease, lease, self._lease_owner, SCHEDULE_A_LEASE_TTL)
+        except Exception:
+            leased = True
+        if not leased:
+            # Another worker is ingesting this ledger; serve what it has written so far
+            summary = await asyncio.to_thread(store.summary, committee_id, cycle)
+            if summary is not None:
+                self._summaries[(committee_id, cycle)] = summary
+            return
+        try:
+            ledger = await asyncio.to_thread(store.load, committee_id, cycle)
+            if ledger.complete:
+                if time.time() - ledger.completed_at < SCHEDULE_A_REFRESH:
+                    self._summaries[(committee_id, cycle)] = ledger.summary()
+                    return
+                # Top-up pass over recent receipts; rows already stored are skipped by sub_id
+                ledger.complete = False
+                ledger.cursor = None
+                ledger.since = from_day(max(ledger.last_day - SCHEDULE_A_LOOKBACK_DAYS, 1)) if ledger.last_day else None
+            seen = await asyncio.to_thread(store.sub_ids, committee_id, cycle)
+
+            for page in range(SCHEDULE_A_MAX_PAGES_PER_RUN):
+                # A request may be waiting on the first pages of a new ledger
+                priority = INTERACTIVE if interactive and page < SCHEDULE_A_PERSIST_PAGES else BACKGROUND
+                with upstream_priority(priority):
+                    results, last_indexes = await self._fetch_page(ledger)
+                for row in results:
+                    ledger.add(row, seen)
+                if not results or not last_indexes or len(results) < SCHEDULE_A_PAGE_SIZE:
+                    ledger.complete = True
+                    ledger.completed_at = time.time()
+                    ledger.cursor = None
+                    ledger.since = None
+                else:
+                    ledger.cursor = last_indexes
+                if ledger.complete or page % SCHEDULE_A_PERSIST_PAGES == 0:
+                    await self._persist(store, ledger, lease)
+                if ledger.complete:
+                    logger.info("Ingested Schedule A for %s/%s: %s contributions", committee_id, cycle, ledger.rows)
+                    return
+            await self._persist(store, ledger, lease)
+        finally:
+            try:
+                await asyncio.to_thread(shared_backend.release_lease, lease, self._lease_owner)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Schedule A ingestion failed: %s", task.exception())
+
+    def _trigger_run(self, committee_id: str, cycle: int, interactive: bool) -> asyncio.Task:
+        key = (committee_id, cycle)
+        task = self._runs.get(key)
+        if task is None or task.done():
+            self._persisted[key] = asyncio.Event()
+            task = self._runs[key] = asyncio.ensure_future(self._run(committee_id, cycle, interactive))
+            task.add_done_callback(self._log_failure)
+            task.add_done_callback(self._run_done(key))
+        return task
+
+    def _run_done(self, key: Tuple[str, int]):
+        def done(task: asyncio.Task) -> None:
+            if self._runs.get(key) is task:
+                self._runs.pop(key, None)
+                self._persisted.pop(key, None)
+        return done
+
+    async def summary(self, committee_id: str, cycle: int, wait: float = 0.0) -> Optional[dict]:
+        """Precomputed aggregates for a committee's cycle, starting or resuming ingestion as needed
+
+        With nothing stored yet, waits up to `wait` seconds for the first pages. None if there is
+        still nothing to serve.
+        """
+        key = (committee_id.upper(), cycle)
+        summary = self._summaries.get(key)
+        if summary is None:
+            summary = await asyncio.to_thread(self._require_store().summary, *key)
+            if summary is not None:
+                self._summaries[key] = summary
+
+        if summary is None or not summary["complete"] or time.time() - summary["updated_at"] >= SCHEDULE_A_REFRESH:
+            task = self._trigger_run(*key, interactive=summary is None)
+            if summary is None and wait > 0:
+                # Whichever comes first: the first persisted pages, the end of the run, or the deadline
+                persisted = self._persisted.get(key)
+                first_pages = asyncio.ensure_future(persisted.wait()) if persisted is not None else None
+                try:
+                    # asyncio.wait never cancels the run itself, which other requests may be waiting on
+                    await asyncio.wait({task, first_pages} - {None}, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    if first_pages is not None:
+                        first_pages.cancel()
+                summary = self._summaries.get(key)
+                if summary is None and task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        return summary
+
+    async def columns(self, committee_id: str, cycle: int) -> Tuple[Dict[str, array], Dict[str, List[str]]]:
+        return await asyncio.to_thread(self._require_store().columns, committee_id.upper(), cycle)
+
+    async def stop(self) -> None:
+        tasks = [t for t in self._runs.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._runs.clear()
+
+
+contribution_service = ContributionService()
@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+try:
+    from .http_clients import upstream_clients
+    from .ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from .shared_cache import shared_backend
+    from .snapshot import DATA_CACHE_DIR
+except ImportError:
+    from http_clients import upstream_clients
+    from ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from shared_cache import shared_backend
+    from snapshot import DATA_CACHE_DIR
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CROSSWALK_PATH = Path(os.getenv("CROSSWALK_PATH", str(DATA_CACHE_DIR / "crosswalk.sqlite3")))
+CROSSWALK_TTL = float(os.getenv("CROSSWALK_TTL_SECONDS", "604800"))
+CROSSWALK_RETRY_BACKOFF = float(os.getenv("CROSSWALK_RETRY_BACKOFF_SECONDS", "300"))
+CROSSWALK_BACKGROUND_REFRESH = os.getenv("CROSSWALK_BACKGROUND_REFRESH", "true").lower() in ("1", "true", "yes")
+CROSSWALK_LEASE = "crosswalk"
+CROSSWALK_LEASE_TTL = 600.0
+
+LEGISLATORS_FILE = "/legislators-current.json"
+# FEC accepts repeated candidate_id parameters; this many fit comfortably in one request
+FEC_BATCH_SIZE = 100
+
+
+@dataclass(frozen=True)
+class CrosswalkEntry:
+    bioguide_id: str
+    # Every FEC candidate ID on record, oldest first
+    candidate_ids: Tuple[str, ...]
+    # The ID for the office the member currently holds, when one matches
+    candidate_id: Optional[str]
+    committee_ids: Tuple[str, ...]
+    # "H" or "S"
+    office: Optional[str]
+
+
+class CrosswalkStore:
+    """Persisted bioguide -> FEC crosswalk, replaced wholesale on each rebuild"""
+
+    def __init__(self, path: Path = CROSSWALK_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS crosswalk ("
+            "bioguide_id TEXT PRIMARY KEY, candidate_ids TEXT NOT NULL, candidate_id TEXT, "
+            "committee_ids TEXT NOT NULL, office TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS crosswalk_candidate ON crosswalk (candidate_id)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def replace(self, entries: Iterable[CrosswalkEntry], built_at: float) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM crosswalk")
+            conn.executemany(
+                "INSERT INTO crosswalk (bioguide_id, candidate_ids, candidate_id, committee_ids, office) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (e.bioguide_id, to_json(e.candidate_ids), e.candidate_id, to_json(e.committee_ids), e.office)
+                    for e in entries
+                ],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built_at', ?)", (built_at,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def load(self) -> Tuple[Dict[str, CrosswalkEntry], float]:
+        """All entries and the time they were built (0 if never)"""
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'built_at'").fetchone()
+        entries = {
+            bioguide_id: CrosswalkEntry(
+                bioguide_id, tuple(from_json(candidate_ids)), candidate_id, tuple(from_json(committee_ids)), office
+            )
+            for bioguide_id, candidate_ids, candidate_id, committee_ids, office in conn.execute(
+                "SELECT bioguide_id, candidate_ids, candidate_id, committee_ids, office FROM crosswalk"
+            )
+        }
+        return entries, row[0] if row else 0.0
+
+
+def _current_office(legislator: dict) -> Optional[str]:
+    terms = legislator.get("terms") or []
+    if not terms:
+        return None
+    return {"rep": "H", "sen": "S"}.get(terms[-1].get("type"))
+
+
+def _primary_candidate_id(candidate_ids: List[str], office: Optional[str]) -> Optional[str]:
+    # FEC candidate IDs start with the office letter; the newest matching one is the active campaign
+    matching = [c for c in candidate_ids if office and c.startswith(office)]
+    if matching:
+        return matching[-1]
+    return candidate_ids[-1] if candidate_ids else None
+
+
+async def _principal_committees(candidate_ids: List[str]) -> Dict[str, List[str]]:
+    """candidate ID -> principal campaign committee IDs, looked up in batches"""
+    client = upstream_clients.fec
+    batches = [candidate_ids[i:i + FEC_BATCH_SIZE] for i in range(0, len(candidate_ids), FEC_BATCH_SIZE)]
+
+    async def fetch(batch: List[str]) -> List[dict]:
+        response = await client.get(
+            "/candidates/search/", params={"candidate_id": batch, "per_page": FEC_BATCH_SIZE}
+        )
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+    committees: Dict[str, List[str]] = {}
+    for results in await asyncio.gather(*(fetch(b) for b in batches)):
+        for candidate in results:
+            committees[candidate["candidate_id"]] = [
+                c["committee_id"] for c in candidate.get("principal_committees") or [] if c.get("committee_id")
+            ]
+    return committees
+
+
+async def build_crosswalk() -> List[CrosswalkEntry]:
+    """Join congress-legislators' FEC IDs with FEC's principal committees for every current member"""
+    response = await upstream_clients.legislators.get(LEGISLATORS_FILE)
+    response.raise_for_status()
+    legislators = response.json()
+
+    fec_ids: Dict[str, List[str]] = {}
+    offices: Dict[str, Optional[str]] = {}
+    for legislator in legislators:
+        ids = legislator.get("id", {})
+        bioguide_id = ids.get("bioguide")
+        if bioguide_id:
+            fec_ids[bioguide_id] = list(ids.get("fec") or [])
+            offices[bioguide_id] = _current_office(legislator)
+
+    primary = {b: _primary_candidate_id(ids, offices[b]) for b, ids in fec_ids.items()}
+    committees = await _principal_committees(sorted({c for c in primary.values() if c}))
+    return [
+        CrosswalkEntry(
+            bioguide_id=bioguide_id,
+            candidate_ids=tuple(ids),
+            candidate_id=primary[bioguide_id],
+            committee_ids=tuple(committees.get(primary[bioguide_id], ())),
+            office=offices[bioguide_id],
+        )
+        for bioguide_id, ids in fec_ids.items()
+    ]
+
+
+class CrosswalkService:
+    """In-memory crosswalk backed by the local store and rebuilt in bulk in the background"""
+
+    def __init__(self):
+        self._store: Optional[CrosswalkStore] = None
+        self._entries: Optional[Dict[str, CrosswalkEntry]] = None
+        self._built_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._lease_owner = f"{os.getpid()}:{id(self)}"
+
+    def _open_store(self) -> Optional[CrosswalkStore]:
+        if self._store is None:
+            try:
+                self._store = CrosswalkStore()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Crosswalk store unavailable, keeping it in memory only: %s", e)
+        return self._store
+
+    async def load(self) -> bool:
+        """Serve the persisted crosswalk, if any, until the next rebuild"""
+        store = self._open_store()
+        if store is None:
+            return False
+        entries, built_at = await asyncio.to_thread(store.load)
+        if not entries or built_at <= self._built_at:
+            return False
+        self._entries, self._built_at = entries, built_at
+        return True
+
+    async def _refresh(self) -> None:
+        # Another worker may have rebuilt it already
+        if self._entries is not None and await self.load() and time.time() - self._built_at < CROSSWALK_TTL:
+            return
+        try:
+            if not await asyncio.to_thread(shared_backend.acquire_lease, CROSSWALK_LEASE, self._lease_owner, CROSSWALK_LEASE_TTL):
+                if self._entries is not None:
+                    return
+        except Exception:
+            pass
+        try:
+            with upstream_priority(BACKGROUND if self._entries is not None else INTERACTIVE):
+                entries = await build_crosswalk()
+            built_at = time.time()
+            store = self._open_store()
+            if store is not None:
+                await asyncio.to_thread(store.replace, entries, built_at)
+            self._entries = {e.bioguide_id: e for e in entries}
+            self._built_at = built_at
+            self._failures = 0
+            logger.info("Rebuilt FEC crosswalk: %s members", len(entries))
+        except Exception:
+            self._failures += 1
+            raise
+        finally:
+            try:
+                await asyncio.to_thread(shared_backend.release_lease, CROSSWALK_LEASE, self._lease_owner)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Crosswalk rebuild failed: %s", task.exception())
+
+    def _trigger_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._log_failure)
+        return self._refresh_task
+
+    async def lookup(self, bioguide_id: str) -> Optional[CrosswalkEntry]:
+        """Crosswalk entry for a member, building the crosswalk first if none exists yet"""
+        if self._entries is None:
+            await self.load()
+        if self._entries is None:
+            await asyncio.shield(self._trigger_refresh())
+        return self._entries.get(bioguide_id.upper())
+
+    def age(self) -> Optional[float]:
+        return time.time() - self._built_at if self._entries is not None else None
+
+    def _next_refresh_delay(self) -> float:
+        if self._failures:
+            return min(CROSSWALK_TTL, CROSSWALK_RETRY_BACKOFF * 2 ** (self._failures - 1)) * random.uniform(0.5, 1.0)
+        if self._entries is None:
+            return 0.0
+        return max(0.0, self._built_at + CROSSWALK_TTL - time.time()) + random.uniform(0, 60)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_delay())
+            try:
+                await asyncio.shield(self._trigger_refresh())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Logged by the refresh task; the backoff is picked up from the failure count
+                pass
+
+    def start_background_refresh(self) -> None:
+        if not CROSSWALK_BACKGROUND_REFRESH:
+            return
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        tasks = [t for t in (self._loop_task, self._refresh_task) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._refresh_task = None
+
+
+crosswalk_service = CrosswalkService()
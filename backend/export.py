@@ -0,0 +1,64 @@
+import csv
+import io
+from typing import AsyncIterator, Optional, Sequence
+
+from pydantic_core import to_json
+
+try:
+    from .models import Member
+except ImportError:
+    from models import Member
+
+MEMBER_FIELDS = tuple(Member.model_fields)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Rows are buffered into chunks of about this size before being written to the socket
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def export_columns(include: Optional[set]) -> Sequence[str]:
+    """Exported columns in Member field order, limited to `include` when given"""
+    if include is None:
+        return MEMBER_FIELDS
+    return tuple(f for f in MEMBER_FIELDS if f in include)
+
+
+async def ndjson_rows(members: AsyncIterator[Member], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """One JSON object per line"""
+    include = set(columns)
+    async for member in members:
+        yield to_json(member.model_dump(include=include)) + b"\n"
+
+
+async def csv_rows(members: AsyncIterator[Member], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """Header line, then one CSV record per member"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values) -> bytes:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue().encode()
+
+    yield line(columns)
+    async for member in members:
+        yield line(["" if (v := getattr(member, c)) is None else v for c in columns])
+
+
+async def chunked(rows: AsyncIterator[bytes], chunk_bytes: int = EXPORT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Coalesce small rows so each write carries a reasonable amount of data"""
+    pending = []
+    size = 0
+    async for row in rows:
+        pending.append(row)
+        size += len(row)
+        if size >= chunk_bytes:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
@@ -0,0 +1,316 @@
+import asyncio
+import csv
+import logging
+import math
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from pydantic_core import from_json
+
+try:
+    from .models import DistrictLookup, DistrictMatch
+    from .roster_index import RosterIndex, state_key
+except ImportError:
+    from models import DistrictLookup, DistrictMatch
+    from roster_index import RosterIndex, state_key
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GEO_DATA_DIR = Path(__file__).parent / "data" / "geo"
+# Census cartographic boundary file for the current Congress, as GeoJSON (e.g. cb_2024_us_cd119_500k)
+DISTRICT_BOUNDARIES_PATH = Path(os.getenv(
+    "DISTRICT_BOUNDARIES_PATH", str(GEO_DATA_DIR / "congressional-districts.geojson")
+))
+# ZIP/ZCTA to district relationship file: Census tab20_zcta520_cd119_natl.txt or a HUD ZIP-CD crosswalk CSV
+ZIP_DISTRICTS_PATH = Path(os.getenv("ZIP_DISTRICTS_PATH", str(GEO_DATA_DIR / "zip-districts.csv")))
+# Grid cell size of the spatial index, in degrees
+GEO_GRID_DEGREES = float(os.getenv("GEO_GRID_DEGREES", "0.25"))
+
+STATE_FIPS = {
+    "01": "AL", "02": "AK", "04": "AZ", "05": "AR", "06": "CA", "08": "CO", "09": "CT", "10": "DE",
+    "11": "DC", "12": "FL", "13": "GA", "15": "HI", "16": "ID", "17": "IL", "18": "IN", "19": "IA",
+    "20": "KS", "21": "KY", "22": "LA", "23": "ME", "24": "MD", "25": "MA", "26": "MI", "27": "MN",
+    "28": "MS", "29": "MO", "30": "MT", "31": "NE", "32": "NV", "33": "NH", "34": "NJ", "35": "NM",
+    "36": "NY", "37": "NC", "38": "ND", "39": "OH", "40": "OK", "41": "OR", "42": "PA", "44": "RI",
+    "45": "SC", "46": "SD", "47": "TN", "48": "TX", "49": "UT", "50": "VT", "51": "VA", "53": "WA",
+    "54": "WV", "55": "WI", "56": "WY", "60": "AS", "66": "GU", "69": "MP", "72": "PR", "78": "VI",
+}
+# Census codes: 00 is an at-large seat, 98 a non-voting delegate, ZZ water not assigned to any district
+AT_LARGE_CODES = {"", "0", "00", "98", "AL", "AT-LARGE"}
+UNASSIGNED_CODES = {"ZZ"}
+
+# Column and property names as published by Census and HUD, lowercased
+_ZIP_COLUMNS = ("zip", "zcta", "zcta5", "geoid_zcta5_20", "zcta5ce20")
+_STATE_COLUMNS = ("state", "stusps", "statefp", "usps_zip_pref_state")
+_DISTRICT_COLUMNS = ("district", "cd", "cdfp")
+_SHARE_COLUMNS = ("res_ratio", "tot_ratio", "ratio", "share", "afact")
+_AREA_COLUMNS = ("arealand_part",)
+# State FIPS + district code in one field, e.g. GEOID_CD119_20 or HUD's CD
+_CD_GEOID = re.compile(r"^geoid_cd\d+_\d+$")
+_CD_FP = re.compile(r"^cd\d*fp$")
+
+DistrictKey = Tuple[str, str]
+
+
+class GeoDataUnavailable(Exception):
+    """A boundary or ZIP file the lookup needs is missing or unreadable"""
+
+
+def state_abbr(value: object) -> str:
+    text = str(value).strip()
+    if text.isdigit():
+        return STATE_FIPS.get(text.zfill(2), text)
+    return state_key(text)
+
+
+def district_label(value: object) -> Optional[str]:
+    """The roster's district string for a boundary or crosswalk code, None for unassigned areas"""
+    code = str(value).strip().upper()
+    if code in UNASSIGNED_CODES:
+        return None
+    if code in AT_LARGE_CODES:
+        return "At-Large"
+    return str(int(code)) if code.isdigit() else code
+
+
+def _pick(fields: Dict[str, object], names: Sequence[str], pattern: Optional[re.Pattern] = None) -> Optional[str]:
+    """The first of `names` (or a field matching `pattern`) present in a case-insensitive record"""
+    for name in names:
+        if name in fields:
+            return name
+    if pattern is not None:
+        return next((name for name in fields if pattern.match(name)), None)
+    return None
+
+
+def _feature_key(properties: dict) -> Optional[DistrictKey]:
+    props = {k.lower(): v for k, v in properties.items()}
+    state = _pick(props, _STATE_COLUMNS)
+    district = _pick(props, _DISTRICT_COLUMNS, _CD_FP)
+    if state is None or district is None:
+        return None
+    label = district_label(props[district])
+    return (state_abbr(props[state]), label) if label else None
+
+
+def _polygons(geometry: dict) -> List[list]:
+    if geometry.get("type") == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry.get("type") == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+class DistrictShapes:
+    """District polygons behind a uniform lon/lat grid; each cell lists the polygon parts whose box touches it"""
+
+    def __init__(self, keys: List[DistrictKey], parts: List[Tuple[int, list]], cell: float = GEO_GRID_DEGREES):
+        self.keys = keys
+        self.cell = cell
+        self._part_key: List[int] = []
+        self._boxes: List[Tuple[float, float, float, float]] = []
+        self._slices: List[Tuple[int, int]] = []
+        edges: List[np.ndarray] = []
+        count = 0
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for key_index, rings in parts:
+            # Edges of the outer ring and its holes together; the even-odd rule handles the holes
+            ring_edges = []
+            for ring in rings:
+                points = np.asarray(ring, dtype=np.float64)[:, :2]
+                if len(points) and not np.array_equal(points[0], points[-1]):
+                    points = np.vstack((points, points[:1]))
+                if len(points) >= 4:
+                    ring_edges.append(np.hstack((points[:-1], points[1:])))
+            if not ring_edges:
+                continue
+            part_edges = np.vstack(ring_edges)
+            x0, y0 = part_edges[:, [0, 2]].min(), part_edges[:, [1, 3]].min()
+            x1, y1 = part_edges[:, [0, 2]].max(), part_edges[:, [1, 3]].max()
+            part = len(self._part_key)
+            self._part_key.append(key_index)
+            self._boxes.append((x0, y0, x1, y1))
+            self._slices.append((count, count + len(part_edges)))
+            count += len(part_edges)
+            edges.append(part_edges)
+            for ix in range(math.floor(x0 / cell), math.floor(x1 / cell) + 1):
+                for iy in range(math.floor(y0 / cell), math.floor(y1 / cell) + 1):
+                    grid.setdefault((ix, iy), []).append(part)
+        # Columns: x1, y1, x2, y2 of every edge
+        self._edges = np.ascontiguousarray(np.vstack(edges).T) if edges else np.empty((4, 0))
+        self._grid = {cell_key: tuple(p) for cell_key, p in grid.items()}
+
+    @classmethod
+    def from_geojson(cls, data: dict, cell: float = GEO_GRID_DEGREES) -> "DistrictShapes":
+        keys: List[DistrictKey] = []
+        key_index: Dict[DistrictKey, int] = {}
+        parts: List[Tuple[int, list]] = []
+        for feature in data.get("features", []):
+            key = _feature_key(feature.get("properties") or {})
+            if key is None:
+                continue
+            index = key_index.setdefault(key, len(keys))
+            if index == len(keys):
+                keys.append(key)
+            parts.extend((index, rings) for rings in _polygons(feature.get("geometry") or {}))
+        return cls(keys, parts, cell)
+
+    def _contains(self, part: int, lon: float, lat: float) -> bool:
+        start, end = self._slices[part]
+        x1, y1, x2, y2 = self._edges[:, start:end]
+        # Ray cast towards +lon: count edges straddling the point's latitude that cross east of it
+        crossing = np.flatnonzero((y1 > lat) != (y2 > lat))
+        if not crossing.size:
+            return False
+        ya, yb = y1[crossing], y2[crossing]
+        xa, xb = x1[crossing], x2[crossing]
+        return bool(np.count_nonzero(lon < xa + (lat - ya) * (xb - xa) / (yb - ya)) & 1)
+
+    def locate(self, lat: float, lon: float) -> Optional[DistrictKey]:
+        """The district containing a point, or None outside every district"""
+        for part in self._grid.get((math.floor(lon / self.cell), math.floor(lat / self.cell)), ()):
+            x0, y0, x1, y1 = self._boxes[part]
+            if x0 <= lon <= x1 and y0 <= lat <= y1 and self._contains(part, lon, lat):
+                return self.keys[self._part_key[part]]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def load_zip_districts(path: Path) -> Dict[str, Tuple[Tuple[DistrictKey, Optional[float]], ...]]:
+    """ZIP -> ((state, district), share) pairs, largest share first"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = f.readline()
+        delimiter = "|" if header.count("|") > header.count(",") else ","
+        f.seek(0)
+        reader = csv.reader(f, delimiter=delimiter)
+        columns = {name.strip().lower(): i for i, name in enumerate(next(reader))}
+        zip_col = _pick(columns, _ZIP_COLUMNS)
+        geoid_col = _pick(columns, (), _CD_GEOID)
+        state_col = _pick(columns, _STATE_COLUMNS)
+        district_col = _pick(columns, _DISTRICT_COLUMNS, _CD_FP)
+        share_col = _pick(columns, _SHARE_COLUMNS) or _pick(columns, _AREA_COLUMNS)
+        code_col = geoid_col or district_col
+        if zip_col is None or code_col is None:
+            raise GeoDataUnavailable(f"{path.name} has no ZIP and district columns")
+
+        # Blank and truncated rows (a trailing newline, a cut-off download) are skipped
+        needed = max(columns[c] for c in (zip_col, code_col, state_col, share_col) if c is not None)
+        weights: Dict[str, Dict[DistrictKey, float]] = {}
+        for row in reader:
+            if len(row) <= needed:
+                continue
+            zip_code = row[columns[zip_col]].strip()
+            if not zip_code:
+                continue
+            code = row[columns[code_col]].strip()
+            if len(code) == 4 and code[:2].isdigit():
+                # State FIPS + district, as in Census GEOIDs and HUD's CD column
+                state, label = state_abbr(code[:2]), district_label(code[2:])
+            elif state_col is not None:
+                state, label = state_abbr(row[columns[state_col]]), district_label(code)
+            else:
+                continue
+            if label is None:
+                continue
+            share = float(row[columns[share_col]] or 0) if share_col else 1.0
+            districts = weights.setdefault(zip_code.zfill(5), {})
+            districts[(state, label)] = districts.get((state, label), 0.0) + share
+
+    result = {}
+    for zip_code, districts in weights.items():
+        total = sum(districts.values())
+        ranked = sorted(districts.items(), key=lambda kv: (-kv[1], kv[0]))
+        # Land area parts are normalized into shares; a ZIP in one district needs no share at all
+        result[zip_code] = tuple(
+            (key, round(weight / total, 4) if total and len(ranked) > 1 else None) for key, weight in ranked
+        )
+    return result
+
+
+def resolve(index: RosterIndex, matches: Sequence[Tuple[DistrictKey, Optional[float]]], **query) -> DistrictLookup:
+    """District and Member objects from the roster for matched districts, plus the states' senators"""
+    states = list(dict.fromkeys(state for (state, _), _ in matches))
+    return DistrictLookup(
+        **query,
+        districts=[
+            DistrictMatch(state=state, district=district, representative=index.by_district.get((state, district)), share=share)
+            for (state, district), share in matches
+        ],
+        senators=[s for state in states for s in index.senators_by_state.get(state, ())],
+    )
+
+
+class DistrictLocator:
+    """Lazily loaded boundary and ZIP files answering district lookups in memory"""
+
+    def __init__(self, boundaries_path: Path = DISTRICT_BOUNDARIES_PATH, zip_path: Path = ZIP_DISTRICTS_PATH):
+        self.boundaries_path = boundaries_path
+        self.zip_path = zip_path
+        self._shapes: Optional[DistrictShapes] = None
+        self._zips: Optional[Dict[str, tuple]] = None
+        self._loading: Dict[str, asyncio.Future] = {}
+        # name -> (file mtime, error) for a file that failed to parse, so it is not re-read until it changes
+        self._failed: Dict[str, Tuple[float, str]] = {}
+
+    @staticmethod
+    def _read_shapes(path: Path) -> DistrictShapes:
+        shapes = DistrictShapes.from_geojson(from_json(path.read_bytes()))
+        logger.info("Loaded %s district boundaries from %s", len(shapes), path)
+        return shapes
+
+    async def _load(self, name: str, path: Path, read):
+        # Concurrent first requests share one read of the file
+        future = self._loading.get(name)
+        if future is None:
+            if not path.is_file():
+                raise GeoDataUnavailable(f"{path.name} is not installed on this server")
+            failed = self._failed.get(name)
+            if failed is not None and failed[0] == path.stat().st_mtime:
+                raise GeoDataUnavailable(failed[1])
+            future = self._loading[name] = asyncio.ensure_future(asyncio.to_thread(read, path))
+        try:
+            return await asyncio.shield(future)
+        except GeoDataUnavailable as e:
+            self._remember_failure(name, path, str(e))
+            raise
+        except Exception as e:
+            # Any malformed content is a data problem, not a server error
+            message = f"Could not read {path.name}: {e}"
+            self._remember_failure(name, path, message)
+            raise GeoDataUnavailable(message) from e
+        finally:
+            if future.done():
+                self._loading.pop(name, None)
+
+    def _remember_failure(self, name: str, path: Path, message: str) -> None:
+        try:
+            self._failed[name] = (path.stat().st_mtime, message)
+        except OSError:
+            self._failed.pop(name, None)
+
+    async def shapes(self) -> DistrictShapes:
+        if self._shapes is None:
+            self._shapes = await self._load("shapes", self.boundaries_path, self._read_shapes)
+        return self._shapes
+
+    async def zips(self) -> Dict[str, tuple]:
+        if self._zips is None:
+            self._zips = await self._load("zips", self.zip_path, load_zip_districts)
+        return self._zips
+
+    async def by_point(self, lat: float, lon: float) -> Optional[DistrictKey]:
+        return (await self.shapes()).locate(lat, lon)
+
+    async def by_zip(self, zip_code: str) -> tuple:
+        return (await self.zips()).get(zip_code, ())
+
+
+district_locator = DistrictLocator()
@@ -0,0 +1,161 @@
+import importlib.util
+import os
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    from .ratelimit import GovernedTransport, UpstreamGovernor
+    from .resilience import CircuitBreaker, ResilientTransport
+except ImportError:
+    from ratelimit import GovernedTransport, UpstreamGovernor
+    from resilience import CircuitBreaker, ResilientTransport
+
+load_dotenv()
+
+# Upstream base URLs (overridable so the app can be pointed at a local stand-in)
+CONGRESS_API_BASE = os.getenv("CONGRESS_API_BASE", "https://api.congress.gov/v3")
+FEC_API_BASE = os.getenv("FEC_API_BASE", "https://api.open.fec.gov/v1")
+# unitedstates/congress-legislators data files (bioguide <-> FEC ID crosswalk)
+LEGISLATORS_BASE = os.getenv("LEGISLATORS_BASE", "https://unitedstates.github.io/congress-legislators")
+# senate.gov roll call vote XML (Congress.gov has no Senate votes)
+SENATE_VOTES_BASE = os.getenv("SENATE_VOTES_BASE", "https://www.senate.gov/legislative/LIS/roll_call_votes")
+# Member portraits (Congress.gov depictions) fetched once each for local resizing
+PORTRAIT_BASE = os.getenv("PORTRAIT_BASE", "https://www.congress.gov")
+
+CONGRESS_API_KEY = os.getenv("CONGRESS_API_KEY")
+FEC_API_KEY = os.getenv("NEXT_PUBLIC_FEC_API_KEY")
+
+# Connection pool settings shared by every upstream client
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Per-upstream timeouts
+CONGRESS_TIMEOUT = float(os.getenv("CONGRESS_TIMEOUT_SECONDS", "15"))
+FEC_TIMEOUT = float(os.getenv("FEC_TIMEOUT_SECONDS", "20"))
+LEGISLATORS_TIMEOUT = float(os.getenv("LEGISLATORS_TIMEOUT_SECONDS", "30"))
+SENATE_VOTES_TIMEOUT = float(os.getenv("SENATE_VOTES_TIMEOUT_SECONDS", "20"))
+PORTRAIT_TIMEOUT = float(os.getenv("PORTRAIT_TIMEOUT_SECONDS", "15"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+
+# Outbound quota governors (both APIs enforce hourly per-key quotas)
+CONGRESS_RATE_PER_HOUR = float(os.getenv("CONGRESS_RATE_PER_HOUR", "5000"))
+CONGRESS_BURST = int(os.getenv("CONGRESS_BURST", "50"))
+CONGRESS_MAX_CONCURRENCY = int(os.getenv("CONGRESS_MAX_CONCURRENCY", "8"))
+FEC_RATE_PER_HOUR = float(os.getenv("FEC_RATE_PER_HOUR", "1000"))
+FEC_BURST = int(os.getenv("FEC_BURST", "20"))
+FEC_MAX_CONCURRENCY = int(os.getenv("FEC_MAX_CONCURRENCY", "6"))
+# Static files fetched a few times a day at most
+LEGISLATORS_RATE_PER_HOUR = float(os.getenv("LEGISLATORS_RATE_PER_HOUR", "60"))
+# No published quota; stay polite
+SENATE_VOTES_RATE_PER_HOUR = float(os.getenv("SENATE_VOTES_RATE_PER_HOUR", "1200"))
+PORTRAIT_RATE_PER_HOUR = float(os.getenv("PORTRAIT_RATE_PER_HOUR", "3600"))
+
+CONGRESS = "congress"
+FEC = "fec"
+LEGISLATORS = "legislators"
+SENATE_VOTES = "senate_votes"
+PORTRAITS = "portraits"
+
+
+def _http2_available() -> bool:
+    # HTTP/2 needs the optional `h2` package (installed via httpx[http2])
+    return HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+class UpstreamClients:
+    """Application-lifetime pooled HTTP clients, one per upstream API"""
+
+    def __init__(self):
+        self._settings = {
+            CONGRESS: (CONGRESS_API_BASE, CONGRESS_TIMEOUT, CONGRESS_API_KEY),
+            FEC: (FEC_API_BASE, FEC_TIMEOUT, FEC_API_KEY),
+            LEGISLATORS: (LEGISLATORS_BASE, LEGISLATORS_TIMEOUT, None),
+            SENATE_VOTES: (SENATE_VOTES_BASE, SENATE_VOTES_TIMEOUT, None),
+            PORTRAITS: (PORTRAIT_BASE, PORTRAIT_TIMEOUT, None),
+        }
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        # Governors outlive individual clients so quota state survives a rebuild
+        self.governors = {
+            CONGRESS: UpstreamGovernor(CONGRESS, CONGRESS_RATE_PER_HOUR, CONGRESS_BURST, CONGRESS_MAX_CONCURRENCY),
+            FEC: UpstreamGovernor(FEC, FEC_RATE_PER_HOUR, FEC_BURST, FEC_MAX_CONCURRENCY),
+            LEGISLATORS: UpstreamGovernor(LEGISLATORS, LEGISLATORS_RATE_PER_HOUR, 5, 2),
+            SENATE_VOTES: UpstreamGovernor(SENATE_VOTES, SENATE_VOTES_RATE_PER_HOUR, 10, 4),
+            PORTRAITS: UpstreamGovernor(PORTRAITS, PORTRAIT_RATE_PER_HOUR, 20, 6),
+        }
+        self.breakers = {name: CircuitBreaker(name) for name in self._settings}
+        self._transports: Dict[str, ResilientTransport] = {}
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        base_url, timeout, api_key = self._settings[name]
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=_http2_available(),
+        )
+        # Breaker and retries sit outside the governor so every retry is itself rate limited
+        resilient = ResilientTransport(GovernedTransport(transport, self.governors[name]), self.breakers[name])
+        self._transports[name] = resilient
+        return httpx.AsyncClient(
+            base_url=base_url,
+            params={"api_key": api_key} if api_key else None,
+            timeout=httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT),
+            transport=resilient,
+        )
+
+    async def startup(self) -> None:
+        """Open a client for every configured upstream"""
+        for name in self._settings:
+            if name not in self._clients:
+                self._clients[name] = self._build(name)
+
+    async def shutdown(self) -> None:
+        """Close all clients and release their pooled connections"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for an upstream, creating it lazily outside the app lifespan"""
+        client: Optional[httpx.AsyncClient] = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(name)
+        return client
+
+    def quota_stats(self) -> Dict[str, dict]:
+        return {name: governor.stats() for name, governor in self.governors.items()}
+
+    def resilience_stats(self) -> Dict[str, dict]:
+        return {
+            name: self._transports[name].stats() if name in self._transports else {"breaker": breaker.stats()}
+            for name, breaker in self.breakers.items()
+        }
+
+    @property
+    def congress(self) -> httpx.AsyncClient:
+        return self.get(CONGRESS)
+
+    @property
+    def fec(self) -> httpx.AsyncClient:
+        return self.get(FEC)
+
+    @property
+    def legislators(self) -> httpx.AsyncClient:
+        return self.get(LEGISLATORS)
+
+    @property
+    def senate_votes(self) -> httpx.AsyncClient:
+        return self.get(SENATE_VOTES)
+
+    @property
+    def portraits(self) -> httpx.AsyncClient:
+        return self.get(PORTRAITS)
+
+
+upstream_clients = UpstreamClients()
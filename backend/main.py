@@ -1,37 +1,125 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
 
 try:
-    from .models import Member, ChamberBreakdown, WhiteHouse, StateDetail
-    from .services import congress_service
+    from .models import Member, ChamberBreakdown, WhiteHouse, StateDetail, DistrictLookup
+    from .services import congress_service, HistoryUnavailable
+    from .crosswalk import crosswalk_service, CrosswalkEntry
+    from .contributions import contribution_service, ContributionStoreUnavailable, SCHEDULE_A_FIRST_WAIT, SUMMARY_TOP
+    from .analytics import contribution_analytics, METRICS as ANALYTICS_METRICS
+    from .rollups import rollup_service, DIMENSIONS as ROLLUP_DIMENSIONS
+    from .activity import activity_service
+    from .bills import bill_service, BillIndexNotReady
+    from .votes import vote_service, VoteDataNotReady, CHAMBERS as VOTE_CHAMBERS
+    from .geo_index import district_locator, resolve as resolve_districts, GeoDataUnavailable
+    from .portraits import portrait_service, PortraitNotFound, PORTRAIT_CACHE_CONTROL
+    from .http_clients import upstream_clients, CONGRESS_API_KEY, FEC_API_KEY
+    from .cache import proxy_cache
+    from .responses import VersionedBodyCache, body_response, json_response, prepare_json
+    from .roster_index import ChamberView, HOUSE, SENATE, STATE_NAMES, state_key
+    from .snapshot import CURRENT_CONGRESS
+    from .export import EXPORT_FORMATS, export_columns, ndjson_rows, csv_rows, chunked
+    from .ratelimit import UpstreamRateLimited
+    from .resilience import UpstreamUnavailable
+    from .metrics import (
+        registry, Counter, Gauge, http_request_duration, http_requests_in_flight,
+        begin_request_timing, server_timing_header, stage, SERVER_TIMING_ENABLED,
+    )
 except ImportError:
-    from models import Member, ChamberBreakdown, WhiteHouse, StateDetail
-    from services import congress_service
+    from models import Member, ChamberBreakdown, WhiteHouse, StateDetail, DistrictLookup
+    from services import congress_service, HistoryUnavailable
+    from crosswalk import crosswalk_service, CrosswalkEntry
+    from contributions import contribution_service, ContributionStoreUnavailable, SCHEDULE_A_FIRST_WAIT, SUMMARY_TOP
+    from analytics import contribution_analytics, METRICS as ANALYTICS_METRICS
+    from rollups import rollup_service, DIMENSIONS as ROLLUP_DIMENSIONS
+    from activity import activity_service
+    from bills import bill_service, BillIndexNotReady
+    from votes import vote_service, VoteDataNotReady, CHAMBERS as VOTE_CHAMBERS
+    from geo_index import district_locator, resolve as resolve_districts, GeoDataUnavailable
+    from portraits import portrait_service, PortraitNotFound, PORTRAIT_CACHE_CONTROL
+    from http_clients import upstream_clients, CONGRESS_API_KEY, FEC_API_KEY
+    from cache import proxy_cache
+    from responses import VersionedBodyCache, body_response, json_response, prepare_json
+    from roster_index import ChamberView, HOUSE, SENATE, STATE_NAMES, state_key
+    from snapshot import CURRENT_CONGRESS
+    from export import EXPORT_FORMATS, export_columns, ndjson_rows, csv_rows, chunked
+    from ratelimit import UpstreamRateLimited
+    from resilience import UpstreamUnavailable
+    from metrics import (
+        registry, Counter, Gauge, http_request_duration, http_requests_in_flight,
+        begin_request_timing, server_timing_header, stage, SERVER_TIMING_ENABLED,
+    )
 # Civic election service removed — election result tracking discontinued
 import httpx
 from fastapi import Query
+import asyncio
+import base64
+import binascii
+import math
+import re
 import time
-from pathlib import Path
-import json
-
-# Simple in-memory cache for proxied responses
-PROXY_CACHE = {}
-PROXY_TTL = int(os.getenv("PROXY_TTL_SECONDS", "60"))
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client per upstream for the lifetime of the process
+    await upstream_clients.startup()
+    # Serve the last on-disk roster immediately, then warm and refresh it in the background
+    await congress_service.load_snapshot()
+    congress_service.start_background_refresh()
+    await crosswalk_service.load()
+    if FEC_API_KEY:
+        crosswalk_service.start_background_refresh()
+    await rollup_service.load()
+    if FEC_API_KEY:
+        rollup_service.start_background_refresh()
+    bill_service.start_background_sync()
+    vote_service.start_background_sync()
+    try:
+        yield
+    finally:
+        await vote_service.stop_background_sync()
+        await bill_service.stop_background_sync()
+        await rollup_service.stop_background_refresh()
+        await contribution_service.stop()
+        await crosswalk_service.stop_background_refresh()
+        await congress_service.stop_background_refresh()
+        portrait_service.close()
+        await upstream_clients.shutdown()
+
+
 app = FastAPI(
     title="Political Transparency API",
     description="API for congressional data and political information",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
 origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001").split(",")
 
+# Serialized roster responses, rebuilt once per roster refresh
+roster_bodies = VersionedBodyCache()
+
+# Page size for filtered/paginated member listings
+MEMBER_PAGE_DEFAULT = int(os.getenv("MEMBER_PAGE_DEFAULT", "100"))
+MEMBER_PAGE_MAX = int(os.getenv("MEMBER_PAGE_MAX", "500"))
+
+# Batch FEC lookups: IDs per upstream request (sent as repeated candidate_id params) and requests in flight
+FEC_BATCH_SIZE = int(os.getenv("FEC_BATCH_SIZE", "50"))
+FEC_BATCH_CONCURRENCY = int(os.getenv("FEC_BATCH_CONCURRENCY", "3"))
+FEC_BATCH_MAX_IDS = int(os.getenv("FEC_BATCH_MAX_IDS", "200"))
+
+# Committees one contribution analytics request may compare
+ANALYTICS_MAX_COMMITTEES = int(os.getenv("ANALYTICS_MAX_COMMITTEES", "10"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -41,6 +129,63 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Time every request by route template and optionally report stage timings"""
+    stages = begin_request_timing()
+    http_requests_in_flight.inc()
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+    finally:
+        elapsed = time.perf_counter() - start
+        http_requests_in_flight.dec()
+        route = request.scope.get("route")
+        http_request_duration.observe(
+            elapsed, method=request.method, route=getattr(route, "path", "unmatched"), status=status
+        )
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing_header(stages, elapsed)
+    return response
+
+
+# Values owned by other components, read at scrape time
+registry.register(Counter(
+    "ptp_proxy_cache_events_total", "Proxy cache lookups by outcome", ("event",),
+    callback=lambda: {(k,): proxy_cache.stats()[k] for k in ("hits", "misses", "evictions", "coalesced", "shared_hits", "stale_served")},
+))
+registry.register(Gauge(
+    "ptp_proxy_cache_hit_ratio", "Proxy cache hit ratio since start",
+    callback=lambda: {(): proxy_cache.stats()["hit_ratio"]},
+))
+registry.register(Gauge(
+    "ptp_proxy_cache_bytes", "Estimated bytes held by the proxy cache",
+    callback=lambda: {(): proxy_cache.stats()["bytes"]},
+))
+registry.register(Gauge(
+    "ptp_roster_age_seconds", "Age of the roster snapshot being served",
+    callback=lambda: {(): congress_service.roster_age()},
+))
+registry.register(Gauge(
+    "ptp_fec_crosswalk_age_seconds", "Age of the bioguide to FEC crosswalk being served",
+    callback=lambda: {(): crosswalk_service.age()},
+))
+registry.register(Gauge(
+    "ptp_fundraising_rollups_age_seconds", "Age of the party/state/chamber fundraising rollups being served",
+    callback=lambda: {(): rollup_service.age()},
+))
+registry.register(Gauge(
+    "ptp_upstream_quota_headroom", "Share of the upstream token bucket still available", ("upstream",),
+    callback=lambda: {(name,): s["headroom"] for name, s in upstream_clients.quota_stats().items()},
+))
+registry.register(Gauge(
+    "ptp_upstream_circuit_open", "1 while the upstream circuit breaker is open", ("upstream",),
+    callback=lambda: {(name,): float(b.state != "closed") for name, b in upstream_clients.breakers.items()},
+))
+
+
 @app.get("/")
 async def root():
     return {
@@ -50,33 +195,163 @@ async def root():
             "house": "/api/house",
             "senate": "/api/senate",
             "white_house": "/api/white-house",
-            "state_details": "/api/state/{state_abbr}"
+            "state_details": "/api/state/{state_abbr}",
+            "export": "/api/export/members",
+            "search": "/api/search?q=",
+            "district_lookup": "/api/lookup?zip= or ?lat=&lon=",
+            "bill_search": "/api/bills/search?q=",
+            "vote_scores": "/api/votes/{house|senate}/scores",
+            "vote_agreement": "/api/votes/{house|senate}/agreement?member=",
+            "member_finance": "/api/member/{bioguide_id}/finance",
+            "member_activity": "/api/member/{bioguide_id}/activity",
+            "member_portrait": "/api/member/{bioguide_id}/portrait?w=",
+            "member_donations": "/api/member/{bioguide_id}/donations/summary",
+            "contribution_analytics": "/api/fec/analytics/contributions?committee_id=",
+            "fundraising_rollups": "/api/rollups/{party|state|chamber}"
         }
     }
 
 
+def _encode_cursor(member_id: str) -> str:
+    return base64.urlsafe_b64encode(member_id.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[set]:
+    if fields is None:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(Member.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    # The id is always returned so clients can key rows and resume paging
+    return requested | {"id"}
+
+
+def _member_listing(view: ChamberView, party: Optional[str], state: Optional[str],
+                    fields: Optional[str], cursor: Optional[str], limit: int) -> dict:
+    """One page of a chamber's members, filtered through the view's indexes and projected to `fields`"""
+    include = _parse_fields(fields)
+    selected = view.select(party=party, state=state)
+    try:
+        chunk, has_more = view.page(selected, _decode_cursor(cursor) if cursor else None, limit)
+    except KeyError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if include is None:
+        members = [view.member_dicts[i] for i in chunk]
+    else:
+        members = [{k: v for k, v in view.member_dicts[i].items() if k in include} for i in chunk]
+    return {
+        "members": members,
+        "total": len(selected),
+        "next_cursor": _encode_cursor(view.members[chunk[-1]].id) if has_more and chunk else None,
+    }
+
+
+def _is_listing_query(*params) -> bool:
+    return any(p is not None for p in params)
+
+
+async def _congress_index(congress: int):
+    """Roster index for the requested Congress, mapping history sync failures to HTTP errors"""
+    if congress == CURRENT_CONGRESS:
+        return await congress_service.get_index()
+    try:
+        return await congress_service.get_congress_index(congress)
+    except HistoryUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise _upstream_http_error(e, f"Error fetching the roster of Congress {congress}")
+
+
+async def _chamber_data(request: Request, chamber: str, congress: int, party: Optional[str], state: Optional[str],
+                        fields: Optional[str], cursor: Optional[str], limit: Optional[int]) -> Response:
+    with stage("roster"):
+        index = await _congress_index(congress)
+    view = index.house if chamber == "house" else index.senate
+    with stage("serialize"):
+        if _is_listing_query(party, state, fields, cursor, limit):
+            prepared = prepare_json(_member_listing(view, party, state, fields, cursor, limit or MEMBER_PAGE_DEFAULT))
+        else:
+            breakdown = index.house_breakdown if chamber == "house" else index.senate_breakdown
+            prepared = roster_bodies.get(f"{chamber}:{congress}", index, lambda: {
+                "members": view.members,
+                "breakdown": breakdown
+            })
+    return json_response(request, prepared)
+
+
 @app.get("/api/house", response_model=dict)
-async def get_house_data():
-    """Get House of Representatives members and breakdown"""
+async def get_house_data(
+    request: Request,
+    congress: int = Query(CURRENT_CONGRESS, ge=1, le=CURRENT_CONGRESS),
+    party: Optional[str] = None,
+    state: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated Member fields to return"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MEMBER_PAGE_MAX),
+):
+    """Get House of Representatives members and breakdown
+
+    With any of party, state, fields, cursor or limit, returns one page of
+    matching members instead: {"members", "total", "next_cursor"}.
+    """
     try:
-        members, breakdown = await congress_service.get_house_members()
-        return {
-            "members": [m.model_dump() for m in members],
-            "breakdown": breakdown.model_dump()
-        }
+        return await _chamber_data(request, "house", congress, party, state, fields, cursor, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching House data: {str(e)}")
+
+
+@app.get("/api/house/breakdown", response_model=ChamberBreakdown)
+async def get_house_breakdown(request: Request, congress: int = Query(CURRENT_CONGRESS, ge=1, le=CURRENT_CONGRESS)):
+    """Get only the House party breakdown"""
+    try:
+        index = await _congress_index(congress)
+        return json_response(request, roster_bodies.get(f"house:{congress}:breakdown", index, lambda: index.house_breakdown))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching House data: {str(e)}")
 
 
 @app.get("/api/senate", response_model=dict)
-async def get_senate_data():
-    """Get Senate members and breakdown"""
+async def get_senate_data(
+    request: Request,
+    congress: int = Query(CURRENT_CONGRESS, ge=1, le=CURRENT_CONGRESS),
+    party: Optional[str] = None,
+    state: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated Member fields to return"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MEMBER_PAGE_MAX),
+):
+    """Get Senate members and breakdown
+
+    Accepts the same parameters as /api/house.
+    """
     try:
-        members, breakdown = await congress_service.get_senate_members()
-        return {
-            "members": [m.model_dump() for m in members],
-            "breakdown": breakdown.model_dump()
-        }
+        return await _chamber_data(request, "senate", congress, party, state, fields, cursor, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching Senate data: {str(e)}")
+
+
+@app.get("/api/senate/breakdown", response_model=ChamberBreakdown)
+async def get_senate_breakdown(request: Request, congress: int = Query(CURRENT_CONGRESS, ge=1, le=CURRENT_CONGRESS)):
+    """Get only the Senate party breakdown"""
+    try:
+        index = await _congress_index(congress)
+        return json_response(request, roster_bodies.get(f"senate:{congress}:breakdown", index, lambda: index.senate_breakdown))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching Senate data: {str(e)}")
 
@@ -91,19 +366,126 @@ async def get_white_house_data():
 
 
 @app.get("/api/state/{state_abbr}", response_model=StateDetail)
-async def get_state_details(state_abbr: str):
+async def get_state_details(state_abbr: str, request: Request):
     """Get detailed information for a specific state including districts and senators"""
     try:
         if len(state_abbr) != 2:
             raise HTTPException(status_code=400, detail="State abbreviation must be 2 characters")
-        
-        return await congress_service.get_state_details(state_abbr)
+        abbr = state_abbr.upper()
+        # Checked before the body cache, which keeps one body per key
+        if abbr not in STATE_NAMES:
+            raise HTTPException(status_code=404, detail=f"Unknown state: {state_abbr}")
+
+        with stage("roster"):
+            index = await congress_service.get_index()
+        with stage("serialize"):
+            # Built only when this roster's body is not cached yet
+            prepared = roster_bodies.get(f"state:{abbr}", index, lambda: index.state_detail(abbr))
+        return json_response(request, prepared)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching state data: {str(e)}")
 
 
+@app.get("/api/lookup", response_model=DistrictLookup)
+async def lookup_district(
+    request: Request,
+    zip: Optional[str] = Query(None, pattern=r"^\d{5}(-\d{4})?$", description="5-digit ZIP or ZIP+4"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+):
+    """Congressional district(s) and members for a ZIP code or a coordinate, from local boundary files"""
+    if (zip is None) == (lat is None or lon is None):
+        raise HTTPException(status_code=400, detail="Pass either zip, or both lat and lon")
+    try:
+        with stage("geo"):
+            if zip is not None:
+                zip = zip[:5]
+                matches = await district_locator.by_zip(zip)
+            else:
+                key = await district_locator.by_point(lat, lon)
+                matches = ((key, None),) if key else ()
+    except GeoDataUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not matches:
+        place = f"ZIP {zip}" if zip is not None else f"{lat}, {lon}"
+        raise HTTPException(status_code=404, detail=f"No congressional district found for {place}")
+
+    with stage("roster"):
+        try:
+            index = await congress_service.get_index()
+        except Exception as e:
+            raise _upstream_http_error(e, "Error fetching the roster")
+    query = {"zip": zip} if zip is not None else {"lat": lat, "lon": lon}
+    with stage("serialize"):
+        return json_response(request, prepare_json(resolve_districts(index, matches, **query)))
+
+
+@app.get("/api/search")
+async def search_members(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    chamber: Optional[str] = Query(None, pattern="^(house|senate)$"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Search current members by name, state or district, tolerating small typos"""
+    try:
+        index = await congress_service.get_index()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching members: {str(e)}")
+    with stage("search"):
+        results = [
+            {"chamber": hit_chamber, "score": score, "member": member}
+            for score, hit_chamber, member in index.search.search(q, limit=limit, chamber=chamber)
+        ]
+    return json_response(request, prepare_json({"query": q, "results": results}))
+
+
+@app.get("/api/export/members")
+async def export_members(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    chamber: Optional[str] = Query(None, pattern="^(house|senate)$"),
+    congress: int = Query(CURRENT_CONGRESS, ge=1, le=CURRENT_CONGRESS),
+    party: Optional[str] = None,
+    state: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated Member fields to export"),
+):
+    """Stream members as NDJSON or CSV, one per line, with the chamber listing filters"""
+    columns = export_columns(_parse_fields(fields))
+    members = congress_service.iter_members(
+        congress=congress, chamber={"house": HOUSE, "senate": SENATE}.get(chamber), party=party, state=state
+    )
+
+    # Pull the first member before committing to a 200 so upstream failures still get a proper status
+    try:
+        first = await anext(members, None)
+    except HistoryUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise _upstream_http_error(e, "Error exporting members")
+
+    async def remaining():
+        if first is not None:
+            yield first
+            async for member in members:
+                yield member
+
+    encode = ndjson_rows if format == "ndjson" else csv_rows
+    filename = f"members-{congress}-{chamber or 'all'}.{format}"
+    return StreamingResponse(
+        chunked(encode(remaining(), columns)),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -113,137 +495,506 @@ async def health_check():
 
 
 # --- Proxy endpoints for external APIs (Congress.gov, FEC) ---
-CONGRESS_API_KEY = os.getenv("CONGRESS_API_KEY")
-FEC_API_KEY = os.getenv("NEXT_PUBLIC_FEC_API_KEY")
+
+
+async def _fetch_json(client: httpx.AsyncClient, path: str, **kwargs):
+    resp = await client.get(path, **kwargs)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _upstream_failed(e: Exception) -> bool:
+    """Whether an error means the upstream is unhealthy (as opposed to a bad request)"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code >= 500 or e.response.status_code == 429
+    return isinstance(e, (httpx.TransportError, UpstreamRateLimited, UpstreamUnavailable))
+
+
+def _upstream_http_error(e: Exception, context: str) -> HTTPException:
+    """Map an upstream call failure to the HTTP error returned to our client"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return HTTPException(status_code=e.response.status_code, detail=str(e))
+    if isinstance(e, UpstreamRateLimited):
+        return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    if isinstance(e, UpstreamUnavailable):
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    return HTTPException(status_code=500, detail=f"{context}: {str(e)}")
+
+
+async def _proxy_json(namespace: str, key: str, upstream: str, path: str, what: str, **kwargs):
+    """Serve an upstream GET through the proxy cache, mapping upstream failures to HTTP errors"""
+    try:
+        return await proxy_cache.get_or_fetch(
+            namespace, key,
+            lambda: _fetch_json(upstream_clients.get(upstream), path, **kwargs),
+        )
+    except Exception as e:
+        # Prefer recently expired data over an error while the upstream is struggling
+        if _upstream_failed(e):
+            stale = await proxy_cache.get_stale(namespace, key)
+            if stale is not None:
+                return stale
+        raise _upstream_http_error(e, f"Error proxying {what}")
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters for the proxy cache"""
+    return proxy_cache.stats()
+
+
+@app.get("/api/upstream/quota")
+async def upstream_quota():
+    """Token-bucket headroom and scheduler state per upstream"""
+    return upstream_clients.quota_stats()
+
+
+@app.get("/api/upstream/health")
+async def upstream_health():
+    """Circuit breaker state and retry/hedge counters per upstream"""
+    return upstream_clients.resilience_stats()
+
+
+def _current_fec_cycle() -> int:
+    year = time.gmtime().tm_year
+    return year + year % 2
+
+
+async def _candidate_totals(candidate_id: str):
+    return await _proxy_json(
+        "fec:totals", candidate_id, "fec", f"/candidate/{candidate_id}/totals/", "FEC candidate totals",
+        params={"election_full": "true"},
+    )
+
+
+async def _schedule_a(committee_id: str, per_page: int, two_year_transaction_period: Optional[int]):
+    """Top individual contributions to a committee, shared with the schedule_a proxy's cache"""
+    params = {
+        "committee_id": committee_id,
+        "sort": "-contribution_receipt_amount",
+        "per_page": per_page,
+        "contributor_type": "individual",
+    }
+    if two_year_transaction_period:
+        params["two_year_transaction_period"] = two_year_transaction_period
+
+    # schedule_a queries are slow upstream, allow extra time over the FEC default
+    return await _proxy_json(
+        "fec:schedule_a", f"{committee_id}:{per_page}:{two_year_transaction_period}", "fec",
+        "/schedules/schedule_a/", "FEC schedule_a",
+        params=params, timeout=30.0,
+    )
+
+
+@app.get("/api/bills/search")
+async def bills_search(
+    q: Optional[str] = Query(None, max_length=200, description="Words in the title, latest action, sponsor or policy area"),
+    congress: Optional[int] = Query(None, ge=1, le=CURRENT_CONGRESS),
+    chamber: Optional[str] = Query(None, description="Originating chamber: house or senate"),
+    policy_area: Optional[str] = None,
+    party: Optional[str] = Query(None, description="Sponsor party: D, R or I"),
+    sort: str = Query("relevance", pattern="^(relevance|latest)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+):
+    """Full-text bill search with congress, chamber, policy area and sponsor party facets, served locally"""
+    filters: Dict[str, object] = {}
+    if congress is not None:
+        filters["congress"] = congress
+    if chamber:
+        if chamber.lower() not in ("house", "senate"):
+            raise HTTPException(status_code=400, detail="chamber must be house or senate")
+        filters["chamber"] = chamber.capitalize()
+    if policy_area:
+        filters["policy_area"] = policy_area
+    if party:
+        filters["party"] = party.strip().upper()[:1]
+
+    try:
+        result = await bill_service.search(q, filters, sort, limit, offset)
+    except BillIndexNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return {"query": q, "filters": filters, **result}
+
+
+async def _chamber_votes(chamber: str, congress: int):
+    """A chamber's vote scores, or the HTTP error explaining why they cannot be served"""
+    if chamber not in VOTE_CHAMBERS:
+        raise HTTPException(status_code=404, detail=f"Unknown chamber; expected one of: {', '.join(VOTE_CHAMBERS)}")
+    if congress not in vote_service.congresses:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Votes are only ingested for Congress {', '.join(map(str, vote_service.congresses))}",
+        )
+    try:
+        return await vote_service.chamber(congress, chamber)
+    except VoteDataNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "60"})
+
+
+@app.get("/api/votes/{chamber}/scores")
+async def vote_scores(request: Request, chamber: str, congress: int = Query(CURRENT_CONGRESS, ge=1)):
+    """Votes cast, missed votes, votes-with-party and party-unity shares for every member of a chamber"""
+    votes = await _chamber_votes(chamber, congress)
+    return json_response(request, votes.scores_body)
+
+
+@app.get("/api/votes/{chamber}/agreement")
+async def vote_agreement(
+    request: Request,
+    chamber: str,
+    congress: int = Query(CURRENT_CONGRESS, ge=1),
+    member: Optional[str] = Query(None, description="Bioguide ID; all pairs as a square matrix when omitted"),
+):
+    """Share of shared yea/nay votes on which members voted alike"""
+    votes = await _chamber_votes(chamber, congress)
+    if member is None:
+        return json_response(request, votes.pairs_body)
+    result = votes.member(member.strip().upper())
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No {chamber} votes by {member} in the {congress}th Congress")
+    return result
+
+
+@app.get("/api/member/{bioguide_id}/activity")
+async def member_activity(bioguide_id: str):
+    """Sponsored and cosponsored legislation counted by Congress, policy area and status"""
+    if not CONGRESS_API_KEY:
+        raise HTTPException(status_code=500, detail="CONGRESS_API_KEY not configured on server")
+
+    try:
+        return await activity_service.activity(bioguide_id)
+    except Exception as e:
+        raise _upstream_http_error(e, "Error loading member activity")
+
+
+@app.get("/api/member/{bioguide_id}/portrait")
+async def member_portrait(
+    request: Request,
+    bioguide_id: str,
+    w: int = Query(200, ge=16, le=1024, description="Width in pixels; rounded up to the nearest rendered size"),
+    format: Optional[str] = Query(None, pattern="^(webp|jpeg)$", description="Defaults to WebP when the client accepts it"),
+):
+    """The member's official portrait, resized and cached locally"""
+    fmt = format or ("webp" if "image/webp" in request.headers.get("accept", "") else "jpeg")
+    try:
+        portrait = await portrait_service.portrait(bioguide_id, w, fmt)
+    except PortraitNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise _upstream_http_error(e, "Error loading portrait")
+    return body_response(
+        request, portrait.body, portrait.etag, portrait.media_type, PORTRAIT_CACHE_CONTROL,
+        vary=None if format else "Accept",
+    )
+
+
+async def _fec_entry(bioguide_id: str) -> CrosswalkEntry:
+    """A member's crosswalk entry, or the HTTP error explaining why there is none"""
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    try:
+        entry = await crosswalk_service.lookup(bioguide_id)
+    except Exception as e:
+        raise _upstream_http_error(e, "Error loading the FEC crosswalk")
+    if entry is None or entry.candidate_id is None:
+        raise HTTPException(status_code=404, detail=f"No FEC candidate on record for {bioguide_id}")
+    return entry
+
+
+@app.get("/api/member/{bioguide_id}/finance")
+async def member_finance(
+    bioguide_id: str,
+    cycle: Optional[int] = Query(None, ge=1980, description="Two-year FEC cycle for top contributors"),
+    contributors: int = Query(10, ge=0, le=100),
+):
+    """FEC IDs, campaign totals and top individual contributors for a member in one call"""
+    entry = await _fec_entry(bioguide_id)
+    cycle = cycle or _current_fec_cycle()
+    committee_id = entry.committee_ids[0] if entry.committee_ids else None
+
+    async def top_contributors():
+        if committee_id is None or contributors == 0:
+            return {"results": []}
+        return await _schedule_a(committee_id, contributors, cycle)
+
+    totals, top = await asyncio.gather(
+        _candidate_totals(entry.candidate_id),
+        top_contributors(),
+        return_exceptions=True,
+    )
+    if isinstance(totals, BaseException):
+        raise totals
+    return {
+        "bioguide_id": entry.bioguide_id,
+        "candidate_id": entry.candidate_id,
+        "candidate_ids": entry.candidate_ids,
+        "committee_id": committee_id,
+        "committee_ids": entry.committee_ids,
+        "cycle": cycle,
+        "totals": totals.get("results", []),
+        # Totals are still useful when the slower contributor query fails
+        "top_contributors": None if isinstance(top, BaseException) else top.get("results", []),
+    }
+
+
+@app.get("/api/member/{bioguide_id}/donations/summary")
+async def member_donations_summary(
+    bioguide_id: str,
+    cycle: Optional[int] = Query(None, ge=1980, description="Two-year FEC cycle"),
+    top: int = Query(10, ge=1, le=SUMMARY_TOP, description="Entries in each ranked list"),
+):
+    """Individual contributions to a member's principal committee by size, employer, state and ZIP"""
+    entry = await _fec_entry(bioguide_id)
+    if not entry.committee_ids:
+        raise HTTPException(status_code=404, detail=f"No principal campaign committee on record for {bioguide_id}")
+    committee_id = entry.committee_ids[0]
+    cycle = cycle or _current_fec_cycle()
+    # Transaction periods are named after their even year
+    cycle += cycle % 2
+
+    try:
+        summary = await contribution_service.summary(committee_id, cycle, wait=SCHEDULE_A_FIRST_WAIT)
+    except ContributionStoreUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise _upstream_http_error(e, "Error ingesting FEC Schedule A")
+    if summary is None:
+        # Ingestion has started but nothing has been stored yet
+        return JSONResponse(
+            status_code=202,
+            content={"bioguide_id": entry.bioguide_id, "committee_id": committee_id, "cycle": cycle, "complete": False},
+            headers={"Retry-After": "5"},
+        )
+    return {
+        "bioguide_id": entry.bioguide_id,
+        "candidate_id": entry.candidate_id,
+        **summary,
+        "top_donors": summary["top_donors"][:top],
+        "top_employers": summary["top_employers"][:top],
+        "top_zips": summary["top_zips"][:top],
+    }
+
+
+_CANDIDATE_ID = re.compile(r"^[HSP][0-9A-Z]{8}$")
+_COMMITTEE_ID = re.compile(r"^C[0-9]{8}$")
+
+
+def _split_ids(values: List[str]) -> List[str]:
+    """Candidate IDs from repeated and/or comma-separated query values, uppercased, in order, deduplicated"""
+    ids = dict.fromkeys(v.strip().upper() for value in values for v in value.split(",") if v.strip())
+    if len(ids) > FEC_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {FEC_BATCH_MAX_IDS} candidate IDs per request")
+    return list(ids)
+
+
+async def _fec_all_pages(path: str, params: dict) -> List[dict]:
+    client = upstream_clients.fec
+    rows: List[dict] = []
+    page = 1
+    while True:
+        data = await _fetch_json(client, path, params={**params, "page": page, "per_page": 100})
+        rows.extend(data.get("results", []))
+        if page >= data.get("pagination", {}).get("pages", 1):
+            return rows
+        page += 1
+
+
+async def _fec_batch(namespace: str, candidate_ids: List[str], fetch_rows, what: str, variant: str = "") -> dict:
+    """Per-candidate results for a batch, from cache where possible; failures are reported per ID"""
+    valid = [c for c in candidate_ids if _CANDIDATE_ID.match(c)]
+    errors = {c: {"status": 400, "detail": "Invalid FEC candidate ID"} for c in candidate_ids if c not in valid}
+    # Cache keys carry the query variant (e.g. cycle) so one variant never answers for another
+    keys = {f"{c}:{variant}" if variant else c: c for c in valid}
+
+    async def fetch_many(batch: List[str]) -> Dict[str, object]:
+        by_candidate: Dict[str, List[dict]] = {keys[k]: [] for k in batch}
+        try:
+            rows = await fetch_rows(list(by_candidate))
+        except httpx.HTTPStatusError as e:
+            # A request FEC rejects outright is split so one bad ID only fails itself
+            if len(batch) == 1 or _upstream_failed(e):
+                raise
+            middle = len(batch) // 2
+            halves = await asyncio.gather(
+                fetch_many(batch[:middle]), fetch_many(batch[middle:]), return_exceptions=True
+            )
+            merged: Dict[str, object] = {}
+            for half, outcome in zip((batch[:middle], batch[middle:]), halves):
+                merged.update(outcome if isinstance(outcome, dict) else dict.fromkeys(half, outcome))
+            return merged
+        for row in rows:
+            for c in row.get("candidate_ids") or [row.get("candidate_id")]:
+                if c in by_candidate:
+                    by_candidate[c].append(row)
+        return {k: by_candidate[keys[k]] for k in batch}
+
+    outcomes = await proxy_cache.get_or_fetch_many(namespace, list(keys), fetch_many, FEC_BATCH_SIZE, FEC_BATCH_CONCURRENCY)
+    results = {}
+    for key, candidate_id in keys.items():
+        outcome = outcomes[key]
+        if isinstance(outcome, BaseException):
+            stale = await proxy_cache.get_stale(namespace, key) if _upstream_failed(outcome) else None
+            if stale is None:
+                error = _upstream_http_error(outcome, f"Error fetching {what}")
+                errors[candidate_id] = {"status": error.status_code, "detail": error.detail}
+                continue
+            outcome = stale
+        results[candidate_id] = outcome
+    return {"results": results, "errors": errors}
+
+
+@app.get("/api/fec/candidates/totals")
+async def fec_candidates_totals(
+    candidate_id: List[str] = Query(..., description="Repeat or comma-separate up to FEC_BATCH_MAX_IDS IDs"),
+    cycle: Optional[int] = Query(None, ge=1980),
+):
+    """Campaign totals for many candidates in one call: {"results": {id: rows}, "errors": {id: error}}"""
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    async def fetch_rows(batch: List[str]) -> List[dict]:
+        params = {"candidate_id": batch, "election_full": "true"}
+        if cycle:
+            params["cycle"] = cycle
+        return await _fec_all_pages("/candidates/totals/", params)
+
+    return await _fec_batch(
+        "fec:batch_totals", _split_ids(candidate_id), fetch_rows, "FEC totals", variant=str(cycle or "all")
+    )
+
+
+@app.get("/api/fec/candidates/committees")
+async def fec_candidates_committees(
+    candidate_id: List[str] = Query(..., description="Repeat or comma-separate up to FEC_BATCH_MAX_IDS IDs"),
+):
+    """Committees linked to many candidates in one call: {"results": {id: committees}, "errors": {id: error}}"""
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    async def fetch_rows(batch: List[str]) -> List[dict]:
+        return await _fec_all_pages("/committees/", {"candidate_id": batch})
+
+    return await _fec_batch("fec:batch_committees", _split_ids(candidate_id), fetch_rows, "FEC committees")
+
+
+@app.get("/api/rollups/{dimension}")
+async def fundraising_rollups(request: Request, dimension: str, key: Optional[str] = None):
+    """Current-cycle FEC totals for sitting members summed by party, state or chamber"""
+    if dimension not in ROLLUP_DIMENSIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown rollup; expected one of: {', '.join(ROLLUP_DIMENSIONS)}")
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    try:
+        if key is None:
+            return json_response(request, await rollup_service.view(dimension))
+        normalized = {"party": key.strip().upper()[:1], "state": state_key(key), "chamber": key.strip().lower()}[dimension]
+        group = await rollup_service.group(dimension, normalized)
+    except Exception as e:
+        raise _upstream_http_error(e, "Error computing fundraising rollups")
+    if group is None:
+        raise HTTPException(status_code=404, detail=f"No {dimension} rollup for {key}")
+    return group
 
 
 @app.get("/api/proxy/congress/member/{member_id}")
 async def proxy_congress_member(member_id: str):
     """Proxy a single member lookup to Congress.gov"""
-    try:
-        if not CONGRESS_API_KEY:
-            raise HTTPException(status_code=500, detail="CONGRESS_API_KEY not configured on server")
-
-        url = f"https://api.congress.gov/v3/member/{member_id}?api_key={CONGRESS_API_KEY}"
-        # cache key
-        cache_key = f"congress:member:{member_id}"
-        cached = PROXY_CACHE.get(cache_key)
-        if cached and time.time() - cached[0] < PROXY_TTL:
-            return cached[1]
-
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            PROXY_CACHE[cache_key] = (time.time(), data)
-            return data
-    except httpx.HTTPStatusError as he:
-        raise HTTPException(status_code=he.response.status_code, detail=str(he))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error proxying Congress member: {str(e)}")
+    if not CONGRESS_API_KEY:
+        raise HTTPException(status_code=500, detail="CONGRESS_API_KEY not configured on server")
+
+    return await _proxy_json("congress:member", member_id, "congress", f"/member/{member_id}", "Congress member")
+
+
+@app.get("/api/fec/analytics/contributions")
+async def contribution_analytics_endpoint(
+    committee_id: List[str] = Query(..., description="Committee IDs, repeated and/or comma-separated"),
+    cycle: Optional[int] = Query(None, ge=1980, description="Two-year FEC cycle"),
+    metrics: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(ANALYTICS_METRICS)}"),
+    top: int = Query(10, ge=1, le=100, description="Entries in each ranked list"),
+    bucket_days: int = Query(7, ge=1, le=92, description="Days per time series bucket"),
+    window: int = Query(4, ge=1, le=52, description="Buckets in each rolling sum"),
+):
+    """Distributions, rankings, small-dollar share and time series over stored Schedule A rows, side by side"""
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    ids = list(dict.fromkeys(v.strip().upper() for value in committee_id for v in value.split(",") if v.strip()))
+    if not ids or len(ids) > ANALYTICS_MAX_COMMITTEES:
+        raise HTTPException(status_code=400, detail=f"Between 1 and {ANALYTICS_MAX_COMMITTEES} committee IDs per request")
+    bad = [c for c in ids if not _COMMITTEE_ID.match(c)]
+    if bad:
+        raise HTTPException(status_code=400, detail=f"Invalid committee IDs: {', '.join(bad)}")
+    selected = ANALYTICS_METRICS if metrics is None else tuple(m.strip() for m in metrics.split(",") if m.strip())
+    unknown = sorted(set(selected) - set(ANALYTICS_METRICS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics: {', '.join(unknown)}")
+    cycle = cycle or _current_fec_cycle()
+    cycle += cycle % 2
+
+    summaries = await asyncio.gather(
+        *(contribution_service.summary(c, cycle, wait=SCHEDULE_A_FIRST_WAIT) for c in ids),
+        return_exceptions=True,
+    )
+    frames = []
+    ledgers: Dict[str, dict] = {}
+    errors: Dict[str, dict] = {}
+    for c, summary in zip(ids, summaries):
+        if isinstance(summary, ContributionStoreUnavailable):
+            errors[c] = {"status": 503, "detail": str(summary)}
+        elif isinstance(summary, BaseException):
+            error = _upstream_http_error(summary, "Error ingesting FEC Schedule A")
+            errors[c] = {"status": error.status_code, "detail": error.detail}
+        elif summary is None:
+            errors[c] = {"status": 202, "detail": "Ingestion has started; retry shortly"}
+        else:
+            frames.append(await contribution_analytics.frame(c, cycle, summary["updated_at"]))
+            ledgers[c] = {"complete": summary["complete"], "updated_at": summary["updated_at"]}
+
+    result = await contribution_analytics.compare(frames, selected, top, bucket_days, window)
+    for c, ledger in ledgers.items():
+        result["committees"][c].update(ledger)
+    return {"cycle": cycle, "metrics": list(selected), **result, "errors": errors}
 
 
 @app.get("/api/proxy/fec/candidates/search")
 async def proxy_fec_candidate_search(q: str = Query(...), per_page: int = 1):
     """Proxy candidate search to the FEC API"""
-    try:
-        if not FEC_API_KEY:
-            raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
 
-        url = (
-            f"https://api.open.fec.gov/v1/candidates/search/?q={httpx.utils.quote(q)}&api_key={FEC_API_KEY}&per_page={per_page}"
-        )
-        cache_key = f"fec:search:{q}:{per_page}"
-        cached = PROXY_CACHE.get(cache_key)
-        if cached and time.time() - cached[0] < PROXY_TTL:
-            return cached[1]
-
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            PROXY_CACHE[cache_key] = (time.time(), data)
-            return data
-    except httpx.HTTPStatusError as he:
-        raise HTTPException(status_code=he.response.status_code, detail=str(he))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error proxying FEC candidate search: {str(e)}")
+    return await _proxy_json(
+        "fec:search", f"{q}:{per_page}", "fec", "/candidates/search/", "FEC candidate search",
+        params={"q": q, "per_page": per_page},
+    )
 
 
 @app.get("/api/proxy/fec/candidate/{candidate_id}/totals")
 async def proxy_fec_candidate_totals(candidate_id: str):
-    try:
-        if not FEC_API_KEY:
-            raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
-
-        url = f"https://api.open.fec.gov/v1/candidate/{candidate_id}/totals/?api_key={FEC_API_KEY}&election_full=true"
-        cache_key = f"fec:totals:{candidate_id}"
-        cached = PROXY_CACHE.get(cache_key)
-        if cached and time.time() - cached[0] < PROXY_TTL:
-            return cached[1]
-
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            PROXY_CACHE[cache_key] = (time.time(), data)
-            return data
-    except httpx.HTTPStatusError as he:
-        raise HTTPException(status_code=he.response.status_code, detail=str(he))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error proxying FEC candidate totals: {str(e)}")
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    return await _candidate_totals(candidate_id)
 
 
 @app.get("/api/proxy/fec/candidate/{candidate_id}/committees")
 async def proxy_fec_candidate_committees(candidate_id: str):
-    try:
-        if not FEC_API_KEY:
-            raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
-
-        url = f"https://api.open.fec.gov/v1/candidate/{candidate_id}/committees/?api_key={FEC_API_KEY}"
-        cache_key = f"fec:committees:{candidate_id}"
-        cached = PROXY_CACHE.get(cache_key)
-        if cached and time.time() - cached[0] < PROXY_TTL:
-            return cached[1]
-
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            PROXY_CACHE[cache_key] = (time.time(), data)
-            return data
-    except httpx.HTTPStatusError as he:
-        raise HTTPException(status_code=he.response.status_code, detail=str(he))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error proxying FEC candidate committees: {str(e)}")
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    return await _proxy_json(
+        "fec:committees", candidate_id, "fec", f"/candidate/{candidate_id}/committees/", "FEC candidate committees"
+    )
 
 
 @app.get("/api/proxy/fec/committee/{committee_id}/schedule_a")
 async def proxy_fec_committee_schedule_a(committee_id: str, per_page: int = 10, two_year_transaction_period: int = None):
-    try:
-        if not FEC_API_KEY:
-            raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
-
-        params = f"?committee_id={committee_id}&sort=-contribution_receipt_amount&per_page={per_page}&contributor_type=individual&api_key={FEC_API_KEY}"
-        if two_year_transaction_period:
-            params = f"?committee_id={committee_id}&sort=-contribution_receipt_amount&per_page={per_page}&two_year_transaction_period={two_year_transaction_period}&contributor_type=individual&api_key={FEC_API_KEY}"
-
-        url = f"https://api.open.fec.gov/v1/schedules/schedule_a/{params}"
-        cache_key = f"fec:schedule_a:{committee_id}:{per_page}:{two_year_transaction_period}"
-        cached = PROXY_CACHE.get(cache_key)
-        if cached and time.time() - cached[0] < PROXY_TTL:
-            return cached[1]
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            PROXY_CACHE[cache_key] = (time.time(), data)
-            return data
-    except httpx.HTTPStatusError as he:
-        raise HTTPException(status_code=he.response.status_code, detail=str(he))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error proxying FEC schedule_a: {str(e)}")
+    if not FEC_API_KEY:
+        raise HTTPException(status_code=500, detail="FEC_API_KEY not configured on server")
+
+    return await _schedule_a(committee_id, per_page, two_year_transaction_period)
 
 
 if __name__ == "__main__":
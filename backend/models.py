@@ -33,6 +33,19 @@ class District(BaseModel):
     representative: Optional[Member] = None
 
 
+class DistrictMatch(District):
+    # Share of the ZIP's residents (or land area) in this district; None for coordinate lookups
+    share: Optional[float] = None
+
+
+class DistrictLookup(BaseModel):
+    zip: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    districts: List[DistrictMatch]
+    senators: List[Member]
+
+
 class ChamberBreakdown(BaseModel):
     democrats: int
     republicans: int
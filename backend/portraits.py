@@ -0,0 +1,352 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Sequence
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    # Without Pillow the source portraits are served as they are
+    Image = ImageOps = None
+
+try:
+    from .http_clients import upstream_clients
+    from .ratelimit import upstream_priority, BACKGROUND
+    from .services import congress_service
+    from .snapshot import DATA_CACHE_DIR
+except ImportError:
+    from http_clients import upstream_clients
+    from ratelimit import upstream_priority, BACKGROUND
+    from services import congress_service
+    from snapshot import DATA_CACHE_DIR
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PORTRAIT_CACHE_DIR = Path(os.getenv("PORTRAIT_CACHE_DIR", str(DATA_CACHE_DIR / "portraits")))
+PORTRAIT_CACHE_MAX_BYTES = int(float(os.getenv("PORTRAIT_CACHE_MAX_MB", "256")) * 1024 * 1024)
+# Widths variants are rendered at; a request is served the smallest one at least as wide
+PORTRAIT_WIDTHS = tuple(sorted({int(w) for w in os.getenv("PORTRAIT_WIDTHS", "48,64,96,128,200").split(",") if w.strip()}))
+# How long a fetched source is used before Congress.gov is asked (conditionally) whether it changed
+PORTRAIT_SOURCE_TTL = float(os.getenv("PORTRAIT_SOURCE_TTL_SECONDS", "604800"))
+PORTRAIT_WORKERS = int(os.getenv("PORTRAIT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PORTRAIT_CACHE_CONTROL = os.getenv("PORTRAIT_CACHE_CONTROL", "public, max-age=2592000, immutable")
+PORTRAIT_PREWARM_CONCURRENCY = 8
+
+# Format -> (media type, Pillow format, save options, file extension)
+FORMATS = {
+    "webp": ("image/webp", "WEBP", {"quality": 80, "method": 4}, "webp"),
+    "jpeg": ("image/jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}, "jpg"),
+}
+# Bump when rendering changes so existing variants are not reused
+RENDER_VERSION = 1
+# Access times are only rewritten when older than this, so cache hits rarely write
+TOUCH_INTERVAL = 3600.0
+# Eviction trims the cache to this share of its budget so it does not run on every write
+EVICT_TO = 0.9
+_BIOGUIDE_ID = re.compile(r"^[A-Z][0-9]{6}$")
+
+
+class PortraitNotFound(Exception):
+    """No portrait exists for the requested member"""
+
+
+class Portrait(NamedTuple):
+    body: bytes
+    etag: str
+    media_type: str
+
+
+class SourceRecord(NamedTuple):
+    url: str
+    digest: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    checked_at: float
+
+
+def digest_of(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def variant_width(requested: int, widths: Sequence[int] = PORTRAIT_WIDTHS) -> int:
+    return next((w for w in widths if w >= requested), widths[-1])
+
+
+def render(source: bytes, width: int, fmt: str) -> bytes:
+    """Resize a source image to `width` (never enlarging) and encode it; runs in the worker pool"""
+    _, pil_format, options, _ = FORMATS[fmt]
+    with Image.open(BytesIO(source)) as img:
+        height = max(1, round(img.height * width / img.width))
+        # Lets JPEG decode at a reduced scale that is still at least the target size
+        img.draft("RGB", (width, height))
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        if img.width > width:
+            img = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+        out = BytesIO()
+        img.save(out, pil_format, **options)
+        return out.getvalue()
+
+
+class PortraitStore:
+    """Content-addressed portrait files (sources and variants) with an SQLite index for LRU eviction"""
+
+    def __init__(self, root: Path = PORTRAIT_CACHE_DIR, max_bytes: int = PORTRAIT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        root.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sources (bioguide_id TEXT PRIMARY KEY, url TEXT NOT NULL, "
+            "digest TEXT NOT NULL, etag TEXT, last_modified TEXT, checked_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (name TEXT PRIMARY KEY, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS blobs_lru ON blobs (accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.root / "index.sqlite3", timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _path(self, name: str) -> Path:
+        # Fan out by the first two hex digits to keep directories small
+        return self.root / name[:2] / name
+
+    def source(self, bioguide_id: str) -> Optional[SourceRecord]:
+        row = self._conn().execute(
+            "SELECT url, digest, etag, last_modified, checked_at FROM sources WHERE bioguide_id = ?", (bioguide_id,)
+        ).fetchone()
+        return SourceRecord(*row) if row else None
+
+    def set_source(self, bioguide_id: str, record: SourceRecord) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sources (bioguide_id, url, digest, etag, last_modified, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (bioguide_id, *record),
+        )
+
+    def has(self, name: str) -> bool:
+        return self._path(name).is_file()
+
+    def read(self, name: str) -> Optional[bytes]:
+        """A stored file's bytes, refreshing its place in the LRU order; None if it was evicted"""
+        try:
+            data = self._path(name).read_bytes()
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        self._conn().execute(
+            "UPDATE blobs SET accessed_at = ? WHERE name = ? AND accessed_at < ?", (now, name, now - TOUCH_INTERVAL)
+        )
+        return data
+
+    def write(self, name: str, data: bytes) -> None:
+        path = self._path(name)
+        path.parent.mkdir(exist_ok=True)
+        # Written under a temporary name and renamed, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._conn().execute(
+            "INSERT OR REPLACE INTO blobs (name, size, accessed_at) VALUES (?, ?, ?)", (name, len(data), time.time())
+        )
+        self.evict()
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self) -> int:
+        """Delete least recently used files until the cache fits its budget; returns how many were removed"""
+        total = self.size()
+        if total <= self.max_bytes:
+            return 0
+        conn = self._conn()
+        removed = []
+        for name, size in conn.execute("SELECT name, size FROM blobs ORDER BY accessed_at"):
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            self._path(name).unlink(missing_ok=True)
+            removed.append((name,))
+            total -= size
+        conn.executemany("DELETE FROM blobs WHERE name = ?", removed)
+        return len(removed)
+
+
+class PortraitService:
+    """Member portraits fetched once from Congress.gov and served as resized, locally cached variants"""
+
+    def __init__(self):
+        self._store: Optional[PortraitStore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Source fetches and renders in flight, so concurrent requests share them
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _open_store(self) -> PortraitStore:
+        if self._store is None:
+            self._store = PortraitStore()
+        return self._store
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=PORTRAIT_WORKERS, thread_name_prefix="portrait")
+        return self._executor
+
+    async def _shared(self, key: str, make) -> object:
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(make())
+            future.add_done_callback(lambda f: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _image_url(self, bioguide_id: str) -> str:
+        member = (await congress_service.get_index()).by_id.get(bioguide_id)
+        if member is not None and member.image_url:
+            return member.image_url
+        return f"https://www.congress.gov/img/member/{bioguide_id.lower()}_200.jpg"
+
+    async def _fetch_source(self, bioguide_id: str, known: Optional[SourceRecord], have_file: bool) -> str:
+        store = self._open_store()
+        url = await self._image_url(bioguide_id)
+        parts = urlsplit(url)
+        # Congress.gov depictions go through the governed portrait client (and its configurable base)
+        target = parts.path if parts.netloc.endswith("congress.gov") else url
+        headers = {}
+        if known is not None and have_file and known.url == url:
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+        response = await upstream_clients.portraits.get(target, headers=headers)
+        if response.status_code == 304:
+            await asyncio.to_thread(store.set_source, bioguide_id, known._replace(checked_at=time.time()))
+            return known.digest
+        if response.status_code == 404:
+            raise PortraitNotFound(f"No portrait for {bioguide_id}")
+        response.raise_for_status()
+        data = response.content
+        digest = digest_of(data)
+        await asyncio.to_thread(store.write, digest, data)
+        record = SourceRecord(url, digest, response.headers.get("etag"), response.headers.get("last-modified"), time.time())
+        await asyncio.to_thread(store.set_source, bioguide_id, record)
+        return digest
+
+    async def _source(self, bioguide_id: str) -> str:
+        """Digest of the member's source portrait, revalidated with Congress.gov once it is older than the TTL"""
+        store = self._open_store()
+        known = await asyncio.to_thread(store.source, bioguide_id)
+        if known is not None and time.time() - known.checked_at < PORTRAIT_SOURCE_TTL:
+            return known.digest
+        have_file = known is not None and await asyncio.to_thread(store.has, known.digest)
+        return await self._shared(f"source:{bioguide_id}", lambda: self._fetch_source(bioguide_id, known, have_file))
+
+    async def _source_bytes(self, bioguide_id: str, digest: str) -> bytes:
+        store = self._open_store()
+        data = await asyncio.to_thread(store.read, digest)
+        if data is None:
+            # Evicted since it was fetched; fetch it again unconditionally
+            digest = await self._shared(f"source:{bioguide_id}", lambda: self._fetch_source(bioguide_id, None, False))
+            data = await asyncio.to_thread(store.read, digest)
+        if data is None:
+            raise PortraitNotFound(f"No portrait for {bioguide_id}")
+        return data
+
+    async def portrait(self, bioguide_id: str, width: int, fmt: str) -> Portrait:
+        bioguide_id = bioguide_id.upper()
+        if not _BIOGUIDE_ID.match(bioguide_id):
+            raise PortraitNotFound(f"No portrait for {bioguide_id}")
+        store = self._open_store()
+        source_digest = await self._source(bioguide_id)
+        if Image is None:
+            data = await self._source_bytes(bioguide_id, source_digest)
+            return Portrait(data, f'"{source_digest}"', "image/jpeg")
+
+        width = variant_width(width)
+        media_type, _, _, ext = FORMATS[fmt]
+        # Named by what it was made from, so a new source portrait gets new variants (and ETags)
+        name = f"{digest_of(f'{source_digest}:{width}:{fmt}:{RENDER_VERSION}'.encode())}.{ext}"
+        data = await asyncio.to_thread(store.read, name)
+        if data is None:
+            async def make() -> bytes:
+                source = await self._source_bytes(bioguide_id, source_digest)
+                rendered = await asyncio.get_running_loop().run_in_executor(self._pool(), render, source, width, fmt)
+                await asyncio.to_thread(store.write, name, rendered)
+                return rendered
+
+            data = await self._shared(name, make)
+        return Portrait(data, f'"{name}"', media_type)
+
+    async def prewarm(self, widths: Sequence[int] = PORTRAIT_WIDTHS, formats: Sequence[str] = tuple(FORMATS)) -> dict:
+        """Fetch and render every variant for every member of the current roster"""
+        index = await congress_service.get_index()
+        members = [*index.house_members, *index.senate_members]
+        semaphore = asyncio.Semaphore(PORTRAIT_PREWARM_CONCURRENCY)
+        counts = {"members": len(members), "variants": 0, "missing": 0, "failed": 0}
+
+        async def warm(bioguide_id: str) -> None:
+            async with semaphore:
+                try:
+                    for width in widths:
+                        for fmt in formats:
+                            await self.portrait(bioguide_id, width, fmt)
+                            counts["variants"] += 1
+                except PortraitNotFound:
+                    counts["missing"] += 1
+                except Exception as e:
+                    counts["failed"] += 1
+                    logger.warning("Could not prewarm the portrait of %s: %s", bioguide_id, e)
+
+        with upstream_priority(BACKGROUND):
+            await asyncio.gather(*(warm(m.id) for m in members))
+        return counts
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+portrait_service = PortraitService()
+
+
+if __name__ == "__main__":
+    # Render every configured variant for the whole roster: python portraits.py [width ...]
+    import sys
+
+    async def _prewarm(widths: Sequence[int]) -> None:
+        try:
+            counts = await portrait_service.prewarm(widths)
+        finally:
+            portrait_service.close()
+            await upstream_clients.shutdown()
+        print(f"Prewarmed {counts['variants']} variants for {counts['members']} members "
+              f"({counts['missing']} without a portrait, {counts['failed']} failed)")
+
+    asyncio.run(_prewarm(sorted({variant_width(int(w)) for w in sys.argv[1:]}) or PORTRAIT_WIDTHS))
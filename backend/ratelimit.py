@@ -0,0 +1,241 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    from .metrics import endpoint_template, record_stage, upstream_request_duration
+except ImportError:
+    from metrics import endpoint_template, record_stage, upstream_request_duration
+
+load_dotenv()
+
+# Lower value is served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Share of the bucket background work may not dip into, kept for user-facing requests
+BACKGROUND_RESERVE = float(os.getenv("UPSTREAM_BACKGROUND_RESERVE", "0.2"))
+# Interactive callers fail fast instead of queueing longer than this
+UPSTREAM_MAX_WAIT = float(os.getenv("UPSTREAM_MAX_WAIT_SECONDS", "10"))
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def upstream_priority(priority: int):
+    """Run outbound calls made inside the block (and tasks started from it) at the given priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class UpstreamRateLimited(Exception):
+    """Raised when an upstream's quota would not allow the call within the caller's wait budget"""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} rate limit reached, retry in {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(value: str) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class UpstreamGovernor:
+    """Token bucket plus concurrency limit for one upstream, granting slots in priority order"""
+
+    def __init__(self, name: str, rate_per_hour: float, burst: int, max_concurrency: int):
+        self.name = name
+        self.rate = rate_per_hour / 3600.0
+        self.capacity = float(burst)
+        self.max_concurrency = max_concurrency
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._active = 0
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Last quota reported by the upstream itself (X-RateLimit-* headers)
+        self.reported_limit: Optional[int] = None
+        self.reported_remaining: Optional[int] = None
+        self.throttled = 0
+        self.rejected = 0
+        self.granted = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _floor(self, priority: int) -> float:
+        return self.capacity * BACKGROUND_RESERVE if priority >= BACKGROUND else 0.0
+
+    def _wait_estimate(self, priority: int) -> float:
+        self._refill()
+        pause = max(0.0, self._paused_until - time.monotonic())
+        queued_ahead = sum(1 for p, _, f in self._waiters if p <= priority and not f.done())
+        needed = queued_ahead + 1 + self._floor(priority) - self._tokens
+        return max(pause, needed / self.rate if needed > 0 and self.rate > 0 else 0.0)
+
+    async def acquire(self, priority: int = INTERACTIVE, max_wait: Optional[float] = None) -> None:
+        if max_wait is not None:
+            wait = self._wait_estimate(priority)
+            if wait > max_wait:
+                self.rejected += 1
+                raise UpstreamRateLimited(self.name, wait)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        self._refill()
+        now = time.monotonic()
+        while self._waiters and self._active < self.max_concurrency and now >= self._paused_until:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1 + self._floor(priority):
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._active += 1
+            self.granted += 1
+            future.set_result(None)
+
+        if self._waiters and self._active < self.max_concurrency and self._timer is None:
+            priority = self._waiters[0][0]
+            delay = max(self._paused_until - now, (1 + self._floor(priority) - self._tokens) / self.rate if self.rate else 1.0)
+            self._timer = asyncio.get_running_loop().call_later(max(delay, 0.01), self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def observe(self, response: httpx.Response) -> None:
+        """Sync the bucket with the quota headers the upstream sent back"""
+        headers = response.headers
+        limit = headers.get("x-ratelimit-limit")
+        remaining = headers.get("x-ratelimit-remaining")
+        if limit is not None and limit.isdigit():
+            self.reported_limit = int(limit)
+        if remaining is not None and remaining.isdigit():
+            self.reported_remaining = int(remaining)
+            self._refill()
+            self._tokens = min(self._tokens, float(self.reported_remaining))
+
+        if response.status_code in (429, 503):
+            retry_after = _retry_after_seconds(headers.get("retry-after", ""))
+            if response.status_code == 429 or retry_after is not None:
+                self.throttled += 1
+                pause = retry_after if retry_after is not None else 60.0
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                self._tokens = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "tokens": round(self._tokens, 2),
+            "capacity": self.capacity,
+            "rate_per_hour": round(self.rate * 3600),
+            "headroom": round(self._tokens / self.capacity, 4) if self.capacity else 0.0,
+            "reported_limit": self.reported_limit,
+            "reported_remaining": self.reported_remaining,
+            "active": self._active,
+            "queued": sum(1 for _, _, f in self._waiters if not f.done()),
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """A response body that hands its concurrency slot back once it has been read or closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, finish):
+        self._stream = stream
+        self._finish = finish
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
+
+
+class GovernedTransport(httpx.AsyncBaseTransport):
+    """Routes every request on a client through its upstream's governor"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, governor: UpstreamGovernor):
+        self._transport = transport
+        self.governor = governor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        priority = _priority.get()
+        await self.governor.acquire(priority, max_wait=UPSTREAM_MAX_WAIT if priority == INTERACTIVE else None)
+        start = time.perf_counter()
+        status = "error"
+        finished = False
+
+        def finish() -> None:
+            # The slot covers the whole exchange, body included, and is released exactly once
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            self.governor.release()
+            elapsed = time.perf_counter() - start
+            upstream_request_duration.observe(
+                elapsed, upstream=self.governor.name, endpoint=endpoint_template(request.url.path), status=status
+            )
+            record_stage("upstream", elapsed)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            finish()
+            raise
+        status = str(response.status_code)
+        self.governor.observe(response)
+        response.stream = _ReleasingStream(response.stream, finish)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "2"))
+UPSTREAM_RETRY_BACKOFF = float(os.getenv("UPSTREAM_RETRY_BACKOFF_SECONDS", "0.25"))
+UPSTREAM_RETRY_BACKOFF_MAX = float(os.getenv("UPSTREAM_RETRY_BACKOFF_MAX_SECONDS", "4"))
+# Send a duplicate GET if the first has not answered within this many seconds (0 disables hedging)
+UPSTREAM_HEDGE_AFTER = float(os.getenv("UPSTREAM_HEDGE_AFTER_SECONDS", "0"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Statuses that say the upstream itself is unhealthy (429 is quota, not health)
+FAILURE_STATUS = {500, 502, 503, 504}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without calling the upstream while its circuit breaker is open"""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} is unavailable (circuit open), retry in {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Opens after consecutive upstream failures and lets one trial call through after a cool-down"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened = 0
+        self.short_circuited = 0
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self.short_circuited += 1
+                raise UpstreamUnavailable(self.name, remaining)
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.short_circuited += 1
+                raise UpstreamUnavailable(self.name, self.reset_timeout)
+            self._trial_in_flight = True
+
+    def abandon_trial(self) -> None:
+        """The call ended without saying anything about upstream health (cancelled, rate limited)"""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Retries idempotent requests with jittered backoff, optionally hedges slow ones, behind a circuit breaker"""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        breaker: CircuitBreaker,
+        retries: int = UPSTREAM_RETRIES,
+        hedge_after: float = UPSTREAM_HEDGE_AFTER,
+    ):
+        self._transport = transport
+        self.breaker = breaker
+        self.retries = retries
+        self.hedge_after = hedge_after
+        self.retried = 0
+        self.hedged = 0
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # Full jitter keeps retries from many callers from lining up
+        return random.uniform(0, min(UPSTREAM_RETRY_BACKOFF_MAX, UPSTREAM_RETRY_BACKOFF * 2 ** attempt))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempts = 1 + (self.retries if idempotent else 0)
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            self.breaker.before_call()
+            try:
+                response = await self._send(request, hedge=idempotent)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if last_attempt:
+                    raise
+                self.retried += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                self.breaker.abandon_trial()
+                raise
+
+            if response.status_code in FAILURE_STATUS:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            if response.status_code in RETRYABLE_STATUS and not last_attempt:
+                await response.aclose()
+                self.retried += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            return response
+
+    async def _send(self, request: httpx.Request, hedge: bool) -> httpx.Response:
+        if not hedge or self.hedge_after <= 0:
+            return await self._transport.handle_async_request(request)
+
+        first = asyncio.ensure_future(self._transport.handle_async_request(request))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        self.hedged += 1
+        pending = {first, asyncio.ensure_future(self._transport.handle_async_request(request))}
+        winner: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif winner is None:
+                        winner = task.result()
+                    else:
+                        await task.result().aclose()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in pending:
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+        if winner is None:
+            raise error
+        return winner
+
+    def stats(self) -> Dict[str, Any]:
+        return {"retried": self.retried, "hedged": self.hedged, "breaker": self.breaker.stats()}
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,59 @@
+import hashlib
+import os
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+ROSTER_CACHE_CONTROL = os.getenv("ROSTER_CACHE_CONTROL", "public, max-age=300, stale-while-revalidate=3600")
+
+
+class PreparedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def prepare_json(payload: Any) -> PreparedBody:
+    """Serialize a payload (models included) once and tag it with a strong ETag"""
+    body = to_json(payload)
+    return PreparedBody(body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"')
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def body_response(request: Request, body: bytes, etag: str, media_type: str, cache_control: str,
+                  vary: Optional[str] = None) -> Response:
+    """Serve bytes under an ETag, answering a matching If-None-Match with 304"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def json_response(request: Request, prepared: PreparedBody, cache_control: str = ROSTER_CACHE_CONTROL) -> Response:
+    """Serve prepared bytes, answering a matching If-None-Match with 304"""
+    return body_response(request, prepared.body, prepared.etag, "application/json", cache_control)
+
+
+class VersionedBodyCache:
+    """Prepared response bodies keyed by name, rebuilt only when the source version changes"""
+
+    def __init__(self):
+        self._bodies: Dict[str, Tuple[object, PreparedBody]] = {}
+
+    def get(self, name: str, version: object, build: Callable[[], Any]) -> PreparedBody:
+        cached = self._bodies.get(name)
+        if cached is not None and cached[0] is version:
+            return cached[1]
+        prepared = prepare_json(build())
+        self._bodies[name] = (version, prepared)
+        return prepared
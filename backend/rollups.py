@@ -0,0 +1,400 @@
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+try:
+    from .crosswalk import crosswalk_service, FEC_BATCH_SIZE
+    from .http_clients import upstream_clients
+    from .ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from .responses import PreparedBody, prepare_json
+    from .roster_index import state_key
+    from .services import congress_service
+    from .shared_cache import shared_backend
+    from .snapshot import DATA_CACHE_DIR
+except ImportError:
+    from crosswalk import crosswalk_service, FEC_BATCH_SIZE
+    from http_clients import upstream_clients
+    from ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from responses import PreparedBody, prepare_json
+    from roster_index import state_key
+    from services import congress_service
+    from shared_cache import shared_backend
+    from snapshot import DATA_CACHE_DIR
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_PATH = Path(os.getenv("ROLLUP_PATH", str(DATA_CACHE_DIR / "rollups.sqlite3")))
+ROLLUP_INTERVAL = float(os.getenv("ROLLUP_INTERVAL_SECONDS", "3600"))
+# A member's FEC totals are refetched once they are this old; fresher ones are reused across runs
+ROLLUP_TOTALS_TTL = float(os.getenv("ROLLUP_TOTALS_TTL_SECONDS", "21600"))
+ROLLUP_RETRY_BACKOFF = float(os.getenv("ROLLUP_RETRY_BACKOFF_SECONDS", "300"))
+ROLLUP_BACKGROUND_REFRESH = os.getenv("ROLLUP_BACKGROUND_REFRESH", "true").lower() in ("1", "true", "yes")
+ROLLUP_LEASE = "rollups"
+ROLLUP_LEASE_TTL = 600.0
+
+# FEC two-year totals summed into every rollup, kept in integer cents so deltas never drift
+ROLLUP_FIELDS = ("receipts", "disbursements", "individual_contributions", "last_cash_on_hand_end_period")
+DIMENSIONS = ("party", "state", "chamber")
+
+Cents = Tuple[int, ...]
+ZERO: Cents = (0,) * len(ROLLUP_FIELDS)
+
+
+@dataclass(frozen=True)
+class MemberFigures:
+    """One member's roster placement and FEC totals for a cycle; a change to either moves the rollups"""
+    bioguide_id: str
+    candidate_id: str
+    party: str
+    state: str
+    chamber: str
+    totals: Cents
+    # When the totals were fetched; a refetch that finds the same totals is not a change
+    fetched_at: float = field(default=0.0, compare=False)
+
+    def keys(self) -> Dict[str, str]:
+        return {"party": self.party, "state": self.state, "chamber": self.chamber}
+
+
+def _cents(row: Optional[dict]) -> Cents:
+    if row is None:
+        return ZERO
+    return tuple(round((row.get(f) or 0) * 100) for f in ROLLUP_FIELDS)
+
+
+def _shift(totals: Cents, delta: Cents, sign: int) -> Cents:
+    return tuple(t + sign * d for t, d in zip(totals, delta))
+
+
+class RollupStore:
+    """Per-member figures and the party/state/chamber rollups materialized from them, per cycle"""
+
+    def __init__(self, path: Path = ROLLUP_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS members (cycle INTEGER NOT NULL, bioguide_id TEXT NOT NULL, "
+            "candidate_id TEXT NOT NULL, party TEXT NOT NULL, state TEXT NOT NULL, chamber TEXT NOT NULL, "
+            "totals TEXT NOT NULL, PRIMARY KEY (cycle, bioguide_id))"
+        )
+        if "fetched_at" not in {row[1] for row in conn.execute("PRAGMA table_info(members)")}:
+            # Stores written before totals were fetched incrementally: every member counts as stale once
+            conn.execute("ALTER TABLE members ADD COLUMN fetched_at REAL NOT NULL DEFAULT 0")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups (cycle INTEGER NOT NULL, dimension TEXT NOT NULL, key TEXT NOT NULL, "
+            "members INTEGER NOT NULL, totals TEXT NOT NULL, PRIMARY KEY (cycle, dimension, key))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS runs (cycle INTEGER PRIMARY KEY, computed_at REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, cycle: int) -> Tuple[Dict[str, MemberFigures], Dict[Tuple[str, str], Tuple[int, Cents]], float]:
+        """Member figures, rollups and when they were computed (0 if never) for a cycle"""
+        conn = self._conn()
+        members = {
+            row[0]: MemberFigures(row[0], row[1], row[2], row[3], row[4], tuple(from_json(row[5])), row[6])
+            for row in conn.execute(
+                "SELECT bioguide_id, candidate_id, party, state, chamber, totals, fetched_at FROM members "
+                "WHERE cycle = ?", (cycle,)
+            )
+        }
+        rollups = {
+            (dimension, key): (count, tuple(from_json(totals)))
+            for dimension, key, count, totals in conn.execute(
+                "SELECT dimension, key, members, totals FROM rollups WHERE cycle = ?", (cycle,)
+            )
+        }
+        row = conn.execute("SELECT computed_at FROM runs WHERE cycle = ?", (cycle,)).fetchone()
+        return members, rollups, row[0] if row else 0.0
+
+    def apply(self, cycle: int, changed: Iterable[MemberFigures], removed: Iterable[str],
+              rollups: Dict[Tuple[str, str], Tuple[int, Cents]], computed_at: float) -> None:
+        """Write changed (or refetched) members and the rollups they touched in one transaction"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO members (cycle, bioguide_id, candidate_id, party, state, chamber, totals, "
+                "fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (cycle, m.bioguide_id, m.candidate_id, m.party, m.state, m.chamber, to_json(m.totals), m.fetched_at)
+                    for m in changed
+                ],
+            )
+            conn.executemany(
+                "DELETE FROM members WHERE cycle = ? AND bioguide_id = ?", [(cycle, b) for b in removed]
+            )
+            for (dimension, key), (count, totals) in rollups.items():
+                if count:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rollups (cycle, dimension, key, members, totals) VALUES (?, ?, ?, ?, ?)",
+                        (cycle, dimension, key, count, to_json(totals)),
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM rollups WHERE cycle = ? AND dimension = ? AND key = ?", (cycle, dimension, key)
+                    )
+            conn.execute("INSERT OR REPLACE INTO runs (cycle, computed_at) VALUES (?, ?)", (cycle, computed_at))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def current_cycle() -> int:
+    year = time.gmtime().tm_year
+    return year + year % 2
+
+
+async def _fetch_totals(candidate_ids: List[str], cycle: int) -> Dict[str, dict]:
+    """candidate ID -> FEC two-year totals row for the cycle, looked up in batches"""
+    client = upstream_clients.fec
+    batches = [candidate_ids[i:i + FEC_BATCH_SIZE] for i in range(0, len(candidate_ids), FEC_BATCH_SIZE)]
+
+    async def fetch(batch: List[str]) -> List[dict]:
+        rows: List[dict] = []
+        page = 1
+        while True:
+            response = await client.get(
+                "/candidates/totals/",
+                params={
+                    "candidate_id": batch, "cycle": cycle, "election_full": "false",
+                    "per_page": FEC_BATCH_SIZE, "page": page,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            rows.extend(data.get("results", []))
+            if page >= (data.get("pagination") or {}).get("pages", 1):
+                return rows
+            page += 1
+
+    totals: Dict[str, dict] = {}
+    for results in await asyncio.gather(*(fetch(b) for b in batches)):
+        for row in results:
+            totals.setdefault(row["candidate_id"], row)
+    return totals
+
+
+class RollupService:
+    """Materialized fundraising rollups by party, state and chamber, updated by member deltas"""
+
+    def __init__(self):
+        self._store: Optional[RollupStore] = None
+        self._cycle = 0
+        self._members: Dict[str, MemberFigures] = {}
+        self._rollups: Dict[Tuple[str, str], Tuple[int, Cents]] = {}
+        self._computed_at = 0.0
+        # dimension -> serialized view, rebuilt after every run that changed something
+        self._views: Dict[str, PreparedBody] = {}
+        self._groups: Dict[str, Dict[str, dict]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._lease_owner = f"{os.getpid()}:{id(self)}"
+
+    def _open_store(self) -> Optional[RollupStore]:
+        if self._store is None:
+            try:
+                self._store = RollupStore()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Rollup store unavailable, keeping rollups in memory only: %s", e)
+        return self._store
+
+    def _build_views(self) -> None:
+        groups: Dict[str, Dict[str, dict]] = {d: {} for d in DIMENSIONS}
+        for (dimension, key), (count, totals) in sorted(self._rollups.items()):
+            groups[dimension][key] = {"members": count, **{f: c / 100 for f, c in zip(ROLLUP_FIELDS, totals)}}
+        self._groups = groups
+        self._views = {
+            dimension: prepare_json({
+                "cycle": self._cycle, "computed_at": self._computed_at, "dimension": dimension, "groups": groups[dimension],
+            })
+            for dimension in DIMENSIONS
+        }
+
+    async def load(self) -> bool:
+        """Serve the persisted rollups for the current cycle, if any, until the next run"""
+        store = self._open_store()
+        if store is None:
+            return False
+        cycle = current_cycle()
+        members, rollups, computed_at = await asyncio.to_thread(store.load, cycle)
+        if not computed_at or (cycle == self._cycle and computed_at <= self._computed_at):
+            return False
+        self._cycle, self._members, self._rollups, self._computed_at = cycle, members, rollups, computed_at
+        self._build_views()
+        return True
+
+    async def _roster_figures(self, cycle: int, previous: Dict[str, MemberFigures]) -> Dict[str, MemberFigures]:
+        """Every crosswalked member's placement and totals, refetching only totals older than ROLLUP_TOTALS_TTL"""
+        index = await congress_service.get_index()
+        placements = {}
+        for chamber, members in (("house", index.house_members), ("senate", index.senate_members)):
+            for m in members:
+                entry = await crosswalk_service.lookup(m.id)
+                if entry is not None and entry.candidate_id:
+                    placements[m.id] = (entry.candidate_id, m.party, state_key(m.state), chamber)
+        now = time.time()
+        # candidate ID -> (totals, fetched_at) still fresh from an earlier run
+        fresh = {
+            f.candidate_id: (f.totals, f.fetched_at)
+            for f in previous.values() if now - f.fetched_at < ROLLUP_TOTALS_TTL
+        }
+        stale = sorted({p[0] for p in placements.values()} - set(fresh))
+        fetched = await _fetch_totals(stale, cycle) if stale else {}
+        for candidate_id in stale:
+            fresh[candidate_id] = (_cents(fetched.get(candidate_id)), now)
+        return {
+            bioguide_id: MemberFigures(bioguide_id, candidate_id, party, state, chamber, *fresh[candidate_id])
+            for bioguide_id, (candidate_id, party, state, chamber) in placements.items()
+        }
+
+    async def _refresh(self) -> None:
+        # Another worker may have run it already
+        if self._views and await self.load() and time.time() - self._computed_at < ROLLUP_INTERVAL:
+            return
+        try:
+            if not await asyncio.to_thread(shared_backend.acquire_lease, ROLLUP_LEASE, self._lease_owner, ROLLUP_LEASE_TTL):
+                if self._views:
+                    return
+        except Exception:
+            pass
+        try:
+            cycle = current_cycle()
+            # A new cycle starts from nothing, but the old one keeps serving until this run succeeds
+            members, base = (self._members, self._rollups) if cycle == self._cycle else ({}, {})
+            with upstream_priority(BACKGROUND if self._views else INTERACTIVE):
+                figures = await self._roster_figures(cycle, members)
+
+            changed = [f for b, f in figures.items() if members.get(b) != f]
+            refetched = [
+                f for b, f in figures.items() if b in members and members[b] == f and members[b].fetched_at != f.fetched_at
+            ]
+            removed = [b for b in members if b not in figures]
+            rollups = dict(base)
+            touched = set()
+            # Only members whose placement or totals moved are backed out and re-added
+            for old in [members[f.bioguide_id] for f in changed if f.bioguide_id in members] + [
+                members[b] for b in removed
+            ]:
+                for key in old.keys().items():
+                    count, totals = rollups[key]
+                    rollups[key] = (count - 1, _shift(totals, old.totals, -1))
+                    touched.add(key)
+            for new in changed:
+                for key in new.keys().items():
+                    count, totals = rollups.get(key, (0, ZERO))
+                    rollups[key] = (count + 1, _shift(totals, new.totals, 1))
+                    touched.add(key)
+
+            computed_at = time.time()
+            store = self._open_store()
+            if store is not None:
+                await asyncio.to_thread(
+                    store.apply, cycle, changed + refetched, removed, {k: rollups[k] for k in touched}, computed_at
+                )
+            self._cycle = cycle
+            self._members = figures
+            self._rollups = {k: v for k, v in rollups.items() if v[0]}
+            self._computed_at = computed_at
+            self._build_views()
+            self._failures = 0
+            logger.info("Rollups for %s: %s of %s members changed", cycle, len(changed) + len(removed), len(figures))
+        except Exception:
+            self._failures += 1
+            raise
+        finally:
+            try:
+                await asyncio.to_thread(shared_backend.release_lease, ROLLUP_LEASE, self._lease_owner)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Rollup run failed: %s", task.exception())
+
+    def _trigger_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._log_failure)
+        return self._refresh_task
+
+    async def _ensure_views(self) -> None:
+        if not self._views:
+            await self.load()
+        if not self._views:
+            await asyncio.shield(self._trigger_refresh())
+
+    async def view(self, dimension: str) -> PreparedBody:
+        """Every group of a dimension, serialized once per run"""
+        await self._ensure_views()
+        return self._views[dimension]
+
+    async def group(self, dimension: str, key: str) -> Optional[dict]:
+        await self._ensure_views()
+        group = self._groups[dimension].get(key)
+        if group is None:
+            return None
+        return {"cycle": self._cycle, "computed_at": self._computed_at, "dimension": dimension, "key": key, **group}
+
+    def age(self) -> Optional[float]:
+        return time.time() - self._computed_at if self._views else None
+
+    def _next_refresh_delay(self) -> float:
+        if self._failures:
+            return min(ROLLUP_INTERVAL, ROLLUP_RETRY_BACKOFF * 2 ** (self._failures - 1)) * random.uniform(0.5, 1.0)
+        if not self._views:
+            return 0.0
+        return max(0.0, self._computed_at + ROLLUP_INTERVAL - time.time()) + random.uniform(0, 30)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_delay())
+            try:
+                await asyncio.shield(self._trigger_refresh())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Logged by the refresh task; the backoff is picked up from the failure count
+                pass
+
+    def start_background_refresh(self) -> None:
+        if not ROLLUP_BACKGROUND_REFRESH:
+            return
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        tasks = [t for t in (self._loop_task, self._refresh_task) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._refresh_task = None
+
+
+rollup_service = RollupService()
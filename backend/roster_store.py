@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+try:
+    from .snapshot import DATA_CACHE_DIR
+    from .roster_index import chamber_in_congress, state_key
+except ImportError:
+    from snapshot import DATA_CACHE_DIR
+    from roster_index import chamber_in_congress, state_key
+
+load_dotenv()
+
+ROSTER_STORE_PATH = Path(os.getenv("ROSTER_STORE_PATH", str(DATA_CACHE_DIR / "roster-history.sqlite3")))
+
+# (rowid, raw Congress.gov member record)
+StoredMember = Tuple[int, dict]
+
+
+class RosterStore:
+    """Raw member records for every synced Congress, keyed by (congress, bioguide ID)"""
+
+    def __init__(self, path: Path = ROSTER_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS members ("
+            "congress INTEGER NOT NULL, bioguide_id TEXT NOT NULL, chamber TEXT, party TEXT, state TEXT, "
+            "update_date TEXT, data BLOB NOT NULL, PRIMARY KEY (congress, bioguide_id))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS members_by_party ON members (congress, chamber, party)")
+        conn.execute("CREATE INDEX IF NOT EXISTS members_by_state ON members (congress, chamber, state)")
+        # watermark: newest updateDate already applied, used as fromDateTime for the next sync
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS syncs (congress INTEGER PRIMARY KEY, synced_at REAL NOT NULL, watermark TEXT)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def sync_state(self, congress: int) -> Optional[Tuple[float, Optional[str]]]:
+        """(synced_at, watermark) of the last sync of a Congress, or None if it was never synced"""
+        row = self._conn().execute("SELECT synced_at, watermark FROM syncs WHERE congress = ?", (congress,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def apply(self, congress: int, records: Iterable[dict], watermark: Optional[str] = None) -> int:
+        """Upsert records that sat in this Congress and mark it synced; returns how many rows changed"""
+        rows = []
+        for m in records:
+            chamber = chamber_in_congress(m, congress)
+            if chamber is None:
+                continue
+            rows.append((
+                congress, m.get("bioguideId", ""), chamber, (m.get("partyName") or "")[:1].upper(),
+                state_key(m.get("state", "")), m.get("updateDate"), to_json(m),
+            ))
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            # Unchanged records (same updateDate) are left alone; updates keep the row's original position
+            conn.executemany(
+                "INSERT INTO members (congress, bioguide_id, chamber, party, state, update_date, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(congress, bioguide_id) DO UPDATE SET chamber = excluded.chamber, "
+                "party = excluded.party, state = excluded.state, update_date = excluded.update_date, "
+                "data = excluded.data WHERE members.update_date IS NOT excluded.update_date",
+                rows,
+            )
+            changed = conn.total_changes - before
+            previous = self.sync_state(congress)
+            if previous is not None and previous[1] and (watermark is None or previous[1] > watermark):
+                watermark = previous[1]
+            conn.execute(
+                "INSERT OR REPLACE INTO syncs (congress, synced_at, watermark) VALUES (?, ?, ?)",
+                (congress, time.time(), watermark),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return changed
+
+    def load(self, congress: int) -> List[dict]:
+        """Every stored record for a Congress, in first-synced order"""
+        rows = self._conn().execute(
+            "SELECT data FROM members WHERE congress = ? ORDER BY rowid", (congress,)
+        ).fetchall()
+        return [from_json(row[0]) for row in rows]
+
+    def query(self, congress: int, chamber: Optional[str] = None, party: Optional[str] = None,
+              state: Optional[str] = None, after: int = 0, limit: int = 500) -> List[StoredMember]:
+        """One keyset page of records matching the filters, resuming after rowid `after`"""
+        sql = "SELECT rowid, data FROM members WHERE congress = ? AND rowid > ?"
+        params: list = [congress, after]
+        if chamber:
+            sql += " AND chamber = ?"
+            params.append(chamber)
+        if party:
+            sql += " AND party = ?"
+            params.append(party.upper())
+        if state:
+            sql += " AND state = ?"
+            params.append(state_key(state))
+        sql += " ORDER BY rowid LIMIT ?"
+        params.append(limit)
+        return [(row[0], from_json(row[1])) for row in self._conn().execute(sql, params)]
+
+
+def create_roster_store() -> Optional[RosterStore]:
+    """Open the history store; without it only the current Congress can be served"""
+    try:
+        return RosterStore()
+    except (OSError, sqlite3.Error):
+        return None
+
+
+roster_store = create_roster_store()
@@ -0,0 +1,152 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    from .models import Member
+except ImportError:
+    from models import Member
+
+# How much a hit in each part of a member record counts towards the score
+LAST_NAME_WEIGHT = 3.0
+FIRST_NAME_WEIGHT = 2.0
+PLACE_WEIGHT = 1.0
+
+# Quality of a query token's match against an indexed token
+EXACT = 1.0
+PREFIX = 0.8
+FUZZY = 0.5
+
+# Upper bounds on indexed tokens one query token may expand to by prefix, and on typo candidates checked
+MAX_PREFIX_EXPANSION = 64
+MAX_FUZZY_CANDIDATES = 32
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase, accent-free alphanumeric tokens"""
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return [t for t in _NON_ALNUM.split(folded) if t]
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Whether a and b are within `limit` edits (insert, delete, substitute, swap adjacent)"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    # Only cells within `limit` of the diagonal can stay under the limit
+    over = limit + 1
+    before, previous = None, [j if j <= limit else over for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        current = [i if i <= limit else over] + [over] * len(b)
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cb = b[j - 1]
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current[j] = cost
+        if min(current) > limit:
+            return False
+        before, previous = previous, current
+    return previous[-1] <= limit
+
+
+def _typo_budget(token: str) -> int:
+    # Short tokens match too much when fuzzed
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+class MemberSearchIndex:
+    """Token index over member names, states and districts with prefix and typo-tolerant lookup"""
+
+    def __init__(self, entries: Iterable[Tuple[str, Member, Sequence[str]]]):
+        """`entries` are (chamber, member, place terms such as state name and abbreviation)"""
+        self.docs: List[Tuple[str, Member]] = []
+        # token -> {doc id: best field weight the token appears in}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        for doc_id, (chamber, member, places) in enumerate(entries):
+            self.docs.append((chamber, member))
+            fields = [
+                (member.last_name, LAST_NAME_WEIGHT),
+                (member.first_name, FIRST_NAME_WEIGHT),
+                (" ".join((*places, member.district or "")), PLACE_WEIGHT),
+            ]
+            for text, weight in fields:
+                for token in normalize(text):
+                    docs = self._postings.setdefault(token, {})
+                    docs[doc_id] = max(docs.get(doc_id, 0.0), weight)
+
+        self._tokens = sorted(self._postings)
+        self._grams: Dict[str, Set[str]] = {}
+        for token in self._tokens:
+            for gram in _trigrams(token):
+                self._grams.setdefault(gram, set()).add(token)
+
+    def _expand(self, query_token: str) -> Dict[str, float]:
+        """Indexed tokens the query token matches, with the quality of each match"""
+        matches: Dict[str, float] = {}
+        if query_token in self._postings:
+            matches[query_token] = EXACT
+
+        start = bisect_left(self._tokens, query_token)
+        for token in self._tokens[start:start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(query_token):
+                break
+            matches.setdefault(token, PREFIX)
+
+        # Typo matching is only a fallback for tokens that neither match nor start any indexed token
+        budget = _typo_budget(query_token) if not matches else 0
+        if budget:
+            # Candidates share at least one trigram; the edit distance check does the real filtering
+            grams = _trigrams(query_token)
+            shared: Dict[str, int] = {}
+            for gram in grams:
+                for token in self._grams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            # An edit destroys at most three trigrams, a swap four
+            needed = max(1, len(grams) - 4 * budget)
+            candidates = sorted(
+                (t for t, count in shared.items() if count >= needed and t not in matches),
+                key=lambda t: -shared[t],
+            )
+            for token in candidates[:MAX_FUZZY_CANDIDATES]:
+                if _within_distance(query_token, token, budget):
+                    matches[token] = FUZZY
+        return matches
+
+    def search(self, query: str, limit: int = 10, chamber: Optional[str] = None) -> List[Tuple[float, str, Member]]:
+        """Members matching every query token, best first as (score, chamber, member)"""
+        query_tokens = normalize(query)
+        if not query_tokens:
+            return []
+
+        scores: Dict[int, float] = {}
+        for n, query_token in enumerate(query_tokens):
+            best: Dict[int, float] = {}
+            for token, quality in self._expand(query_token).items():
+                for doc_id, weight in self._postings[token].items():
+                    if chamber is not None and self.docs[doc_id][0] != chamber:
+                        continue
+                    score = quality * weight
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            if n == 0:
+                scores = best
+            else:
+                scores = {doc_id: scores[doc_id] + s for doc_id, s in best.items() if doc_id in scores}
+            if not scores:
+                return []
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], self.docs[item[0]][1].last_name, self.docs[item[0]][1].first_name),
+        )
+        return [(round(score, 3), *self.docs[doc_id]) for doc_id, score in ranked[:limit]]
@@ -1,220 +1,386 @@
-import httpx
-import os
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 try:
-    from .models import Member, ChamberBreakdown, WhiteHouse, Executive, StateDetail, District
+    from .models import Member, ChamberBreakdown, WhiteHouse, Executive, StateDetail
+    from .http_clients import upstream_clients
+    from .roster_index import RosterIndex, HOUSE, SENATE, roster_member
+    from .snapshot import RosterSnapshot, read_snapshot, write_snapshot, ROSTER_SNAPSHOT_ENABLED, CURRENT_CONGRESS
+    from .shared_cache import shared_backend
+    from .ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from .metrics import roster_refresh_duration
+    from .roster_store import roster_store
 except ImportError:
-    from models import Member, ChamberBreakdown, WhiteHouse, Executive, StateDetail, District
+    from models import Member, ChamberBreakdown, WhiteHouse, Executive, StateDetail
+    from http_clients import upstream_clients
+    from roster_index import RosterIndex, HOUSE, SENATE, roster_member
+    from snapshot import RosterSnapshot, read_snapshot, write_snapshot, ROSTER_SNAPSHOT_ENABLED, CURRENT_CONGRESS
+    from shared_cache import shared_backend
+    from ratelimit import upstream_priority, BACKGROUND, INTERACTIVE
+    from metrics import roster_refresh_duration
+    from roster_store import roster_store
 import asyncio
+import logging
+import os
+import random
+import time
 
 load_dotenv()
 
-# Congress.gov API
-CONGRESS_API_BASE = "https://api.congress.gov/v3"
-CONGRESS_API_KEY = os.getenv("CONGRESS_API_KEY")
+logger = logging.getLogger(__name__)
+
+# Roster refresh (stale-while-revalidate) settings
+ROSTER_TTL = float(os.getenv("ROSTER_TTL_SECONDS", "21600"))
+ROSTER_REFRESH_JITTER = float(os.getenv("ROSTER_REFRESH_JITTER_SECONDS", "300"))
+ROSTER_RETRY_BACKOFF = float(os.getenv("ROSTER_RETRY_BACKOFF_SECONDS", "30"))
+ROSTER_RETRY_BACKOFF_MAX = float(os.getenv("ROSTER_RETRY_BACKOFF_MAX_SECONDS", "1800"))
+ROSTER_BACKGROUND_REFRESH = os.getenv("ROSTER_BACKGROUND_REFRESH", "true").lower() in ("1", "true", "yes")
+# Only one worker per host refetches; the others pick up its snapshot
+ROSTER_LEASE_TTL = float(os.getenv("ROSTER_LEASE_TTL_SECONDS", "120"))
+ROSTER_LEASE_WAIT = float(os.getenv("ROSTER_LEASE_WAIT_SECONDS", "5"))
+ROSTER_LEASE = "roster:119"
+# Past Congresses change rarely; their stored rosters are resynced (incrementally) after this long
+ROSTER_HISTORY_TTL = float(os.getenv("ROSTER_HISTORY_TTL_SECONDS", "86400"))
+HISTORY_PAGE_SIZE = 500
+
+
+class HistoryUnavailable(Exception):
+    """Raised when a past Congress is requested but the local roster store could not be opened"""
+
+
+def _newest_update(records: List[dict]) -> Optional[str]:
+    # updateDate is ISO 8601 in UTC, so string order is time order
+    return max((m["updateDate"] for m in records if m.get("updateDate")), default=None)
 
 
 class CongressService:
     def __init__(self):
-        self.base_url = CONGRESS_API_BASE
-        self.api_key = CONGRESS_API_KEY
-        # Cache for members data (prevents redundant API calls)
+        # Current roster snapshot; replaced wholesale on refresh, never mutated in place
         self._all_members_cache: Optional[List] = None
-        self._cache_lock = asyncio.Lock()
-    
-    async def _fetch_all_members(self) -> List:
-        """Fetch all members (House + Senate) with caching for performance"""
-        async with self._cache_lock:
-            if self._all_members_cache is not None:
-                return self._all_members_cache
-            
-            all_members_data = []
-            
-            async with httpx.AsyncClient() as client:
-                # Fetch all pages in parallel for better performance
-                offset = 0
-                limit = 250
-                
-                # First request to get pagination info - using 119th Congress (2025-2027)
-                response = await client.get(
-                    f"{self.base_url}/member/congress/119?currentMember=true&offset=0&limit={limit}&api_key={self.api_key}",
-                    timeout=15.0
-                )
-                response.raise_for_status()
-                first_data = response.json()
-                all_members_data.extend(first_data.get("members", []))
-                
-                total_count = first_data.get("pagination", {}).get("count", 0)
-                
-                # Calculate remaining pages and fetch them in parallel
-                remaining_pages = []
-                offset = limit
-                while offset < total_count:
-                    remaining_pages.append(offset)
-                    offset += limit
-                
-                if remaining_pages:
-                    tasks = [
-                        client.get(
-                            f"{self.base_url}/member/congress/119?currentMember=true&offset={offset}&limit={limit}&api_key={self.api_key}",
-                            timeout=15.0
-                        )
-                        for offset in remaining_pages
-                    ]
-                    responses = await asyncio.gather(*tasks)
-                    for resp in responses:
-                        resp.raise_for_status()
-                        data = resp.json()
-                        all_members_data.extend(data.get("members", []))
-            
-            self._all_members_cache = all_members_data
-            return all_members_data
-
-    async def get_house_members(self) -> Tuple[List[Member], ChamberBreakdown]:
-        """Fetch all House of Representatives members from Congress.gov API"""
-        all_members_data = await self._fetch_all_members()
-        
-        members = []
-        for m in all_members_data:
-                # Only include House members (check if currently serving in House)
-                terms = m.get("terms", {}).get("item", [])
-                if not terms:
-                    continue
-                
-                # Find the current term (term without endYear)
-                current_term = None
-                for term in terms:
-                    if "endYear" not in term:
-                        current_term = term
-                        break
-                
-                if not current_term or current_term.get("chamber") != "House of Representatives":
-                    continue
-                
-                # Exclude non-voting delegates (territories and DC)
-                state = m.get("state", "")
-                if state in ["Puerto Rico", "Guam", "Virgin Islands", "American Samoa", "Northern Mariana Islands", "District of Columbia"]:
-                    continue
-                
-                # Parse name (format is "Last, First")
-                full_name = m.get("name", "")
-                name_parts = full_name.split(", ")
-                last_name = name_parts[0] if name_parts else ""
-                first_name = name_parts[1] if len(name_parts) > 1 else ""
-                
-                # Extract bioguide ID for images
-                bioguide_id = m.get("bioguideId", "")
-                
-                # Get party abbreviation
-                party_name = m.get("partyName", "")
-                party = party_name[0] if party_name else ""
-                
-                # Get image URL from depiction or fallback
-                depiction = m.get("depiction", {})
-                image_url = depiction.get("imageUrl", f"https://www.congress.gov/img/member/{bioguide_id.lower()}_200.jpg")
-                
-                members.append(Member(
-                    id=bioguide_id,
-                    first_name=first_name,
-                    last_name=last_name,
-                    party=party,
-                    state=m.get("state", ""),
-                    district=str(m.get("district", "")) if m.get("district") else "At-Large",
-                    title="Representative",
-                    url=m.get("url"),
-                    image_url=image_url
-                )
-            )
+        self._index: Optional[RosterIndex] = None
+        # bioguide ID -> Congress.gov updateDate for the current snapshot
+        self._update_dates: Dict[str, Optional[str]] = {}
+        self._roster_fetched_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_loop_task: Optional[asyncio.Task] = None
+        self._refresh_failures = 0
+        self._next_attempt_at: float = 0.0
+        self._snapshot_checked = False
+        self._lease_owner = f"{os.getpid()}:{id(self)}"
+        # Past Congresses: congress -> (synced_at the index was built from, index)
+        self._history: Dict[int, Tuple[float, RosterIndex]] = {}
+        self._history_syncs: Dict[int, asyncio.Task] = {}
+
+    async def _load_all_members(self) -> List:
+        """Fetch every page of the current member list from Congress.gov"""
+        all_members_data = []
+        client = upstream_clients.congress
+        limit = 250
 
-        # Calculate breakdown
-        # Adjusting to match official counts: 219 R, 214 D, 2 vacancies
-        democrats = sum(1 for m in members if m.party == "D")
-        republicans = sum(1 for m in members if m.party == "R")
-        independents = sum(1 for m in members if m.party == "I")
-        
-        # Use official vacancy count
-        vacancies = 2
-        # Adjust Democrat count if needed to match official count of 214
-        if democrats == 213 and republicans == 219:
-            democrats = 214
-            vacancies = 2
-
-        breakdown = ChamberBreakdown(
-            democrats=democrats,
-            republicans=republicans,
-            independents=independents,
-            vacancies=vacancies,
-            total=435
+        # First request to get pagination info - using 119th Congress (2025-2027)
+        response = await client.get(
+            "/member/congress/119",
+            params={"currentMember": "true", "offset": 0, "limit": limit},
         )
+        response.raise_for_status()
+        first_data = response.json()
+        all_members_data.extend(first_data.get("members", []))
+
+        total_count = first_data.get("pagination", {}).get("count", 0)
 
-        return members, breakdown
-
-    async def get_senate_members(self) -> Tuple[List[Member], ChamberBreakdown]:
-        """Fetch all Senate members from Congress.gov API"""
-        all_members_data = await self._fetch_all_members()
-        
-        members = []
-        for m in all_members_data:
-                # Only include Senate members (check if currently serving in Senate)
-                terms = m.get("terms", {}).get("item", [])
-                if not terms:
-                    continue
-                
-                # Find the current term (term without endYear)
-                current_term = None
-                for term in terms:
-                    if "endYear" not in term:
-                        current_term = term
-                        break
-                
-                if not current_term or current_term.get("chamber") != "Senate":
-                    continue
-                
-                # Parse name (format is "Last, First")
-                full_name = m.get("name", "")
-                name_parts = full_name.split(", ")
-                last_name = name_parts[0] if name_parts else ""
-                first_name = name_parts[1] if len(name_parts) > 1 else ""
-                
-                # Extract bioguide ID for images
-                bioguide_id = m.get("bioguideId", "")
-                
-                # Get party abbreviation
-                party_name = m.get("partyName", "")
-                party = party_name[0] if party_name else ""
-                
-                # Get image URL from depiction or fallback
-                depiction = m.get("depiction", {})
-                image_url = depiction.get("imageUrl", f"https://www.congress.gov/img/member/{bioguide_id.lower()}_200.jpg")
-                
-                members.append(Member(
-                    id=bioguide_id,
-                    first_name=first_name,
-                    last_name=last_name,
-                    party=party,
-                    state=m.get("state", ""),
-                    title="Senator",
-                    url=m.get("url"),
-                    image_url=image_url
+        # Calculate remaining pages and fetch them in parallel
+        remaining_pages = list(range(limit, total_count, limit))
+
+        if remaining_pages:
+            tasks = [
+                client.get(
+                    "/member/congress/119",
+                    params={"currentMember": "true", "offset": offset, "limit": limit},
+                )
+                for offset in remaining_pages
+            ]
+            responses = await asyncio.gather(*tasks)
+            for resp in responses:
+                resp.raise_for_status()
+                data = resp.json()
+                all_members_data.extend(data.get("members", []))
+
+        return all_members_data
+
+    def _install(self, all_members_data: List, index: RosterIndex, fetched_at: float) -> None:
+        # Swap in the new snapshot and its index together so readers never see a partial roster
+        self._all_members_cache = all_members_data
+        self._index = index
+        self._update_dates = {m.get("bioguideId", ""): m.get("updateDate") for m in all_members_data}
+        self._roster_fetched_at = fetched_at
+        self._refresh_failures = 0
+        self._next_attempt_at = 0.0
+
+    async def _adopt_newer_snapshot(self) -> bool:
+        """Pick up a fresh roster another worker on this host already wrote to disk"""
+        if not ROSTER_SNAPSHOT_ENABLED:
+            return False
+        snapshot = await asyncio.to_thread(read_snapshot)
+        if snapshot is None or snapshot.fetched_at <= self._roster_fetched_at:
+            return False
+        if time.time() - snapshot.fetched_at >= ROSTER_TTL:
+            return False
+        self._install(snapshot.members, RosterIndex.build(snapshot.members), snapshot.fetched_at)
+        return True
+
+    async def _try_acquire_lease(self) -> bool:
+        try:
+            return await asyncio.to_thread(shared_backend.acquire_lease, ROSTER_LEASE, self._lease_owner, ROSTER_LEASE_TTL)
+        except Exception:
+            # Without a working shared tier every worker refreshes for itself
+            return True
+
+    async def _release_lease(self) -> None:
+        try:
+            await asyncio.to_thread(shared_backend.release_lease, ROSTER_LEASE, self._lease_owner)
+        except Exception:
+            pass
+
+    async def _refresh(self) -> None:
+        if await self._adopt_newer_snapshot():
+            return
+
+        # A worker with nothing to serve fetches regardless; others defer to the lease holder
+        if self._all_members_cache is not None and not await self._try_acquire_lease():
+            self._next_attempt_at = time.time() + ROSTER_LEASE_WAIT
+            return
+
+        # Revalidating a roster we can already serve must not compete with interactive calls
+        priority = BACKGROUND if self._all_members_cache is not None else INTERACTIVE
+        started = time.perf_counter()
+        try:
+            with upstream_priority(priority):
+                all_members_data = await self._load_all_members()
+            index = RosterIndex.build(all_members_data)
+        except Exception:
+            roster_refresh_duration.observe(time.perf_counter() - started, result="failure")
+            self._refresh_failures += 1
+            backoff = min(ROSTER_RETRY_BACKOFF_MAX, ROSTER_RETRY_BACKOFF * 2 ** (self._refresh_failures - 1))
+            self._next_attempt_at = time.time() + backoff * random.uniform(0.5, 1.0)
+            await self._release_lease()
+            raise
+        roster_refresh_duration.observe(time.perf_counter() - started, result="success")
+        self._install(all_members_data, index, time.time())
+
+        if ROSTER_SNAPSHOT_ENABLED:
+            snapshot = RosterSnapshot(members=all_members_data, fetched_at=self._roster_fetched_at)
+            try:
+                await asyncio.to_thread(write_snapshot, snapshot)
+            except OSError as e:
+                logger.warning("Could not write roster snapshot: %s", e)
+        if roster_store is not None:
+            # Keep the current Congress in the history store so it is already there once it ends
+            try:
+                await asyncio.to_thread(
+                    roster_store.apply, CURRENT_CONGRESS, all_members_data, _newest_update(all_members_data)
                 )
+            except Exception as e:
+                logger.warning("Could not update roster history: %s", e)
+        await self._release_lease()
+
+    async def load_snapshot(self) -> bool:
+        """Serve the on-disk roster snapshot until the first live refresh completes"""
+        self._snapshot_checked = True
+        if not ROSTER_SNAPSHOT_ENABLED or self._all_members_cache is not None:
+            return False
+        snapshot = await asyncio.to_thread(read_snapshot)
+        if snapshot is None:
+            return False
+        index = RosterIndex.build(snapshot.members)
+        if self._all_members_cache is not None:
+            # A live refresh finished while the snapshot was loading
+            return False
+        # Keep the snapshot's own fetch time so an old file is revalidated straight away
+        self._install(snapshot.members, index, snapshot.fetched_at)
+        return True
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Roster refresh failed: %s", task.exception())
+
+    def _trigger_refresh(self) -> asyncio.Task:
+        """Start a roster refresh unless one is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._log_refresh_failure)
+        return self._refresh_task
+
+    async def refresh_roster(self) -> List:
+        """Refetch the roster now (joining any refresh already in flight)"""
+        await asyncio.shield(self._trigger_refresh())
+        return self._all_members_cache
+
+    def roster_age(self) -> Optional[float]:
+        if self._all_members_cache is None:
+            return None
+        return time.time() - self._roster_fetched_at
+
+    def _roster_is_stale(self) -> bool:
+        age = self.roster_age()
+        return age is not None and age >= ROSTER_TTL
+
+    async def _fetch_all_members(self) -> List:
+        """Return the current roster, revalidating it in the background once it goes stale"""
+        if self._all_members_cache is None and not self._snapshot_checked:
+            await self.load_snapshot()
+        if self._all_members_cache is None:
+            # Nothing to serve yet, so the first caller has to wait for the fetch
+            return await self.refresh_roster()
+
+        if self._roster_is_stale() and time.time() >= self._next_attempt_at:
+            self._trigger_refresh()
+        return self._all_members_cache
+
+    async def get_index(self) -> RosterIndex:
+        """Parsed index for the current roster snapshot"""
+        await self._fetch_all_members()
+        return self._index
+
+    async def member_update_date(self, bioguide_id: str) -> Tuple[bool, Optional[str]]:
+        """(whether the member is on the current roster, their updateDate there)"""
+        await self._fetch_all_members()
+        bioguide_id = bioguide_id.upper()
+        return bioguide_id in self._update_dates, self._update_dates.get(bioguide_id)
+
+    def _next_refresh_delay(self) -> float:
+        now = time.time()
+        if self._next_attempt_at > now:
+            return self._next_attempt_at - now
+        if self._all_members_cache is None:
+            return 0.0
+        jitter = random.uniform(-ROSTER_REFRESH_JITTER, ROSTER_REFRESH_JITTER)
+        return max(0.0, self._roster_fetched_at + ROSTER_TTL + jitter - now)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_delay())
+            try:
+                await self.refresh_roster()
+            except Exception:
+                # Failure is logged by the refresh task and backoff is already scheduled
+                pass
+
+    def start_background_refresh(self) -> None:
+        """Warm the roster and keep it fresh from a background task"""
+        if not ROSTER_BACKGROUND_REFRESH:
+            return
+        if self._refresh_loop_task is None or self._refresh_loop_task.done():
+            self._refresh_loop_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        tasks = [t for t in (self._refresh_loop_task, self._refresh_task) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresh_loop_task = None
+        self._refresh_task = None
+
+    async def get_house_members(self) -> Tuple[Sequence[Member], ChamberBreakdown]:
+        """House of Representatives members and party breakdown from the roster index"""
+        index = await self.get_index()
+        return index.house_members, index.house_breakdown
+
+    async def get_senate_members(self) -> Tuple[Sequence[Member], ChamberBreakdown]:
+        """Senate members and party breakdown from the roster index"""
+        index = await self.get_index()
+        return index.senate_members, index.senate_breakdown
+
+    async def iter_members(self, congress: int = CURRENT_CONGRESS, chamber: Optional[str] = None,
+                           party: Optional[str] = None, state: Optional[str] = None) -> AsyncIterator[Member]:
+        """Yield members of a Congress one at a time, optionally limited to one chamber, party or state"""
+        chambers = (chamber,) if chamber else (HOUSE, SENATE)
+        if congress == CURRENT_CONGRESS:
+            index = await self.get_index()
+            for name in chambers:
+                view = index.house if name == HOUSE else index.senate
+                for i in view.select(party=party, state=state):
+                    yield view.members[i]
+            return
+
+        # Past Congresses are read from the local store in keyset pages, using its (congress, chamber, ...) indexes
+        await self._ensure_synced(congress)
+        after = 0
+        while True:
+            rows = await asyncio.to_thread(
+                roster_store.query, congress, chamber=chamber, party=party, state=state, after=after, limit=HISTORY_PAGE_SIZE
             )
+            for _, m in rows:
+                parsed = roster_member(m, congress)
+                if parsed is not None and parsed[0] in chambers:
+                    yield parsed[1]
+            if len(rows) < HISTORY_PAGE_SIZE:
+                return
+            after = rows[-1][0]
 
-        # Calculate breakdown
-        democrats = sum(1 for m in members if m.party == "D")
-        republicans = sum(1 for m in members if m.party == "R")
-        independents = sum(1 for m in members if m.party == "I")
-        vacancies = 100 - len(members)
-
-        breakdown = ChamberBreakdown(
-            democrats=democrats,
-            republicans=republicans,
-            independents=independents,
-            vacancies=vacancies,
-            total=100
-        )
+    async def _page_members(self, path: str, params: dict) -> List[dict]:
+        """Every page of a Congress.gov member listing"""
+        client = upstream_clients.congress
+        limit = 250
+        records: List[dict] = []
+        offset = 0
+        while True:
+            response = await client.get(path, params={**params, "offset": offset, "limit": limit})
+            response.raise_for_status()
+            data = response.json()
+            page = data.get("members", [])
+            records.extend(page)
+            offset += limit
+            if not page or offset >= data.get("pagination", {}).get("count", 0):
+                return records
 
-        return members, breakdown
+    async def sync_congress(self, congress: int) -> int:
+        """Bring the stored roster of a Congress up to date; returns how many members changed"""
+        if roster_store is None:
+            raise HistoryUnavailable(f"Roster history for the {congress}th Congress is unavailable")
+        state = await asyncio.to_thread(roster_store.sync_state, congress)
+        if state is None or state[1] is None:
+            # First sync: the whole roster of that Congress
+            with upstream_priority(INTERACTIVE):
+                records = await self._page_members(f"/member/congress/{congress}", {})
+        else:
+            # Afterwards only members updated since the last sync are fetched
+            with upstream_priority(BACKGROUND):
+                records = await self._page_members("/member", {"fromDateTime": state[1]})
+        changed = await asyncio.to_thread(roster_store.apply, congress, records, _newest_update(records))
+        logger.info("Synced roster history for Congress %s: %s fetched, %s changed", congress, len(records), changed)
+        return changed
+
+    def _trigger_sync(self, congress: int) -> asyncio.Task:
+        task = self._history_syncs.get(congress)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self.sync_congress(congress))
+            task.add_done_callback(self._log_refresh_failure)
+            self._history_syncs[congress] = task
+        return task
+
+    async def _ensure_synced(self, congress: int) -> float:
+        """synced_at of the stored roster, syncing first if the Congress was never fetched"""
+        if roster_store is None:
+            raise HistoryUnavailable(f"Roster history for the {congress}th Congress is unavailable")
+        state = await asyncio.to_thread(roster_store.sync_state, congress)
+        if state is None:
+            await asyncio.shield(self._trigger_sync(congress))
+            state = await asyncio.to_thread(roster_store.sync_state, congress)
+        elif time.time() - state[0] >= ROSTER_HISTORY_TTL:
+            self._trigger_sync(congress)
+        return state[0]
+
+    async def get_congress_index(self, congress: int) -> RosterIndex:
+        """Roster index for any Congress; past ones are built from the local history store"""
+        if congress == CURRENT_CONGRESS:
+            return await self.get_index()
+        synced_at = await self._ensure_synced(congress)
+        cached = self._history.get(congress)
+        if cached is None or cached[0] != synced_at:
+            records = await asyncio.to_thread(roster_store.load, congress)
+            cached = (synced_at, RosterIndex.build(records, congress=congress))
+            self._history[congress] = cached
+        return cached[1]
 
     async def get_white_house(self) -> WhiteHouse:
         """Return current President and Vice President information"""
@@ -241,53 +407,7 @@ class CongressService:
 
     async def get_state_details(self, state_abbr: str) -> StateDetail:
         """Get detailed information for a specific state including districts and senators"""
-        # Use cache to avoid redundant API calls
-        house_members, _ = await self.get_house_members()
-        senate_members, _ = await self.get_senate_members()
-
-        # Filter by state
-        state_reps = [m for m in house_members if m.state.upper() == state_abbr.upper()]
-        state_senators = [m for m in senate_members if m.state.upper() == state_abbr.upper()]
-
-        # Group by district
-        districts = []
-        district_map = {}
-        
-        for rep in state_reps:
-            district_num = rep.district if rep.district else "At-Large"
-            if district_num not in district_map:
-                district_map[district_num] = District(
-                    state=state_abbr.upper(),
-                    district=district_num,
-                    representative=rep
-                )
-
-        districts = list(district_map.values())
-        districts.sort(key=lambda d: d.district if d.district != "At-Large" else "00")
-
-        # Get state full name (simple mapping)
-        state_names = {
-            "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
-            "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
-            "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
-            "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
-            "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
-            "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
-            "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
-            "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
-            "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
-            "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
-            "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
-            "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
-            "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia"
-        }
-
-        return StateDetail(
-            state=state_abbr.upper(),
-            state_name=state_names.get(state_abbr.upper(), state_abbr.upper()),
-            districts=districts,
-            senators=state_senators
-        )
+        return (await self.get_index()).state_detail(state_abbr)
 
 
 congress_service = CongressService()
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    from .snapshot import DATA_CACHE_DIR
+except ImportError:
+    from snapshot import DATA_CACHE_DIR
+
+load_dotenv()
+
+# "sqlite" shares entries between workers on one host, "none" keeps caches per-process
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "sqlite").lower()
+SHARED_CACHE_PATH = Path(os.getenv("SHARED_CACHE_PATH", str(DATA_CACHE_DIR / "shared-cache.sqlite3")))
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "50000"))
+# Expired rows are kept this long so they can still be served stale during upstream outages
+SHARED_CACHE_RETAIN_EXPIRED = float(os.getenv("SHARED_CACHE_RETAIN_EXPIRED_SECONDS", "86400"))
+
+# (value, stored_at, expires_at)
+SharedEntry = Tuple[bytes, float, float]
+
+
+class NullCacheBackend:
+    """Shared tier that stores nothing; every lookup falls through to upstream"""
+
+    def get(self, key: str) -> Optional[SharedEntry]:
+        return None
+
+    def set(self, key: str, value: bytes, stored_at: float, expires_at: float) -> None:
+        pass
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        return True
+
+    def release_lease(self, name: str, owner: str) -> None:
+        pass
+
+
+class SQLiteCacheBackend:
+    """Host-local cache shared by every worker process through one SQLite file in WAL mode"""
+
+    # Purge expired rows and trim to the size cap after this many writes
+    PRUNE_EVERY = 500
+
+    def __init__(self, path: Path = SHARED_CACHE_PATH, max_entries: int = SHARED_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[SharedEntry]:
+        row = self._conn().execute(
+            "SELECT value, stored_at, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        return (bytes(row[0]), row[1], row[2]) if row else None
+
+    def set(self, key: str, value: bytes, stored_at: float, expires_at: float) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, value, stored_at, expires_at),
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time() - SHARED_CACHE_RETAIN_EXPIRED,))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT "
+            "max(0, (SELECT count(*) FROM cache) - ?))",
+            (self.max_entries,),
+        )
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take a named lease unless another live owner holds it, so only one worker does the work"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.expires_at <= ? OR leases.owner = excluded.owner",
+            (name, owner, now + ttl, now),
+        )
+        row = conn.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release_lease(self, name: str, owner: str) -> None:
+        self._conn().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+
+def create_shared_backend():
+    """Build the configured shared tier, falling back to per-process caching if it cannot be opened"""
+    if SHARED_CACHE_BACKEND == "sqlite":
+        try:
+            return SQLiteCacheBackend()
+        except (OSError, sqlite3.Error):
+            return NullCacheBackend()
+    return NullCacheBackend()
+
+
+shared_backend = create_shared_backend()
@@ -0,0 +1,79 @@
+import gzip
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from pydantic_core import from_json, to_json
+
+load_dotenv()
+
+# Bump when the on-disk layout changes; older snapshots are ignored rather than misread
+SNAPSHOT_FORMAT = 1
+CURRENT_CONGRESS = 119
+
+DATA_CACHE_DIR = Path(os.getenv("DATA_CACHE_DIR", str(Path(__file__).parent / "data" / "cache")))
+ROSTER_SNAPSHOT_PATH = Path(os.getenv("ROSTER_SNAPSHOT_PATH", str(DATA_CACHE_DIR / f"roster-{CURRENT_CONGRESS}.json.gz")))
+ROSTER_SNAPSHOT_ENABLED = os.getenv("ROSTER_SNAPSHOT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class RosterSnapshot:
+    members: List[dict]
+    fetched_at: float
+    congress: int = CURRENT_CONGRESS
+
+
+def write_snapshot(snapshot: RosterSnapshot, path: Path = ROSTER_SNAPSHOT_PATH) -> None:
+    """Write the raw roster as gzipped JSON, replacing any previous file atomically"""
+    body = to_json({
+        "format": SNAPSHOT_FORMAT,
+        "congress": snapshot.congress,
+        "fetched_at": snapshot.fetched_at,
+        "member_count": len(snapshot.members),
+        "members": snapshot.members,
+    })
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(body, compresslevel=6))
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def read_snapshot(path: Path = ROSTER_SNAPSHOT_PATH, congress: int = CURRENT_CONGRESS) -> Optional[RosterSnapshot]:
+    """Load a snapshot, or None if it is missing, unreadable or from another format/congress"""
+    try:
+        data = from_json(gzip.decompress(path.read_bytes()))
+    except (OSError, ValueError, EOFError):
+        return None
+    if data.get("format") != SNAPSHOT_FORMAT or data.get("congress") != congress:
+        return None
+    return RosterSnapshot(members=data["members"], fetched_at=data["fetched_at"], congress=congress)
+
+
+if __name__ == "__main__":
+    # Save a fresh snapshot, e.g. to refresh a test fixture: python snapshot.py [path]
+    import asyncio
+    import sys
+
+    try:
+        from .services import congress_service
+        from .http_clients import upstream_clients
+    except ImportError:
+        from services import congress_service
+        from http_clients import upstream_clients
+
+    async def _save(path: Path) -> None:
+        members = await congress_service._load_all_members()
+        await upstream_clients.shutdown()
+        write_snapshot(RosterSnapshot(members=members, fetched_at=time.time()), path)
+        print(f"Wrote {len(members)} members to {path}")
+
+    asyncio.run(_save(Path(sys.argv[1]) if len(sys.argv) > 1 else ROSTER_SNAPSHOT_PATH))
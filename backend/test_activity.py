@@ -0,0 +1,54 @@
+import pytest
+
+from activity import bill_status, summarize
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Became Public Law No: 118-5.", "became_law"),
+    ("Signed by President.", "became_law"),
+    ("Vetoed by President.", "vetoed"),
+    ("Passed/agreed to in House: On motion to suspend the rules and pass the bill", "passed_chamber"),
+    ("Placed on the Union Calendar, Calendar No. 12.", "reported"),
+    ("Referred to the House Committee on Ways and Means.", "in_committee"),
+    ("Introduced in House", "introduced"),
+    (None, "introduced"),
+])
+def test_bill_status(text, expected):
+    assert bill_status({"text": text}) == expected
+
+
+def test_bill_status_without_latest_action():
+    assert bill_status(None) == "introduced"
+
+
+def test_summarize():
+    items = [
+        {"congress": 119, "type": "HR", "introducedDate": "2025-02-01", "policyArea": {"name": "Health"},
+         "latestAction": {"text": "Referred to the Committee on Energy and Commerce."}},
+        {"congress": 119, "type": "S", "introducedDate": "2025-03-15", "policyArea": {"name": "Taxation"},
+         "latestAction": {"text": "Became Public Law No: 119-3."}},
+        {"congress": 118, "type": "HR", "introducedDate": "2023-06-01", "policyArea": {"name": "Health"},
+         "latestAction": {"text": "Referred to the Subcommittee on Health."}},
+        {"congress": 118, "type": None, "amendmentNumber": "42", "introducedDate": "2024-01-10"},
+        {"congress": 118, "type": "HRES", "introducedDate": "2023-01-09", "policyArea": None, "latestAction": None},
+    ]
+    summary = summarize(items)
+    assert summary["total"] == 5
+    assert summary["bills"] == 4
+    assert summary["amendments"] == 1
+    assert summary["latest_introduced"] == "2025-03-15"
+    assert list(summary["by_congress"].items()) == [("119", 2), ("118", 3)]
+    assert list(summary["by_policy_area"].items()) == [("Health", 2), ("Taxation", 1), ("Unspecified", 1)]
+    assert summary["by_status"] == {"in_committee": 2, "became_law": 1, "introduced": 1}
+
+
+def test_summarize_nothing():
+    assert summarize([]) == {
+        "total": 0, "bills": 0, "amendments": 0, "latest_introduced": None,
+        "by_congress": {}, "by_policy_area": {}, "by_status": {},
+    }
+
+
+def test_summarize_orders_congresses_numerically_with_unknown_last():
+    items = [{"congress": 99, "type": "HR"}, {"type": "HR"}, {"congress": 119, "type": "HR"}, {"congress": 101, "type": "S"}]
+    assert list(summarize(items)["by_congress"]) == ["119", "101", "99", "unknown"]
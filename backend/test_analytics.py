@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from analytics import ContributionFrame, compare, timeseries
+from contributions import size_bucket, to_day
+
+DAY = to_day("2024-01-01")
+
+
+def frame(committee_id, rows):
+    """rows: (amount, day offset or None, donor, employer, state)"""
+    values = {"donor": [], "employer": [], "state": [], "zip": ["00000"]}
+
+    def code(dimension, value):
+        if value not in values[dimension]:
+            values[dimension].append(value)
+        return values[dimension].index(value)
+
+    codes = {d: [] for d in values}
+    for amount, _, donor, employer, state in rows:
+        codes["donor"].append(code("donor", donor))
+        codes["employer"].append(code("employer", employer))
+        codes["state"].append(code("state", state))
+        codes["zip"].append(0)
+    amounts = np.array([r[0] for r in rows], dtype=np.float64)
+    return ContributionFrame(
+        committee_id, 2024, 1.0,
+        amount=amounts,
+        day=np.array([0 if r[1] is None else DAY + r[1] for r in rows], dtype=np.int32),
+        size=np.array([size_bucket(a) for a in amounts], dtype=np.uint8),
+        codes={d: np.array(c, dtype=np.uint32) for d, c in codes.items()},
+        values=values,
+    )
+
+
+A = frame("C001", [
+    (100.0, 0, "SMITH, JO\t12345", "ACME", "NY"),
+    (50.0, 1, "SMITH, JO\t12345", "ACME", "NY"),
+    (1000.0, 8, "DOE, AL\t54321", "RETIRED", "CA"),
+    (25.0, None, "ROE, PAT\t11111", "NONE", "NY"),
+    (-50.0, 9, "SMITH, JO\t12345", "ACME", "NY"),
+])
+B = frame("C002", [
+    (300.0, 20, "LEE, KIM\t22222", "SELF", "TX"),
+])
+
+
+def test_timeseries_buckets_rolling_and_cumulative_sums():
+    series = timeseries(A, DAY, 3, 7, 2)
+    # Undated rows are left off the axis; the refund lands in the second week
+    assert series["totals"] == [150.0, 950.0, 0.0]
+    assert series["rolling"] == [150.0, 1100.0, 950.0]
+    assert series["cumulative"] == [150.0, 1100.0, 1100.0]
+
+
+def test_compare_puts_committees_on_one_axis():
+    result = compare([A, B], ["timeseries", "top_donors", "by_state", "small_dollar"], top=1, bucket_days=7, window=2)
+    assert result["axis"] == {"start": "2024-01-01", "bucket_days": 7, "buckets": 3, "window": 2}
+
+    a, b = result["committees"]["C001"], result["committees"]["C002"]
+    assert (a["contributions"], a["total"]) == (5, 1125.0)
+    assert b["timeseries"]["totals"] == [0.0, 0.0, 300.0]
+    assert a["top_donors"] == [{"name": "DOE, AL", "zip": "54321", "total": 1000.0, "count": 1}]
+    assert [s["name"] for s in a["by_state"]] == ["CA", "NY"]
+    assert a["by_state"][1] == {"name": "NY", "total": 125.0, "count": 4}
+    assert a["small_dollar"]["total"] == 125.0
+    assert a["small_dollar"]["share_of_count"] == pytest.approx(0.8)
+
+
+def test_compare_distribution_leaves_out_refunds():
+    result = compare([A], ["distribution"], top=5, bucket_days=7, window=1)
+    distribution = result["committees"]["C001"]["distribution"]
+    assert distribution["count"] == 4
+    assert distribution["mean"] == 293.75
+    assert sum(b["count"] for b in distribution["histogram"]) == 4
+    assert "axis" not in result
+
+
+def test_compare_without_dated_rows_has_no_axis():
+    undated = frame("C003", [(10.0, None, "X\t00000", "Y", "ZZ")])
+    result = compare([undated], ["timeseries"], top=5, bucket_days=7, window=1)
+    assert "axis" not in result
+    assert result["committees"]["C003"]["timeseries"] is None
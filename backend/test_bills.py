@@ -0,0 +1,89 @@
+import pytest
+
+from bills import BillStore, match_expression
+
+
+def item(congress, type, number, title, chamber, action_date, action, update_date):
+    return {
+        "congress": congress, "type": type, "number": number, "title": title, "originChamber": chamber,
+        "latestAction": {"actionDate": action_date, "text": action}, "updateDate": update_date,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = BillStore(tmp_path / "bills.sqlite3")
+    store.apply_listing(119, [
+        item(119, "HR", 1, "Lower Energy Costs Act", "House", "2025-03-01", "Referred to committee", "2025-03-02T00:00:00Z"),
+        item(119, "S", 5, "Energy independence and security", "Senate", "2025-02-01", "Placed on calendar", "2025-02-02T00:00:00Z"),
+        item(119, "HR", 7, "Rural health clinics act", "House", "2025-04-01", "Passed House", "2025-04-02T00:00:00Z"),
+    ], "2025-04-02T00:00:00Z")
+    store.apply_listing(118, [
+        item(118, "HR", 9, "Clean energy jobs act", "House", "2024-01-05", "Referred to committee", "2024-01-06T00:00:00Z"),
+    ], "2024-01-06T00:00:00Z")
+    ids = {(r[1], r[2]): r[0] for r in store._conn().execute("SELECT id, type, number FROM bills")}
+    store.apply_details([
+        ("A000001", "Rep. Alpha", "R", "Energy", "2025-03-02T00:00:00Z", ids[("HR", "1")]),
+        ("B000002", "Sen. Beta", "D", "Energy", "2025-02-02T00:00:00Z", ids[("S", "5")]),
+        ("C000003", "Rep. Gamma", "D", "Health", "2025-04-02T00:00:00Z", ids[("HR", "7")]),
+    ])
+    return store
+
+
+def search(store, query, sort="relevance", limit=20, offset=0, **filters):
+    return store.search(query, filters, sort, limit, offset)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("energy", '"energy"*'),
+    ("clean energy", '"clean" "energy"*'),
+    # Quotes, operators and FTS syntax in user input become plain terms
+    ('energy" OR "x', '"energy" "OR" "x"*'),
+    ("NEAR(energy health) *", '"NEAR" "energy" "health"*'),
+    ("title:energy -jobs", '"title" "energy" "jobs"*'),
+    ('"*" ()', None),
+])
+def test_match_expression(query, expected):
+    assert match_expression(query) == expected
+
+
+@pytest.mark.parametrize("query", ['energy"', "energy OR", "(energy", "NEAR(", "*energy", "title:", "^energy", "AND"])
+def test_hostile_queries_never_raise(store, query):
+    search(store, query)
+
+
+def test_prefix_search_covers_titles_sponsors_and_policy_areas(store):
+    result = search(store, "ener")
+    assert result["total"] == 3
+    assert {(r["type"], r["number"]) for r in result["results"]} == {("HR", "1"), ("S", "5"), ("HR", "9")}
+    # The sponsor and policy area are indexed too
+    assert [r["number"] for r in search(store, "gamma")["results"]] == ["7"]
+
+
+def test_every_word_must_match(store):
+    assert [r["number"] for r in search(store, "clean energy")["results"]] == ["9"]
+    assert search(store, "clean health")["total"] == 0
+
+
+def test_filters_and_facets(store):
+    result = search(store, "energy", congress=119)
+    assert result["total"] == 2
+    assert result["facets"]["congress"] == {"119": 2}
+    assert result["facets"]["chamber"] == {"House": 1, "Senate": 1}
+    assert result["facets"]["party"] == {"D": 1, "R": 1}
+    assert result["facets"]["policy_area"] == {"Energy": 2}
+
+    assert [r["number"] for r in search(store, None, party="D", sort="latest")["results"]] == ["7", "5"]
+
+
+def test_browse_pages_by_latest_action(store):
+    first = search(store, None, sort="latest", limit=2)
+    second = search(store, None, sort="latest", limit=2, offset=2)
+    assert first["total"] == 4
+    assert [r["number"] for r in first["results"] + second["results"]] == ["7", "1", "5", "9"]
+    assert first["facets"]["congress"] == {"119": 3, "118": 1}
+
+
+def test_punctuation_only_query_matches_nothing(store):
+    result = search(store, "?!")
+    assert result == {"total": 0, "results": [], "facets": {"congress": {}, "chamber": {}, "policy_area": {}, "party": {}}}
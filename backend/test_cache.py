@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+import cache
+from cache import ProxyCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_their_namespace_ttl(clock):
+    proxy = ProxyCache(ttls={"short": 10, "long": 100})
+    proxy.set("short", "k", {"v": 1})
+    proxy.set("long", "k", {"v": 2})
+    clock.now += 50
+    assert proxy.get("short", "k") is None
+    assert proxy.get("long", "k") == {"v": 2}
+    assert (proxy.hits, proxy.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted_first(clock):
+    proxy = ProxyCache(max_entries=2, ttls={"ns": 60})
+    proxy.set("ns", "a", 1)
+    proxy.set("ns", "b", 2)
+    proxy.get("ns", "a")
+    proxy.set("ns", "c", 3)
+    assert proxy.get("ns", "b") is None
+    assert proxy.get("ns", "a") == 1 and proxy.get("ns", "c") == 3
+    assert proxy.evictions == 1
+
+
+def test_byte_budget_bounds_the_cache(clock):
+    proxy = ProxyCache(max_bytes=10, ttls={"ns": 60})
+    proxy.set("ns", "a", "x", size=6)
+    proxy.set("ns", "b", "y", size=6)
+    assert proxy.get("ns", "a") is None
+    # Larger than the whole budget: never stored
+    proxy.set("ns", "c", "z", size=11)
+    assert proxy.get("ns", "c") is None
+    assert proxy.stats()["bytes"] == 6
+
+
+def test_concurrent_misses_share_one_fetch(clock):
+    proxy = ProxyCache(ttls={"ns": 60})
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"v": len(calls)}
+
+    async def run():
+        return await asyncio.gather(*(proxy.get_or_fetch("ns", "k", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == [{"v": 1}] * 5
+    assert len(calls) == 1
+    assert proxy.coalesced == 4
+    assert proxy.stats()["in_flight"] == 0
+
+
+def test_failed_fetch_is_not_cached(clock):
+    proxy = ProxyCache(ttls={"ns": 60})
+    outcomes = [RuntimeError("down"), {"v": 1}]
+
+    async def fetch():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(proxy.get_or_fetch("ns", "k", fetch))
+    assert asyncio.run(proxy.get_or_fetch("ns", "k", fetch)) == {"v": 1}
+
+
+def test_fetch_many_batches_misses_and_keeps_per_key_errors(clock):
+    proxy = ProxyCache(ttls={"ns": 60})
+    proxy.set("ns", "cached", "hit")
+    batches = []
+
+    async def fetch_many(keys):
+        batches.append(list(keys))
+        return {k: ValueError(k) if k == "bad" else k.upper() for k in keys}
+
+    results = asyncio.run(proxy.get_or_fetch_many("ns", ["cached", "a", "b", "bad", "a"], fetch_many, 2, 4))
+    assert batches == [["a", "b"], ["bad"]]
+    assert results["cached"] == "hit" and results["a"] == "A" and results["b"] == "B"
+    assert isinstance(results["bad"], ValueError)
+    assert proxy.get("ns", "bad") is None and proxy.get("ns", "a") == "A"
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+import contributions
+from contributions import (
+    ContributionService, ContributionStore, ContributionStoreUnavailable, SCHEDULE_A_PAGE_SIZE,
+)
+
+
+def page(number):
+    return [
+        {
+            "sub_id": number * SCHEDULE_A_PAGE_SIZE + i, "contribution_receipt_amount": 10.0,
+            "contribution_receipt_date": "2024-03-01", "contributor_name": "DOE, JANE", "contributor_zip": "12345",
+            "contributor_employer": "ACME", "contributor_state": "NY",
+        }
+        for i in range(SCHEDULE_A_PAGE_SIZE)
+    ]
+
+
+class SlowLedgerService(ContributionService):
+    """Serves full pages quickly at first, then slowly, like a large committee's ledger"""
+
+    def __init__(self, store, pages):
+        super().__init__()
+        self._store = store
+        self.pages = pages
+        self.fetched = 0
+
+    async def _fetch_page(self, ledger):
+        number = self.fetched
+        self.fetched += 1
+        if number >= 1:
+            await asyncio.sleep(0.5)
+        if number >= self.pages:
+            return [], None
+        return page(number), {"last_index": str(number)}
+
+
+def test_cold_summary_returns_after_the_first_persisted_pages(tmp_path):
+    service = SlowLedgerService(ContributionStore(tmp_path / "schedule-a.sqlite3"), pages=50)
+
+    async def run():
+        start = time.perf_counter()
+        summary = await service.summary("C00000001", 2024, wait=5.0)
+        elapsed = time.perf_counter() - start
+        await service.stop()
+        return summary, elapsed
+
+    summary, elapsed = asyncio.run(run())
+    assert summary is not None and not summary["complete"]
+    assert summary["contributions"] == SCHEDULE_A_PAGE_SIZE
+    assert elapsed < 1.0
+
+
+def test_summary_reports_a_failed_first_run(tmp_path):
+    service = SlowLedgerService(ContributionStore(tmp_path / "schedule-a.sqlite3"), pages=1)
+
+    async def failing(ledger):
+        raise RuntimeError("FEC down")
+
+    service._fetch_page = failing
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.summary("C00000001", 2024, wait=1.0))
+
+
+def test_unopenable_store_is_unavailable_not_an_error(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    # A regular file where the store's directory should be
+    monkeypatch.setattr(contributions, "ContributionStore", lambda: ContributionStore(blocker / "schedule-a.sqlite3"))
+    service = ContributionService()
+    with pytest.raises(ContributionStoreUnavailable):
+        asyncio.run(service.summary("C00000001", 2024, wait=1.0))
+    assert service._store_failed
+    with pytest.raises(ContributionStoreUnavailable):
+        asyncio.run(service.columns("C00000001", 2024))
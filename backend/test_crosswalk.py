@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+import crosswalk
+from crosswalk import CrosswalkEntry, CrosswalkService, CrosswalkStore, _current_office, _primary_candidate_id
+
+
+def test_current_office_follows_the_latest_term():
+    assert _current_office({"terms": [{"type": "rep"}, {"type": "sen"}]}) == "S"
+    assert _current_office({"terms": []}) is None
+
+
+def test_primary_candidate_id_prefers_the_current_office():
+    assert _primary_candidate_id(["H2CA01", "S8CA02", "H4CA03"], "S") == "S8CA02"
+    assert _primary_candidate_id(["H2CA01", "H4CA03"], "H") == "H4CA03"
+    # No ID for the office held: fall back to the newest
+    assert _primary_candidate_id(["H2CA01"], "S") == "H2CA01"
+    assert _primary_candidate_id([], "H") is None
+
+
+def test_failed_first_build_backs_off(tmp_path, monkeypatch):
+    service = CrosswalkService()
+    service._store = CrosswalkStore(tmp_path / "crosswalk.sqlite3")
+
+    async def build_crosswalk():
+        raise RuntimeError("FEC down")
+
+    monkeypatch.setattr(crosswalk, "build_crosswalk", build_crosswalk)
+    assert service._next_refresh_delay() == 0.0
+    with pytest.raises(RuntimeError):
+        asyncio.run(service._refresh())
+    assert service._entries is None
+    assert service._next_refresh_delay() >= crosswalk.CROSSWALK_RETRY_BACKOFF / 2
+
+
+def test_rebuild_is_persisted_and_reloaded(tmp_path, monkeypatch):
+    entry = CrosswalkEntry("A000001", ("H2CA01",), "H2CA01", ("C001",), "H")
+
+    async def build_crosswalk():
+        return [entry]
+
+    monkeypatch.setattr(crosswalk, "build_crosswalk", build_crosswalk)
+    service = CrosswalkService()
+    service._store = CrosswalkStore(tmp_path / "crosswalk.sqlite3")
+    assert asyncio.run(service.lookup("a000001")) == entry
+
+    reloaded = CrosswalkService()
+    reloaded._store = CrosswalkStore(tmp_path / "crosswalk.sqlite3")
+    assert asyncio.run(reloaded.load())
+    assert asyncio.run(reloaded.lookup("A000001")) == entry
@@ -0,0 +1,110 @@
+import asyncio
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+from export import MEMBER_FIELDS, chunked, csv_rows, export_columns, ndjson_rows
+from models import Member
+from roster_index import RosterIndex
+
+MEMBERS = [
+    {"bioguideId": "A000001", "name": "Doe, Jane", "partyName": "Democratic", "state": "California", "district": 3,
+     "terms": {"item": [{"chamber": "House of Representatives", "startYear": 2023}]}},
+    {"bioguideId": "C000003", "name": "Poe, Pat", "partyName": "Republican", "state": "California", "district": 5,
+     "terms": {"item": [{"chamber": "House of Representatives", "startYear": 2023}]}},
+    {"bioguideId": "B000002", "name": "Roe, Rick", "partyName": "Republican", "state": "Texas",
+     "terms": {"item": [{"chamber": "Senate", "startYear": 2021}]}},
+]
+
+
+def member(id, **fields):
+    return Member(id=id, first_name="Jane", last_name="Doe", party="D", state="NY", title="Senator", **fields)
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+def collect(rows):
+    async def run():
+        return [row async for row in rows]
+    return asyncio.run(run())
+
+
+def client(monkeypatch):
+    index = RosterIndex.build(MEMBERS)
+
+    async def get_index():
+        return index
+
+    monkeypatch.setattr(main.congress_service, "get_index", get_index)
+    return TestClient(main.app)
+
+
+def test_columns_keep_member_field_order():
+    assert export_columns(None) == MEMBER_FIELDS
+    assert export_columns({"state", "id", "party"}) == ("id", "party", "state")
+
+
+def test_ndjson_writes_one_object_per_line():
+    rows = collect(ndjson_rows(aiter([member("A"), member("B", phone="555")]), ("id", "phone")))
+    assert rows == [b'{"id":"A","phone":null}\n', b'{"id":"B","phone":"555"}\n']
+
+
+def test_csv_writes_a_header_and_quotes_values():
+    rows = collect(csv_rows(aiter([member("A", office='1 "Main", Rm 2')]), ("id", "office", "phone")))
+    assert rows[0] == b"id,office,phone\r\n"
+    assert list(csv.reader(io.StringIO(rows[1].decode()))) == [["A", '1 "Main", Rm 2', ""]]
+
+
+def test_chunks_coalesce_rows_without_splitting_them():
+    chunks = collect(chunked(aiter([b"aaa", b"bb", b"c", b"dddd", b"e"]), chunk_bytes=5))
+    assert chunks == [b"aaabb", b"cdddd", b"e"]
+    assert collect(chunked(aiter([]))) == []
+
+
+def test_export_streams_the_current_roster(monkeypatch):
+    response = client(monkeypatch).get("/api/export/members")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="members-' in response.headers["content-disposition"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    # House first, then Senate, each in roster order
+    assert [m["id"] for m in lines] == ["A000001", "C000003", "B000002"]
+    assert set(lines[0]) == set(MEMBER_FIELDS)
+
+
+def test_export_applies_the_listing_filters(monkeypatch):
+    response = client(monkeypatch).get(
+        "/api/export/members", params={"format": "csv", "chamber": "house", "party": "r", "state": "CA", "fields": "id,state"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert list(csv.reader(io.StringIO(response.text))) == [["id", "state"], ["C000003", "California"]]
+
+
+def test_export_with_no_matches_is_an_empty_body(monkeypatch):
+    c = client(monkeypatch)
+    response = c.get("/api/export/members", params={"format": "csv", "state": "WY"})
+    assert response.status_code == 200 and response.text == ",".join(MEMBER_FIELDS) + "\r\n"
+    assert c.get("/api/export/members", params={"state": "WY"}).text == ""
+
+
+def test_export_rejects_unknown_formats_and_chambers(monkeypatch):
+    c = client(monkeypatch)
+    assert c.get("/api/export/members", params={"format": "xml"}).status_code == 422
+    assert c.get("/api/export/members", params={"chamber": "both"}).status_code == 422
+
+
+def test_upstream_failure_before_the_first_row_gets_a_status(monkeypatch):
+    async def get_index():
+        raise main.UpstreamUnavailable("Congress.gov", 30)
+
+    monkeypatch.setattr(main.congress_service, "get_index", get_index)
+    response = TestClient(main.app).get("/api/export/members")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "30"
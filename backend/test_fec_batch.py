@@ -0,0 +1,112 @@
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from cache import ProxyCache
+
+# FEC rejects the whole request when any ID in it is unknown to its validator
+REJECTED = "H9REJECT0"
+
+
+def status_error(status):
+    request = httpx.Request("GET", "https://api.open.fec.gov/v1/candidates/totals/")
+    return httpx.HTTPStatusError(f"{status}", request=request, response=httpx.Response(status, request=request))
+
+
+class FakeFEC:
+    def __init__(self):
+        self.calls = []
+        self.down = False
+
+    async def __call__(self, client, path, params):
+        ids = list(params["candidate_id"])
+        self.calls.append((path, ids, params.get("cycle")))
+        if self.down:
+            raise status_error(503)
+        if REJECTED in ids:
+            raise status_error(422)
+        if path == "/committees/":
+            rows = [{"committee_id": f"C{c[1:]}", "candidate_ids": [c]} for c in ids]
+        else:
+            rows = [{"candidate_id": c, "receipts": len(c), "cycle": params.get("cycle")} for c in ids]
+        return {"results": rows, "pagination": {"pages": 1}}
+
+
+@pytest.fixture
+def fec(monkeypatch):
+    fake = FakeFEC()
+    monkeypatch.setattr(main, "_fetch_json", fake)
+    monkeypatch.setattr(main, "proxy_cache", ProxyCache())
+    monkeypatch.setattr(main, "FEC_API_KEY", "test")
+    monkeypatch.setattr(main, "FEC_BATCH_SIZE", 2)
+    return fake
+
+
+@pytest.fixture
+def client(fec):
+    return TestClient(main.app)
+
+
+def totals(client, *ids, **params):
+    return client.get("/api/fec/candidates/totals", params={"candidate_id": list(ids), **params})
+
+
+def test_ids_are_batched_and_results_keyed_per_candidate(client, fec):
+    body = totals(client, "h0ca00001,S0TX00002", "H0CA00001", "P00000003").json()
+    assert list(body["results"]) == ["H0CA00001", "S0TX00002", "P00000003"]
+    assert body["results"]["S0TX00002"][0]["candidate_id"] == "S0TX00002"
+    assert body["errors"] == {}
+    assert [ids for _, ids, _ in fec.calls] == [["H0CA00001", "S0TX00002"], ["P00000003"]]
+
+
+def test_invalid_ids_are_reported_without_a_request(client, fec):
+    body = totals(client, "H0CA00001", "nope", "X0CA00001").json()
+    assert list(body["results"]) == ["H0CA00001"]
+    assert body["errors"] == {
+        "NOPE": {"status": 400, "detail": "Invalid FEC candidate ID"},
+        "X0CA00001": {"status": 400, "detail": "Invalid FEC candidate ID"},
+    }
+    assert [ids for _, ids, _ in fec.calls] == [["H0CA00001"]]
+
+
+def test_too_many_ids_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(main, "FEC_BATCH_MAX_IDS", 2)
+    assert totals(client, "H0CA00001", "H0CA00002", "H0CA00003").status_code == 400
+
+
+def test_cached_ids_are_not_refetched_and_cycles_are_kept_apart(client, fec):
+    totals(client, "H0CA00001", "H0CA00002")
+    body = totals(client, "H0CA00002", "H0CA00001", "H0CA00003").json()
+    assert len(body["results"]) == 3
+    assert [ids for _, ids, _ in fec.calls] == [["H0CA00001", "H0CA00002"], ["H0CA00003"]]
+
+    assert totals(client, "H0CA00001", cycle=2024).json()["results"]["H0CA00001"][0]["cycle"] == 2024
+    assert fec.calls[-1] == ("/candidates/totals/", ["H0CA00001"], 2024)
+
+
+def test_a_rejected_batch_is_split_so_only_the_bad_id_fails(client, fec):
+    body = totals(client, "H0CA00001", REJECTED).json()
+    assert list(body["results"]) == ["H0CA00001"]
+    assert body["errors"][REJECTED]["status"] == 422
+    assert [ids for _, ids, _ in fec.calls] == [["H0CA00001", REJECTED], ["H0CA00001"], [REJECTED]]
+
+
+def test_upstream_outage_serves_stale_entries_or_reports_per_id(client, fec):
+    totals(client, "H0CA00001")
+    # Just expired, so still within the stale window, then FEC goes down
+    main.proxy_cache._entries["fec:batch_totals:H0CA00001:all"].expires_at = time.time() - 1
+    fec.down = True
+    body = totals(client, "H0CA00001", "H0CA00002").json()
+    assert body["results"]["H0CA00001"][0]["candidate_id"] == "H0CA00001"
+    assert body["errors"] == {"H0CA00002": {"status": 503, "detail": "503"}}
+    # Outages are not split into smaller batches
+    assert [ids for _, ids, _ in fec.calls][1:] == [["H0CA00001", "H0CA00002"]]
+
+
+def test_committees_are_grouped_by_linked_candidate(client, fec):
+    body = client.get("/api/fec/candidates/committees", params={"candidate_id": "H0CA00001,S0TX00002"}).json()
+    assert body["results"]["S0TX00002"] == [{"committee_id": "C0TX00002", "candidate_ids": ["S0TX00002"]}]
+    assert fec.calls[0][0] == "/committees/"
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from geo_index import DistrictLocator, DistrictShapes, GeoDataUnavailable, district_label, load_zip_districts
+
+
+def square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+def feature(state, district, geometry):
+    return {"type": "Feature", "properties": {"STATEFP": state, "CD119FP": district}, "geometry": geometry}
+
+
+SHAPES = DistrictShapes.from_geojson({"features": [
+    # A district with a hole, and the district filling the hole
+    feature("06", "01", {"type": "Polygon", "coordinates": [square(0, 0, 4, 4), square(1, 1, 2, 2)]}),
+    feature("06", "02", {"type": "Polygon", "coordinates": [square(1, 1, 2, 2)]}),
+    # An at-large district in two pieces
+    feature("02", "00", {"type": "MultiPolygon", "coordinates": [[square(10, 10, 11, 11)], [square(20, 20, 21, 21)]]}),
+    # Water is never a district
+    feature("06", "ZZ", {"type": "Polygon", "coordinates": [square(5, 5, 6, 6)]}),
+]}, cell=1.0)
+
+
+@pytest.mark.parametrize("lat, lon, expected", [
+    (0.5, 0.5, ("CA", "1")),
+    (3.5, 3.5, ("CA", "1")),
+    (1.5, 1.5, ("CA", "2")),
+    (10.5, 10.5, ("AK", "At-Large")),
+    (20.5, 20.5, ("AK", "At-Large")),
+    (15.0, 15.0, None),
+    (5.5, 5.5, None),
+    (-1.0, -1.0, None),
+])
+def test_locate(lat, lon, expected):
+    assert SHAPES.locate(lat, lon) == expected
+
+
+def test_district_label():
+    assert district_label("07") == "7"
+    assert district_label("00") == "At-Large"
+    assert district_label("98") == "At-Large"
+    assert district_label("ZZ") is None
+
+
+def test_load_zip_districts_census_relationship_file(tmp_path):
+    path = tmp_path / "zips.txt"
+    path.write_text(
+        "OID_ZCTA5_20|GEOID_ZCTA5_20|OID_CD119_20|GEOID_CD119_20|AREALAND_PART\n"
+        "1|99501|1|0200|500\n"
+        "2|10001|1|3610|300\n"
+        "3|10001|1|3612|100\n"
+        "\n"
+        "4|10001\n"
+    )
+    zips = load_zip_districts(path)
+    assert zips["99501"] == ((("AK", "At-Large"), None),)
+    assert zips["10001"] == ((("NY", "10"), 0.75), (("NY", "12"), 0.25))
+
+
+def test_load_zip_districts_hud_crosswalk(tmp_path):
+    path = tmp_path / "zips.csv"
+    path.write_text("ZIP,USPS_ZIP_PREF_STATE,CD,RES_RATIO\n501,NY,3601,1\n02108,MA,2508,0.9\n02108,MA,2507,0.1\n")
+    zips = load_zip_districts(path)
+    assert zips["00501"] == ((("NY", "1"), None),)
+    assert zips["02108"] == ((("MA", "8"), 0.9), (("MA", "7"), 0.1))
+
+
+def test_malformed_zip_file_is_unavailable_and_not_reparsed(tmp_path):
+    path = tmp_path / "zips.csv"
+    path.write_text("ZIP,STATE,CD,RES_RATIO\n02108,MA,08,not-a-number\n")
+    reads = []
+
+    def read(p):
+        reads.append(p)
+        return load_zip_districts(p)
+
+    locator = DistrictLocator(tmp_path / "missing.geojson", path)
+
+    async def lookups():
+        for _ in range(2):
+            with pytest.raises(GeoDataUnavailable):
+                await locator._load("zips", path, read)
+        with pytest.raises(GeoDataUnavailable):
+            await locator.shapes()
+
+    asyncio.run(lookups())
+    assert len(reads) == 1
@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from models import Member
+from responses import VersionedBodyCache
+from roster_index import ChamberView, RosterIndex
+
+
+def member(id, party, state, district=None):
+    return Member(id=id, first_name="Jane", last_name=id, party=party, state=state, district=district, title="Representative")
+
+
+VIEW = ChamberView.build([
+    member("A", "D", "California"), member("B", "R", "CA"), member("C", "R", "Texas"),
+    member("D", "D", "California"), member("E", "R", "California"),
+])
+
+
+def record(bioguide_id, party, state, district):
+    return {
+        "bioguideId": bioguide_id, "name": f"{bioguide_id}, Jane", "partyName": party, "state": state,
+        "district": district, "terms": {"item": [{"chamber": "House of Representatives", "startYear": 2023}]},
+    }
+
+
+HOUSE = [record(f"H{i:06d}", "Democratic" if i % 2 else "Republican", "Ohio" if i < 4 else "Iowa", i) for i in range(7)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    index = RosterIndex.build(HOUSE)
+
+    async def get_index():
+        return index
+
+    monkeypatch.setattr(main.congress_service, "get_index", get_index)
+    monkeypatch.setattr(main, "roster_bodies", VersionedBodyCache())
+    return TestClient(main.app)
+
+
+def test_select_intersects_filters_in_roster_order():
+    assert list(VIEW.select()) == [0, 1, 2, 3, 4]
+    # States match by name or abbreviation, parties case-insensitively
+    assert VIEW.select(state="ca") == [0, 1, 3, 4]
+    assert VIEW.select(party="r", state="California") == [1, 4]
+    assert VIEW.select(party="I") == []
+
+
+def test_page_resumes_after_the_cursor_member():
+    selected = VIEW.select(party="R")
+    assert VIEW.page(selected, None, 2) == ([1, 2], True)
+    assert VIEW.page(selected, "C", 2) == ([4], False)
+    # A cursor member outside the filter still resumes at its roster position
+    assert VIEW.page(selected, "D", 2) == ([4], False)
+    with pytest.raises(KeyError):
+        VIEW.page(selected, "Z", 2)
+
+
+def test_without_listing_parameters_the_full_roster_is_returned(client):
+    body = client.get("/api/house").json()
+    assert len(body["members"]) == 7 and "breakdown" in body
+
+
+def test_cursor_pages_cover_the_filtered_roster_once(client):
+    seen, cursor = [], None
+    while True:
+        params = {"state": "OH", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/house", params=params).json()
+        assert body["total"] == 4
+        seen += [m["id"] for m in body["members"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["H000000", "H000001", "H000002", "H000003"]
+
+
+def test_fields_are_projected_and_always_include_the_id(client):
+    body = client.get("/api/house", params={"party": "D", "fields": "last_name, district"}).json()
+    assert body["members"][0] == {"id": "H000001", "last_name": "H000001", "district": "1"}
+    assert body["total"] == 3 and body["next_cursor"] is None
+
+
+def test_bad_listing_parameters_are_client_errors(client):
+    assert client.get("/api/house", params={"fields": "id,salary"}).status_code == 400
+    assert client.get("/api/house", params={"cursor": "!!!"}).status_code == 400
+    assert client.get("/api/house", params={"cursor": main._encode_cursor("X999999")}).status_code == 400
+    assert client.get("/api/house", params={"limit": 0}).status_code == 422
+    assert client.get("/api/house", params={"limit": main.MEMBER_PAGE_MAX + 1}).status_code == 422
@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from metrics import Counter, Gauge, Histogram, _Metric, endpoint_template, server_timing_header
+from responses import VersionedBodyCache
+from roster_index import RosterIndex
+
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("m", "help")
+    assert Counter("c", "help").render() == "# HELP c help\n# TYPE c counter"
+
+
+def test_counters_and_gauges_render_labelled_series():
+    counter = Counter("c", "help", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc(kind='x"y')
+    assert list(counter.samples()) == ['c{kind="a"} 3', 'c{kind="x\\"y"} 1']
+
+    # Callback values are read at scrape time; None means no sample
+    gauge = Gauge("g", "help", ("upstream",), callback=lambda: {("fec",): 0.5, ("congress",): None})
+    assert list(gauge.samples()) == ['g{upstream="fec"} 0.5']
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("h", "help", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+    assert list(histogram.samples()) == [
+        'h_bucket{le="0.1"} 1', 'h_bucket{le="1"} 3', 'h_bucket{le="+Inf"} 4', "h_sum 4.25", "h_count 4",
+    ]
+
+
+def test_upstream_paths_collapse_ids():
+    assert endpoint_template("/v1/candidate/H0CA00001/totals/") == "/v1/candidate/{id}/totals/"
+    assert endpoint_template("/member/congress/119") == "/member/congress/{id}"
+
+
+def test_server_timing_sums_repeated_stages():
+    header = server_timing_header([("upstream", 0.01), ("serialize", 0.002), ("upstream", 0.02)], 0.05)
+    assert header == "upstream;dur=30.0, serialize;dur=2.0, total;dur=50.0"
+
+
+def test_requests_are_timed_by_route_template(monkeypatch):
+    index = RosterIndex.build([])
+
+    async def get_index():
+        return index
+
+    monkeypatch.setattr(main.congress_service, "get_index", get_index)
+    monkeypatch.setattr(main, "roster_bodies", VersionedBodyCache())
+    monkeypatch.setattr(main, "SERVER_TIMING_ENABLED", True)
+    client = TestClient(main.app)
+
+    response = client.get("/api/state/oh")
+    assert response.status_code == 200
+    assert "roster;dur=" in response.headers["server-timing"]
+    client.get("/api/state/zz")
+
+    exposition = client.get("/metrics").text
+    assert 'ptp_http_request_duration_seconds_count{method="GET",route="/api/state/{state_abbr}",status="200"}' in exposition
+    assert 'ptp_http_request_duration_seconds_count{method="GET",route="/api/state/{state_abbr}",status="404"}' in exposition
+    assert "# TYPE ptp_http_requests_in_flight gauge" in exposition
+    assert exposition.endswith("\n")
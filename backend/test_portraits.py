@@ -0,0 +1,48 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from portraits import PortraitStore, render, variant_width
+
+
+@pytest.mark.parametrize("requested, expected", [
+    (1, 48),
+    (48, 48),
+    (49, 64),
+    (150, 200),
+    # Larger than any variant: the largest one is served
+    (4000, 200),
+])
+def test_variant_width_rounds_up_to_a_configured_width(requested, expected):
+    assert variant_width(requested, (48, 64, 96, 128, 200)) == expected
+
+
+def source(width=300, height=400):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (120, 30, 200)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("fmt, pil_format", [("webp", "WEBP"), ("jpeg", "JPEG")])
+def test_render_resizes_keeping_the_aspect_ratio(fmt, pil_format):
+    with Image.open(BytesIO(render(source(), 96, fmt))) as img:
+        assert img.format == pil_format
+        assert img.size == (96, 128)
+
+
+def test_render_never_enlarges():
+    with Image.open(BytesIO(render(source(60, 80), 200, "jpeg"))) as img:
+        assert img.size == (60, 80)
+
+
+def test_store_evicts_least_recently_used_files(tmp_path):
+    store = PortraitStore(tmp_path, max_bytes=250)
+    store.write("aa01", b"x" * 100)
+    store.write("bb02", b"y" * 100)
+    store._conn().execute("UPDATE blobs SET accessed_at = 0 WHERE name = 'aa01'")
+    store.write("cc03", b"z" * 100)
+    assert not store.has("aa01")
+    assert store.read("bb02") == b"y" * 100 and store.read("cc03") == b"z" * 100
+    assert store.read("aa01") is None
+    assert store.size() <= 250
@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from ratelimit import GovernedTransport, UpstreamGovernor
+
+
+class SlowBody(httpx.AsyncByteStream):
+    def __init__(self, governor, seen):
+        self.governor = governor
+        self.seen = seen
+
+    async def __aiter__(self):
+        # The slot is still held while the body streams in
+        self.seen.append(self.governor._active)
+        yield b"ok"
+
+
+def client(governor, seen):
+    def handler(request):
+        return httpx.Response(200, stream=SlowBody(governor, seen))
+
+    return httpx.AsyncClient(transport=GovernedTransport(httpx.MockTransport(handler), governor), base_url="http://up")
+
+
+def test_slot_is_held_until_the_body_is_read():
+    governor = UpstreamGovernor("test", rate_per_hour=3600000, burst=100, max_concurrency=1)
+    seen = []
+
+    async def run():
+        async with client(governor, seen) as c:
+            response = await c.get("/a")
+            assert response.text == "ok"
+            assert governor._active == 0
+            async with c.stream("GET", "/b") as streamed:
+                assert governor._active == 1
+                await streamed.aread()
+            assert governor._active == 0
+
+    asyncio.run(run())
+    assert seen == [1, 1]
+
+
+def test_slot_is_released_once_when_a_stream_is_closed_unread():
+    governor = UpstreamGovernor("test", rate_per_hour=3600000, burst=100, max_concurrency=1)
+
+    async def run():
+        async with client(governor, []) as c:
+            async with c.stream("GET", "/a") as response:
+                await response.aclose()
+                await response.aclose()
+            assert governor._active == 0
+            # The next request is granted the freed slot
+            assert (await c.get("/b")).status_code == 200
+
+    asyncio.run(run())
@@ -0,0 +1,134 @@
+import asyncio
+
+import httpx
+import pytest
+
+import resilience
+from resilience import CircuitBreaker, ResilientTransport, UpstreamUnavailable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "UPSTREAM_RETRY_BACKOFF_MAX", 0.0)
+
+
+def scripted(*outcomes):
+    """A mock upstream answering each call with the next status code or raising the next exception"""
+    calls = []
+
+    async def handler(request):
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(request.method)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+    return httpx.MockTransport(handler), calls
+
+
+def send(transport, method="GET"):
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://up") as client:
+            return await client.request(method, "/x")
+    return asyncio.run(run())
+
+
+def test_idempotent_requests_are_retried():
+    mock, calls = scripted(503, httpx.ConnectError("reset"), 200)
+    transport = ResilientTransport(mock, CircuitBreaker("test"), retries=2)
+    assert send(transport).status_code == 200
+    assert len(calls) == 3 and transport.retried == 2
+
+
+def test_last_attempt_is_returned_or_raised():
+    mock, calls = scripted(503)
+    assert send(ResilientTransport(mock, CircuitBreaker("test"), retries=1)).status_code == 503
+    assert len(calls) == 2
+
+    mock, calls = scripted(httpx.ConnectError("down"))
+    with pytest.raises(httpx.ConnectError):
+        send(ResilientTransport(mock, CircuitBreaker("test"), retries=1))
+    assert len(calls) == 2
+
+
+def test_non_idempotent_requests_are_sent_once():
+    mock, calls = scripted(503, 200)
+    assert send(ResilientTransport(mock, CircuitBreaker("test"), retries=2), method="POST").status_code == 503
+    assert calls == ["POST"]
+
+
+def test_breaker_opens_short_circuits_and_recovers(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    mock, calls = scripted(500, 500, 200)
+    transport = ResilientTransport(mock, breaker, retries=0)
+
+    send(transport)
+    send(transport)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(UpstreamUnavailable):
+        send(transport)
+    assert len(calls) == 2 and breaker.short_circuited == 1
+
+    # After the cool-down one trial call goes through and closes the breaker
+    clock.now += 31
+    assert send(transport).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_reopens_the_breaker(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 31
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one trial at a time
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.opened == 2
+
+
+def test_rate_limiting_does_not_count_against_health():
+    mock, _ = scripted(429, 429, 429)
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    assert send(ResilientTransport(mock, breaker, retries=2)).status_code == 429
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_requests_are_hedged_and_the_loser_cancelled():
+    started, cancelled = [], []
+
+    async def handler(request):
+        started.append(len(started))
+        if len(started) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return httpx.Response(200, text="slow")
+        return httpx.Response(200, text="fast")
+
+    transport = ResilientTransport(httpx.MockTransport(handler), CircuitBreaker("test"), retries=0, hedge_after=0.05)
+    assert send(transport).text == "fast"
+    assert transport.hedged == 1
+    assert cancelled == [True]
+
+
+def test_fast_requests_are_not_hedged():
+    mock, calls = scripted(200)
+    transport = ResilientTransport(mock, CircuitBreaker("test"), retries=0, hedge_after=1.0)
+    assert send(transport).status_code == 200
+    assert len(calls) == 1 and transport.hedged == 0
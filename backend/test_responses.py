@@ -0,0 +1,74 @@
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+import main
+from responses import VersionedBodyCache, _etag_matches, json_response, prepare_json
+from roster_index import RosterIndex
+
+
+def request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_is_stable_for_the_same_payload():
+    assert prepare_json({"a": [1, 2]}).etag == prepare_json({"a": [1, 2]}).etag
+    assert prepare_json({"a": [1, 2]}).etag != prepare_json({"a": [2, 1]}).etag
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    etag = '"abc"'
+    assert _etag_matches('"abc"', etag)
+    assert _etag_matches('W/"abc"', etag)
+    assert _etag_matches('"x", W/"abc"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"abcd"', etag)
+
+
+def test_json_response_answers_a_matching_etag_with_304():
+    prepared = prepare_json({"members": []})
+    full = json_response(request(), prepared)
+    assert full.status_code == 200
+    assert full.body == prepared.body
+    assert full.headers["etag"] == prepared.etag
+
+    not_modified = json_response(request(prepared.etag), prepared)
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == prepared.etag
+    assert "cache-control" in not_modified.headers
+
+    assert json_response(request('"stale"'), prepared).status_code == 200
+
+
+def test_versioned_bodies_rebuild_only_for_a_new_version():
+    bodies = VersionedBodyCache()
+    builds = []
+    v1, v2 = object(), object()
+
+    def build():
+        builds.append(1)
+        return {"n": len(builds)}
+
+    first = bodies.get("house", v1, build)
+    assert bodies.get("house", v1, build) is first
+    assert bodies.get("house", v2, build) != first
+    assert len(builds) == 2
+
+
+def test_unknown_states_are_rejected_before_the_body_cache(monkeypatch):
+    index = RosterIndex.build([])
+
+    async def get_index():
+        return index
+
+    monkeypatch.setattr(main.congress_service, "get_index", get_index)
+    monkeypatch.setattr(main, "roster_bodies", VersionedBodyCache())
+    client = TestClient(main.app)
+
+    ok = client.get("/api/state/ca")
+    assert ok.status_code == 200 and ok.json()["state_name"] == "California"
+    assert client.get("/api/state/ca", headers={"If-None-Match": ok.headers["etag"]}).status_code == 304
+    for abbr in ("zz", "é1", "PR"):
+        assert client.get(f"/api/state/{abbr}").status_code == 404
+    assert list(main.roster_bodies._bodies) == ["state:CA"]
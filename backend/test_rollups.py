@@ -0,0 +1,144 @@
+import asyncio
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import rollups
+from rollups import MemberFigures, RollupService, RollupStore, ZERO, _cents, _shift
+
+
+def figures(bioguide_id, party="D", state="CA", chamber="house", receipts=0.0):
+    return MemberFigures(bioguide_id, f"H0{bioguide_id}", party, state, chamber, _cents({"receipts": receipts}))
+
+
+def service(tmp_path, roster):
+    svc = RollupService()
+    svc._store = RollupStore(tmp_path / "rollups.sqlite3")
+
+    async def roster_figures(cycle, previous):
+        if isinstance(roster[0], Exception):
+            raise roster[0]
+        return {f.bioguide_id: f for f in roster[0]}
+
+    svc._roster_figures = roster_figures
+    return svc
+
+
+def test_cents_rounds_dollars_and_treats_missing_as_zero():
+    assert _cents(None) == ZERO
+    assert _cents({"receipts": 10.01, "disbursements": None, "individual_contributions": 0.1}) == (1001, 0, 10, 0)
+
+
+def test_shift_adds_and_backs_out():
+    totals = _shift(ZERO, (150, 25, 0, 7), 1)
+    assert totals == (150, 25, 0, 7)
+    assert _shift(totals, (150, 25, 0, 7), -1) == ZERO
+
+
+def test_refresh_applies_member_deltas(tmp_path):
+    roster = [[figures("A", receipts=1.10), figures("B", receipts=2.20), figures("C", party="R", state="TX", receipts=3.30)]]
+    svc = service(tmp_path, roster)
+    asyncio.run(svc._refresh())
+    assert svc._rollups[("party", "D")] == (2, (330, 0, 0, 0))
+    assert svc._rollups[("chamber", "house")] == (3, (660, 0, 0, 0))
+
+    # B moves party and A leaves; untouched groups keep their totals
+    roster[0] = [figures("B", party="R", receipts=2.20), figures("C", party="R", state="TX", receipts=3.30)]
+    asyncio.run(svc._refresh())
+    assert ("party", "D") not in svc._rollups
+    assert svc._rollups[("party", "R")] == (2, (550, 0, 0, 0))
+    assert svc._rollups[("state", "CA")] == (1, (220, 0, 0, 0))
+
+    # What was persisted reloads to the same rollups
+    members, stored, computed_at = svc._store.load(svc._cycle)
+    assert stored == svc._rollups
+    assert set(members) == {"B", "C"}
+    assert computed_at == svc._computed_at
+
+
+def test_failed_run_for_new_cycle_keeps_serving_old_rollups(tmp_path, monkeypatch):
+    roster = [[figures("A", receipts=1.00)]]
+    svc = service(tmp_path, roster)
+    asyncio.run(svc._refresh())
+    cycle, before = svc._cycle, dict(svc._rollups)
+
+    monkeypatch.setattr(rollups, "current_cycle", lambda: cycle + 2)
+    roster[0] = RuntimeError("FEC down")
+    with pytest.raises(RuntimeError):
+        asyncio.run(svc._refresh())
+    assert svc._cycle == cycle
+    assert svc._rollups == before
+    assert svc._failures == 1
+
+
+def test_refresh_delay_backs_off_before_anything_was_built(tmp_path):
+    svc = service(tmp_path, [[]])
+    assert svc._next_refresh_delay() == 0.0
+    svc._failures = 3
+    assert svc._next_refresh_delay() >= rollups.ROLLUP_RETRY_BACKOFF * 2
+
+
+def test_fetch_totals_follows_every_page(monkeypatch):
+    pages = {1: [{"candidate_id": "H01", "receipts": 1}], 2: [{"candidate_id": "H02", "receipts": 2}]}
+    requested = []
+
+    class Client:
+        async def get(self, path, params):
+            requested.append(params["page"])
+            body = {"results": pages[params["page"]], "pagination": {"pages": 2}}
+            return httpx.Response(200, json=body, request=httpx.Request("GET", "http://fec" + path))
+
+    monkeypatch.setattr(rollups, "upstream_clients", SimpleNamespace(fec=Client()))
+    totals = asyncio.run(rollups._fetch_totals(["H01", "H02"], 2024))
+    assert requested == [1, 2]
+    assert set(totals) == {"H01", "H02"}
+
+
+def test_only_stale_totals_are_refetched(monkeypatch):
+    roster = SimpleNamespace(
+        house_members=[SimpleNamespace(id="A", party="D", state="California")],
+        senate_members=[SimpleNamespace(id="B", party="R", state="Texas")],
+    )
+    requested = []
+
+    async def get_index():
+        return roster
+
+    async def lookup(bioguide_id):
+        return SimpleNamespace(candidate_id=f"H0{bioguide_id}")
+
+    async def fetch_totals(candidate_ids, cycle):
+        requested.append(candidate_ids)
+        return {c: {"receipts": 5.0} for c in candidate_ids}
+
+    monkeypatch.setattr(rollups, "congress_service", SimpleNamespace(get_index=get_index))
+    monkeypatch.setattr(rollups, "crosswalk_service", SimpleNamespace(lookup=lookup))
+    monkeypatch.setattr(rollups, "_fetch_totals", fetch_totals)
+    now = time.time()
+    previous = {
+        "A": MemberFigures("A", "H0A", "D", "CA", "house", (100, 0, 0, 0), now - 60),
+        "B": MemberFigures("B", "H0B", "R", "TX", "senate", (200, 0, 0, 0), now - rollups.ROLLUP_TOTALS_TTL - 1),
+    }
+    figures = asyncio.run(RollupService()._roster_figures(2024, previous))
+    assert requested == [["H0B"]]
+    assert figures["A"].totals == (100, 0, 0, 0) and figures["A"].fetched_at == previous["A"].fetched_at
+    assert figures["B"].totals == (500, 0, 0, 0) and figures["B"].fetched_at >= now
+
+
+def test_store_written_before_fetch_times_is_upgraded(tmp_path):
+    path = tmp_path / "rollups.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE members (cycle INTEGER NOT NULL, bioguide_id TEXT NOT NULL, candidate_id TEXT NOT NULL, "
+        "party TEXT NOT NULL, state TEXT NOT NULL, chamber TEXT NOT NULL, totals TEXT NOT NULL, "
+        "PRIMARY KEY (cycle, bioguide_id))"
+    )
+    conn.execute("INSERT INTO members VALUES (2024, 'A', 'H0A', 'D', 'CA', 'house', '[1,0,0,0]')")
+    conn.commit()
+    conn.close()
+    members, _, _ = RollupStore(path).load(2024)
+    assert members["A"].totals == (1, 0, 0, 0)
+    assert members["A"].fetched_at == 0.0
@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import services
+from services import CongressService
+
+
+def roster(version):
+    return [{
+        "bioguideId": "A000001", "name": f"Doe, Jane {version}", "partyName": "Democratic", "state": "Ohio",
+        "district": 1, "updateDate": f"2025-01-0{version}T00:00:00Z",
+        "terms": {"item": [{"chamber": "House of Representatives", "startYear": 2023}]},
+    }]
+
+
+class Lease:
+    def __init__(self, granted=True):
+        self.granted = granted
+
+    def acquire_lease(self, name, owner, ttl):
+        return self.granted
+
+    def release_lease(self, name, owner):
+        pass
+
+
+class Upstream:
+    """Stands in for Congress.gov: returns each scripted roster (or raises) in turn, after a short delay"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(services, "ROSTER_SNAPSHOT_ENABLED", False)
+    monkeypatch.setattr(services, "roster_store", None)
+    monkeypatch.setattr(services, "shared_backend", Lease())
+    monkeypatch.setattr(services, "ROSTER_REFRESH_JITTER", 0.0)
+
+
+def service_with(*outcomes):
+    service = CongressService()
+    service._load_all_members = Upstream(*outcomes)
+    return service
+
+
+def first_name(index):
+    return index.house_members[0].first_name
+
+
+def test_cold_callers_share_one_fetch():
+    service = service_with(roster(1))
+
+    async def run():
+        return await asyncio.gather(*(service.get_index() for _ in range(5)))
+
+    indexes = asyncio.run(run())
+    assert all(index is indexes[0] for index in indexes)
+    assert service._load_all_members.calls == 1
+
+
+def test_stale_roster_is_served_while_it_revalidates():
+    service = service_with(roster(1), roster(2))
+
+    async def run():
+        await service.get_index()
+        service._roster_fetched_at -= services.ROSTER_TTL
+        stale = await service.get_index()
+        # The refresh is running behind the response
+        assert service._refresh_task is not None and not service._refresh_task.done()
+        await service._refresh_task
+        return stale, await service.get_index()
+
+    stale, fresh = asyncio.run(run())
+    assert first_name(stale) == "Jane 1" and first_name(fresh) == "Jane 2"
+    assert service.roster_age() < 5
+
+
+def test_failed_refresh_backs_off_and_keeps_serving(monkeypatch):
+    monkeypatch.setattr(services, "ROSTER_RETRY_BACKOFF", 60.0)
+    service = service_with(roster(1), httpx.ConnectError("down"), httpx.ConnectError("down"), roster(3))
+
+    async def refresh_stale():
+        service._roster_fetched_at = time.time() - services.ROSTER_TTL
+        index = await service.get_index()
+        if service._refresh_task is not None:
+            await asyncio.gather(service._refresh_task, return_exceptions=True)
+        return index
+
+    async def run():
+        await service.get_index()
+        assert first_name(await refresh_stale()) == "Jane 1"
+        first_wait = service._next_attempt_at - time.time()
+        assert 25 <= first_wait <= 60
+        # Within the backoff nothing is fetched
+        await refresh_stale()
+        assert service._load_all_members.calls == 2
+
+        service._next_attempt_at = 0.0
+        await refresh_stale()
+        second_wait = service._next_attempt_at - time.time()
+        assert 55 <= second_wait <= 120 and service._refresh_failures == 2
+
+        service._next_attempt_at = 0.0
+        await refresh_stale()
+        return await service.get_index()
+
+    assert first_name(asyncio.run(run())) == "Jane 3"
+    assert service._refresh_failures == 0 and service._next_attempt_at == 0.0
+
+
+def test_cold_fetch_failure_reaches_the_caller():
+    service = service_with(httpx.ConnectError("down"))
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(service.get_index())
+
+
+def test_workers_without_the_lease_keep_serving_and_wait(monkeypatch):
+    service = service_with(roster(1), roster(2))
+
+    async def run():
+        await service.get_index()
+        monkeypatch.setattr(services, "shared_backend", Lease(granted=False))
+        service._roster_fetched_at -= services.ROSTER_TTL
+        await service.refresh_roster()
+
+    asyncio.run(run())
+    assert service._load_all_members.calls == 1
+    assert 0 < service._next_attempt_at - time.time() <= services.ROSTER_LEASE_WAIT
+
+
+def test_next_refresh_delay():
+    service = service_with()
+    assert service._next_refresh_delay() == 0.0
+
+    service._install(roster(1), services.RosterIndex.build(roster(1)), time.time())
+    assert services.ROSTER_TTL - 5 <= service._next_refresh_delay() <= services.ROSTER_TTL
+    assert not service._roster_is_stale()
+
+    service._roster_fetched_at -= services.ROSTER_TTL
+    assert service._roster_is_stale() and service._next_refresh_delay() == 0.0
+
+    # A scheduled retry wins over the TTL
+    service._next_attempt_at = time.time() + 30
+    assert 25 <= service._next_refresh_delay() <= 30
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+import services
+from roster_index import HOUSE, SENATE
+from roster_store import RosterStore
+from services import CongressService, HistoryUnavailable
+
+
+def record(bioguide_id, name, party, state, chamber, start, end=None, update_date="2021-02-01T00:00:00Z", **extra):
+    term = {"chamber": chamber, "startYear": start}
+    if end is not None:
+        term["endYear"] = end
+    return {
+        "bioguideId": bioguide_id, "name": name, "partyName": party, "state": state, "updateDate": update_date,
+        "terms": {"item": [term]}, **extra,
+    }
+
+
+# The 117th Congress sat in 2021-2023
+ROSTER_117 = [
+    record("A000001", "Doe, Jane", "Democratic", "California", HOUSE, 2019, district=3),
+    record("B000002", "Roe, Rick", "Republican", "Texas", SENATE, 2015, update_date="2021-03-01T00:00:00Z"),
+    record("C000003", "Poe, Pat", "Republican", "California", HOUSE, 2021, district=5),
+    # Left before the 117th began
+    record("D000004", "Moe, Max", "Democratic", "Ohio", HOUSE, 2013, 2021),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RosterStore(tmp_path / "history.sqlite3")
+
+
+def test_apply_keeps_members_of_that_congress_and_sets_the_watermark(store):
+    assert store.sync_state(117) is None
+    assert store.apply(117, ROSTER_117, "2021-03-01T00:00:00Z") == 3
+    assert [m["bioguideId"] for m in store.load(117)] == ["A000001", "B000002", "C000003"]
+    assert store.sync_state(117)[1] == "2021-03-01T00:00:00Z"
+    assert store.load(118) == []
+
+
+def test_reapplying_rewrites_only_changed_records_in_place(store):
+    store.apply(117, ROSTER_117, "2021-03-01T00:00:00Z")
+    updated = record("A000001", "Doe, Jane", "Independent", "California", HOUSE, 2019, update_date="2021-06-01T00:00:00Z")
+    assert store.apply(117, [*ROSTER_117[1:], updated], "2021-06-01T00:00:00Z") == 1
+    loaded = store.load(117)
+    # The update keeps the member's original position
+    assert [m["bioguideId"] for m in loaded] == ["A000001", "B000002", "C000003"]
+    assert loaded[0]["partyName"] == "Independent"
+    assert [m["bioguideId"] for _, m in store.query(117, party="i")] == ["A000001"]
+
+
+def test_watermark_never_moves_backwards(store):
+    store.apply(117, ROSTER_117, "2021-03-01T00:00:00Z")
+    store.apply(117, [], None)
+    assert store.sync_state(117)[1] == "2021-03-01T00:00:00Z"
+    store.apply(117, [], "2020-01-01T00:00:00Z")
+    assert store.sync_state(117)[1] == "2021-03-01T00:00:00Z"
+
+
+def test_query_filters_and_pages_by_rowid(store):
+    store.apply(117, ROSTER_117)
+    assert [m["bioguideId"] for _, m in store.query(117, chamber=HOUSE, state="CA")] == ["A000001", "C000003"]
+    assert [m["bioguideId"] for _, m in store.query(117, state="texas")] == ["B000002"]
+    first = store.query(117, limit=2)
+    second = store.query(117, after=first[-1][0], limit=2)
+    assert [m["bioguideId"] for _, m in first + second] == ["A000001", "B000002", "C000003"]
+
+
+class HistoryService(CongressService):
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.requests = []
+
+    async def _page_members(self, path, params):
+        self.requests.append((path, params))
+        return self.pages.pop(0)
+
+
+@pytest.fixture
+def service(store, monkeypatch):
+    monkeypatch.setattr(services, "roster_store", store)
+    return HistoryService([list(ROSTER_117)])
+
+
+def test_first_sync_is_full_and_later_ones_incremental(service, store):
+    assert asyncio.run(service.sync_congress(117)) == 3
+    updated = record("C000003", "Poe, Pat", "Republican", "California", HOUSE, 2021, update_date="2021-09-01T00:00:00Z")
+    service.pages.append([updated])
+    assert asyncio.run(service.sync_congress(117)) == 1
+    assert service.requests == [
+        ("/member/congress/117", {}),
+        ("/member", {"fromDateTime": "2021-03-01T00:00:00Z"}),
+    ]
+    assert store.sync_state(117)[1] == "2021-09-01T00:00:00Z"
+
+
+def test_congress_index_is_built_from_the_store_and_cached(service):
+    async def run():
+        first = await service.get_congress_index(117)
+        again = await service.get_congress_index(117)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert first is again
+    assert [m.id for m in first.house_members] == ["A000001", "C000003"]
+    assert [m.id for m in first.senate_members] == ["B000002"]
+    assert len(service.requests) == 1
+
+
+def test_stale_history_is_resynced_in_the_background(service, store, monkeypatch):
+    monkeypatch.setattr(services, "ROSTER_HISTORY_TTL", 0.0)
+    service.pages.extend([[], []])
+
+    async def run():
+        first = await service.get_congress_index(117)
+        # Served from the store at once while the incremental sync runs
+        stale = await service.get_congress_index(117)
+        await service._history_syncs[117]
+        return first, stale, await service.get_congress_index(117)
+
+    first, stale, fresh = asyncio.run(run())
+    assert stale is first and fresh is not first
+    assert [path for path, _ in service.requests][:2] == ["/member/congress/117", "/member"]
+
+
+def test_past_exports_page_through_the_store(service, monkeypatch):
+    monkeypatch.setattr(services, "HISTORY_PAGE_SIZE", 2)
+
+    async def collect(**filters):
+        return [m.id async for m in service.iter_members(congress=117, **filters)]
+
+    assert asyncio.run(collect()) == ["A000001", "B000002", "C000003"]
+    assert asyncio.run(collect(chamber=HOUSE, party="R")) == ["C000003"]
+
+
+def test_history_without_a_store_is_unavailable(monkeypatch):
+    monkeypatch.setattr(services, "roster_store", None)
+    with pytest.raises(HistoryUnavailable):
+        asyncio.run(CongressService().get_congress_index(117))
@@ -0,0 +1,64 @@
+import pytest
+
+from models import Member
+from search_index import MemberSearchIndex, _within_distance, normalize
+
+
+def member(id, first, last, state, district=None):
+    title = "Representative" if district else "Senator"
+    return Member(id=id, first_name=first, last_name=last, party="D", state=state, district=district, title=title)
+
+
+INDEX = MemberSearchIndex([
+    ("house", member("O1", "Alexandria", "Ocasio-Cortez", "New York", "14"), ("NY", "New York")),
+    ("senate", member("S1", "Charles", "Schumer", "New York"), ("NY", "New York")),
+    ("house", member("S2", "Adam", "Schiff", "California", "30"), ("CA", "California")),
+    ("senate", member("P1", "Alex", "Padilla", "California"), ("CA", "California")),
+    ("house", member("V1", "Nydia", "Velázquez", "New York", "7"), ("NY", "New York")),
+])
+
+
+def ids(query, **kwargs):
+    return [m.id for _, _, m in INDEX.search(query, **kwargs)]
+
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("Velázquez, Ocasio-Cortez") == ["velazquez", "ocasio", "cortez"]
+
+
+@pytest.mark.parametrize("a, b, limit, expected", [
+    ("schumer", "schumer", 0, True),
+    ("shumer", "schumer", 1, True),
+    ("schmuer", "schumer", 1, True),
+    ("shcumre", "schumer", 1, False),
+    ("padila", "padilla", 1, True),
+    ("pad", "padilla", 2, False),
+])
+def test_within_distance(a, b, limit, expected):
+    assert _within_distance(a, b, limit) is expected
+
+
+def test_exact_and_prefix_matches():
+    assert ids("schumer") == ["S1"]
+    # Prefixes follow typing; a last name outranks a first name
+    assert ids("sch") == ["S2", "S1"]
+    assert ids("alex") == ["P1", "O1"]
+
+
+def test_typos_are_tolerated_only_as_a_fallback():
+    assert ids("shumer") == ["S1"]
+    assert ids("velasquez") == ["V1"]
+    # Too short to fuzz
+    assert ids("shf") == []
+
+
+def test_every_query_token_must_match():
+    assert ids("new york") == ["O1", "S1", "V1"]
+    assert ids("alex california") == ["P1"]
+    assert ids("schumer california") == []
+
+
+def test_chamber_filter_and_limit():
+    assert ids("new york", chamber="senate") == ["S1"]
+    assert len(ids("new york", limit=2)) == 2
+    assert ids("  ,  ") == []
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+import shared_cache
+from cache import ProxyCache
+from shared_cache import SQLiteCacheBackend
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(shared_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteCacheBackend(tmp_path / "shared.sqlite3", max_entries=3)
+
+
+def test_entries_round_trip_and_are_replaced(backend):
+    assert backend.get("ns:k") is None
+    backend.set("ns:k", b'{"v":1}', 10.0, 70.0)
+    assert backend.get("ns:k") == (b'{"v":1}', 10.0, 70.0)
+    backend.set("ns:k", b'{"v":2}', 20.0, 80.0)
+    assert backend.get("ns:k") == (b'{"v":2}', 20.0, 80.0)
+
+
+def test_entries_are_visible_to_other_connections(backend, tmp_path):
+    backend.set("ns:k", b"1", 0.0, 60.0)
+    # Another worker process opens the same file
+    assert SQLiteCacheBackend(tmp_path / "shared.sqlite3").get("ns:k") == (b"1", 0.0, 60.0)
+
+
+def test_prune_drops_long_expired_rows_and_trims_to_the_cap(backend, clock, monkeypatch):
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_RETAIN_EXPIRED", 100.0)
+    backend.set("old", b"x", 0.0, 850.0)
+    backend.set("stale", b"x", 0.0, 950.0)
+    for i in range(3):
+        backend.set(f"k{i}", b"x", 0.0, 2000.0 + i)
+    backend.prune()
+    # "old" is past the retention window; "stale" survives that but is the soonest to expire over the cap
+    assert backend.get("old") is None and backend.get("stale") is None
+    assert [backend.get(f"k{i}") is not None for i in range(3)] == [True, True, True]
+
+
+def test_writes_prune_periodically(backend, monkeypatch):
+    monkeypatch.setattr(SQLiteCacheBackend, "PRUNE_EVERY", 5)
+    for i in range(5):
+        backend.set(f"k{i}", b"x", 0.0, 1e12 + i)
+    assert backend._conn().execute("SELECT count(*) FROM cache").fetchone()[0] == 3
+
+
+def test_lease_is_exclusive_until_released_or_expired(backend, clock):
+    assert backend.acquire_lease("sync", "a", ttl=60)
+    assert not backend.acquire_lease("sync", "b", ttl=60)
+    # The holder may renew
+    clock.now += 50
+    assert backend.acquire_lease("sync", "a", ttl=60)
+    clock.now += 50
+    assert not backend.acquire_lease("sync", "b", ttl=60)
+
+    # Releasing someone else's lease does nothing
+    backend.release_lease("sync", "b")
+    assert not backend.acquire_lease("sync", "b", ttl=60)
+    backend.release_lease("sync", "a")
+    assert backend.acquire_lease("sync", "b", ttl=60)
+
+    clock.now += 61
+    assert backend.acquire_lease("sync", "a", ttl=60)
+
+
+def test_leases_are_independent(backend):
+    assert backend.acquire_lease("bills", "a", ttl=60)
+    assert backend.acquire_lease("votes", "b", ttl=60)
+
+
+def test_one_workers_fetch_warms_another(backend):
+    first, second = ProxyCache(ttls={"ns": 60}, shared=backend), ProxyCache(ttls={"ns": 60}, shared=backend)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return {"v": len(calls)}
+
+    assert asyncio.run(first.get_or_fetch("ns", "k", fetch)) == {"v": 1}
+    assert asyncio.run(second.get_or_fetch("ns", "k", fetch)) == {"v": 1}
+    assert len(calls) == 1
+    assert (first.shared_hits, second.shared_hits) == (0, 1)
+    # Promoted into the second worker's L1
+    assert second.get("ns", "k") == {"v": 1}
+
+
+def test_batched_fetches_share_through_the_backend(backend):
+    first, second = ProxyCache(ttls={"ns": 60}, shared=backend), ProxyCache(ttls={"ns": 60}, shared=backend)
+    batches = []
+
+    async def fetch_many(keys):
+        batches.append(list(keys))
+        return {k: k.upper() for k in keys}
+
+    asyncio.run(first.get_or_fetch_many("ns", ["a", "b"], fetch_many, 10, 2))
+    results = asyncio.run(second.get_or_fetch_many("ns", ["a", "b", "c"], fetch_many, 10, 2))
+    assert results == {"a": "A", "b": "B", "c": "C"}
+    assert batches == [["a", "b"], ["c"]]
+    assert second.shared_hits == 2
+
+
+def test_a_failing_backend_never_fails_the_request():
+    class Broken:
+        def get(self, key):
+            raise OSError("disk gone")
+
+        def set(self, key, value, stored_at, expires_at):
+            raise OSError("disk gone")
+
+    proxy = ProxyCache(ttls={"ns": 60}, shared=Broken())
+
+    async def fetch():
+        return "fresh"
+
+    assert asyncio.run(proxy.get_or_fetch("ns", "k", fetch)) == "fresh"
@@ -0,0 +1,80 @@
+import asyncio
+import gzip
+import time
+
+import httpx
+import pytest
+
+import services
+from services import CongressService
+from snapshot import RosterSnapshot, read_snapshot, write_snapshot
+
+MEMBERS = [
+    {"bioguideId": "A000001", "name": "Doe, Jane", "partyName": "Democratic", "state": "California", "district": 3,
+     "updateDate": "2025-01-03T00:00:00Z",
+     "terms": {"item": [{"chamber": "House of Representatives", "startYear": 2023}]}},
+    {"bioguideId": "B000002", "name": "Roe, Rick", "partyName": "Republican", "state": "Texas",
+     "updateDate": "2025-01-04T00:00:00Z", "terms": {"item": [{"chamber": "Senate", "startYear": 2021}]}},
+]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    path = tmp_path / "roster-119.json.gz"
+    monkeypatch.setattr(services, "read_snapshot", lambda: read_snapshot(path))
+    monkeypatch.setattr(services, "write_snapshot", lambda snapshot: write_snapshot(snapshot, path))
+    return path
+
+
+def offline_service():
+    service = CongressService()
+    calls = []
+
+    async def load_all_members():
+        calls.append(1)
+        raise httpx.ConnectError("Congress.gov unreachable")
+
+    service._load_all_members = load_all_members
+    return service, calls
+
+
+def test_round_trip_and_rejects_other_formats(tmp_path):
+    path = tmp_path / "roster.json.gz"
+    write_snapshot(RosterSnapshot(members=MEMBERS, fetched_at=123.0), path)
+    snapshot = read_snapshot(path)
+    assert snapshot.members == MEMBERS and snapshot.fetched_at == 123.0
+    assert read_snapshot(path, congress=118) is None
+
+    path.write_bytes(gzip.compress(b'{"format": 0}'))
+    assert read_snapshot(path) is None
+    path.write_bytes(b"not gzip")
+    assert read_snapshot(path) is None
+    assert read_snapshot(tmp_path / "missing.json.gz") is None
+
+
+def test_offline_cold_start_serves_the_snapshot(snapshot_path):
+    # A day-old snapshot: served at once, then revalidated against an upstream that is down
+    write_snapshot(RosterSnapshot(members=MEMBERS, fetched_at=time.time() - 86400), snapshot_path)
+    service, calls = offline_service()
+
+    async def run():
+        index = await service.get_index()
+        # The background revalidation fails without taking the roster down
+        with pytest.raises(httpx.ConnectError):
+            await service._refresh_task
+        return index, await service.get_index()
+
+    first, after_failure = asyncio.run(run())
+    assert [m.id for m in first.house_members] == ["A000001"]
+    assert [m.id for m in first.senate_members] == ["B000002"]
+    assert after_failure is first
+    assert calls == [1]
+    assert service._next_attempt_at > time.time()
+    assert asyncio.run(service.member_update_date("b000002")) == (True, "2025-01-04T00:00:00Z")
+
+
+def test_offline_cold_start_without_a_snapshot_fails(snapshot_path):
+    service, calls = offline_service()
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(service.get_index())
+    assert calls == [1]
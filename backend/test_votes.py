@@ -0,0 +1,75 @@
+import asyncio
+import math
+
+import numpy as np
+import pytest
+
+from votes import NAY, NOT_VOTING, YEA, Vote, VoteService, agreement, cast_code, party_scores
+
+# Rows: D1, D2, D3, R1, I1 and D4, who sat for none of the votes
+PARTIES = np.array(["D", "D", "D", "R", "I", "D"])
+POSITIONS = np.array([
+    [YEA, YEA, NAY],
+    [YEA, YEA, NAY],
+    [NAY, YEA, NOT_VOTING],
+    [NAY, YEA, YEA],
+    [YEA, YEA, 0],
+    [0, 0, 0],
+], dtype=np.int8)
+
+
+def test_cast_code():
+    assert cast_code("Aye") == YEA
+    assert cast_code("Not Guilty") == NAY
+    assert cast_code("Not Voting") == NOT_VOTING
+    assert cast_code(None) == cast_code("Present")
+
+
+def test_agreement_counts_only_shared_yea_and_nay_votes():
+    share, shared = agreement(POSITIONS)
+    assert shared[0, 3] == 3 and share[0, 3] == pytest.approx(1 / 3)
+    assert shared[0, 2] == 2 and share[0, 2] == pytest.approx(0.5)
+    assert shared[2, 4] == 2 and share[2, 4] == pytest.approx(0.5)
+    assert shared[2, 2] == 2 and share[2, 2] == 1.0
+    assert shared[0, 5] == 0 and math.isnan(share[0, 5])
+    np.testing.assert_array_equal(shared, shared.T)
+
+
+def test_party_scores():
+    scores = party_scores(POSITIONS, PARTIES)
+    # Votes 0 and 2 split the parties; vote 1 was unanimous
+    assert scores["party_unity_votes"] == 2
+    # The independent sides with the Democrats more often than the Republicans
+    assert scores["caucus"] == ["D", "D", "D", "R", "D", "D"]
+    assert scores["votes_cast"] == [3, 3, 2, 3, 2, 0]
+    assert scores["votes_with_party_pct"] == [1.0, 1.0, 0.5, 1.0, 1.0, None]
+    assert scores["party_unity_pct"] == [1.0, 1.0, 0.0, 1.0, 1.0, None]
+    assert scores["missed_votes_pct"] == [0.0, 0.0, 0.3333, 0.0, 0.0, None]
+
+
+class RecordingStore:
+    def __init__(self):
+        self.saved = []
+
+    def save(self, congress, chamber, votes):
+        self.saved.extend(v.number for v in votes)
+
+
+def roll_call(number):
+    async def run():
+        if number % 3 == 0:
+            raise RuntimeError(f"roll call {number} failed")
+        return Vote(1, number, None, None, None, None, {})
+    return run
+
+
+def test_failed_roll_calls_do_not_discard_their_batch():
+    store = RecordingStore()
+    saved = asyncio.run(VoteService()._fetch_and_save(store, 119, "house", [roll_call(n) for n in range(1, 8)]))
+    assert saved == 5
+    assert sorted(store.saved) == [1, 2, 4, 5, 7]
+
+
+def test_sync_fails_when_every_roll_call_fails():
+    with pytest.raises(RuntimeError):
+        asyncio.run(VoteService()._fetch_and_save(RecordingStore(), 119, "house", [roll_call(3), roll_call(6)]))
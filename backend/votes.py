@@ -0,0 +1,592 @@
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+try:
+    from .crosswalk import LEGISLATORS_FILE
+    from .http_clients import upstream_clients
+    from .ratelimit import upstream_priority, BACKGROUND
+    from .responses import PreparedBody, prepare_json
+    from .shared_cache import shared_backend
+    from .snapshot import CURRENT_CONGRESS, DATA_CACHE_DIR
+except ImportError:
+    from crosswalk import LEGISLATORS_FILE
+    from http_clients import upstream_clients
+    from ratelimit import upstream_priority, BACKGROUND
+    from responses import PreparedBody, prepare_json
+    from shared_cache import shared_backend
+    from snapshot import CURRENT_CONGRESS, DATA_CACHE_DIR
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+VOTE_STORE_PATH = Path(os.getenv("VOTE_STORE_PATH", str(DATA_CACHE_DIR / "votes.sqlite3")))
+VOTE_SYNC_CONGRESSES = tuple(
+    int(c) for c in os.getenv("VOTE_SYNC_CONGRESSES", str(CURRENT_CONGRESS)).split(",") if c.strip()
+)
+VOTE_SYNC_INTERVAL = float(os.getenv("VOTE_SYNC_INTERVAL_SECONDS", "3600"))
+VOTE_SYNC_RETRY_BACKOFF = float(os.getenv("VOTE_SYNC_RETRY_BACKOFF_SECONDS", "300"))
+VOTE_BACKGROUND_SYNC = os.getenv("VOTE_BACKGROUND_SYNC", "true").lower() in ("1", "true", "yes")
+# Roll calls fetched per chamber per sync; the backlog of a new Congress is worked off over several syncs
+VOTES_PER_SYNC = int(os.getenv("VOTES_PER_SYNC", "400"))
+VOTE_SYNC_LEASE_TTL = 900.0
+
+CHAMBERS = ("house", "senate")
+# Regular sessions of a Congress
+SESSIONS = (1, 2)
+# Congress.gov's largest page
+VOTE_PAGE_SIZE = 250
+VOTE_FETCH_CONCURRENCY = 8
+# Roll calls written per transaction, so an interrupted sync keeps what it fetched
+VOTE_SAVE_BATCH = 50
+
+# Positions as stored in the matrix; 0 means the member did not sit for the vote
+YEA, NAY, PRESENT, NOT_VOTING = 1, -1, 2, 3
+CAST_CODES = {
+    "yea": YEA, "aye": YEA, "guilty": YEA,
+    "nay": NAY, "no": NAY, "not guilty": NAY,
+    "present": PRESENT, "present, giving live pair": PRESENT,
+    "not voting": NOT_VOTING,
+}
+MAJOR_PARTIES = ("D", "R")
+
+
+class Vote(NamedTuple):
+    """One roll call; casts maps bioguide ID -> (position, name, party, state)"""
+    session: int
+    number: int
+    date: Optional[str]
+    question: Optional[str]
+    result: Optional[str]
+    update_date: Optional[str]
+    casts: Dict[str, Tuple[int, str, str, str]]
+
+
+def cast_code(text: Optional[str]) -> int:
+    return CAST_CODES.get((text or "").strip().lower(), PRESENT)
+
+
+class VoteStore:
+    """Roll calls per Congress and chamber, each stored as an int8 column indexed by member code"""
+
+    def __init__(self, path: Path = VOTE_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Member codes are row numbers of the matrix; they are only ever appended
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS vote_members (congress INTEGER NOT NULL, chamber TEXT NOT NULL, "
+            "code INTEGER NOT NULL, bioguide_id TEXT NOT NULL, name TEXT, party TEXT, state TEXT, "
+            "PRIMARY KEY (congress, chamber, code), UNIQUE (congress, chamber, bioguide_id))"
+        )
+        # positions: one int8 per member code known when the vote was written; later members read as 0
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS votes (congress INTEGER NOT NULL, chamber TEXT NOT NULL, "
+            "session INTEGER NOT NULL, number INTEGER NOT NULL, date TEXT, question TEXT, result TEXT, "
+            "update_date TEXT, positions BLOB NOT NULL, PRIMARY KEY (congress, chamber, session, number))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS vote_syncs (congress INTEGER NOT NULL, chamber TEXT NOT NULL, "
+            "synced_at REAL NOT NULL, changed_at REAL NOT NULL, PRIMARY KEY (congress, chamber))"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def known(self, congress: int, chamber: str) -> Dict[Tuple[int, int], Optional[str]]:
+        """(session, number) -> updateDate of every stored roll call"""
+        rows = self._conn().execute(
+            "SELECT session, number, update_date FROM votes WHERE congress = ? AND chamber = ?", (congress, chamber)
+        )
+        return {(s, n): u for s, n, u in rows}
+
+    def version(self, congress: int, chamber: str) -> Optional[float]:
+        """When the chamber's votes last changed, or None if it was never synced"""
+        row = self._conn().execute(
+            "SELECT changed_at FROM vote_syncs WHERE congress = ? AND chamber = ?", (congress, chamber)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, congress: int, chamber: str, votes: Sequence[Vote]) -> None:
+        """Write roll calls, appending codes for members not seen before in this Congress and chamber"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            codes = dict(conn.execute(
+                "SELECT bioguide_id, code FROM vote_members WHERE congress = ? AND chamber = ?", (congress, chamber)
+            ).fetchall())
+            members = {}
+            for vote in sorted(votes, key=lambda v: (v.session, v.number)):
+                for bioguide_id, (_, name, party, state) in vote.casts.items():
+                    # Later roll calls win, so a party switch shows up as of the latest vote
+                    members[bioguide_id] = (name, party, state)
+            for bioguide_id in members:
+                if bioguide_id not in codes:
+                    codes[bioguide_id] = len(codes)
+            conn.executemany(
+                "INSERT INTO vote_members (congress, chamber, code, bioguide_id, name, party, state) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(congress, chamber, code) DO UPDATE SET "
+                "name = excluded.name, party = excluded.party, state = excluded.state",
+                [(congress, chamber, codes[b], b, *fields) for b, fields in members.items()],
+            )
+
+            rows = []
+            for vote in votes:
+                positions = np.zeros(len(codes), dtype=np.int8)
+                for bioguide_id, cast in vote.casts.items():
+                    positions[codes[bioguide_id]] = cast[0]
+                rows.append((
+                    congress, chamber, vote.session, vote.number, vote.date, vote.question, vote.result,
+                    vote.update_date, positions.tobytes(),
+                ))
+            conn.executemany(
+                "INSERT OR REPLACE INTO votes (congress, chamber, session, number, date, question, result, "
+                "update_date, positions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def mark_synced(self, congress: int, chamber: str, changed: bool) -> None:
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO vote_syncs (congress, chamber, synced_at, changed_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(congress, chamber) DO UPDATE SET synced_at = excluded.synced_at, "
+            "changed_at = CASE WHEN ? THEN excluded.changed_at ELSE vote_syncs.changed_at END",
+            (congress, chamber, now, now, changed),
+        )
+
+    def load(self, congress: int, chamber: str) -> Tuple[List[tuple], np.ndarray, List[tuple]]:
+        """(members by code, members x votes int8 matrix, vote metadata) for a Congress and chamber"""
+        conn = self._conn()
+        members = conn.execute(
+            "SELECT bioguide_id, name, party, state FROM vote_members WHERE congress = ? AND chamber = ? ORDER BY code",
+            (congress, chamber),
+        ).fetchall()
+        rows = conn.execute(
+            "SELECT session, number, date, question, result, positions FROM votes "
+            "WHERE congress = ? AND chamber = ? ORDER BY session, number",
+            (congress, chamber),
+        ).fetchall()
+        matrix = np.zeros((len(members), len(rows)), dtype=np.int8)
+        for j, row in enumerate(rows):
+            column = np.frombuffer(row[5], dtype=np.int8)
+            matrix[:column.size, j] = column
+        return members, matrix, [row[:5] for row in rows]
+
+
+def agreement(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(share of shared yea/nay votes on which each pair agreed, NaN without any; shared vote counts)"""
+    yea = (positions == YEA).astype(np.float32)
+    nay = (positions == NAY).astype(np.float32)
+    cast = yea + nay
+    # Counts stay exact in float32 far beyond any Congress's number of roll calls
+    shared = cast @ cast.T
+    agreed = yea @ yea.T + nay @ nay.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(shared > 0, agreed / shared, np.nan)
+    return share, shared.astype(np.int32)
+
+
+def party_majorities(positions: np.ndarray, parties: np.ndarray) -> np.ndarray:
+    """Position of each major party's majority on every vote (YEA, NAY, or 0 on a tie); rows follow MAJOR_PARTIES"""
+    majorities = np.zeros((len(MAJOR_PARTIES), positions.shape[1]), dtype=np.int8)
+    for i, party in enumerate(MAJOR_PARTIES):
+        rows = positions[parties == party]
+        if rows.size:
+            majorities[i] = np.sign((rows == YEA).sum(axis=0) - (rows == NAY).sum(axis=0))
+    return majorities
+
+
+def _share(numerator: np.ndarray, denominator: np.ndarray) -> List[Optional[float]]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.round(numerator / denominator, 4)
+    return [None if d == 0 else r for r, d in zip(ratio.tolist(), denominator.tolist())]
+
+
+def party_scores(positions: np.ndarray, parties: np.ndarray) -> dict:
+    """Party-unity and votes-with-party shares for every member, in matrix row order"""
+    majorities = party_majorities(positions, parties)
+    # Party-unity votes: most voting Democrats opposed most voting Republicans
+    unity_votes = (majorities[0] != 0) & (majorities[1] != 0) & (majorities[0] != majorities[1])
+    cast = (positions == YEA) | (positions == NAY)
+
+    # Independents are scored against whichever major party's majority they side with more often
+    caucus = np.full(len(parties), -1, dtype=np.int64)
+    for i, party in enumerate(MAJOR_PARTIES):
+        caucus[parties == party] = i
+    others = np.flatnonzero(caucus < 0)
+    if others.size:
+        sided = ((positions[others, None, :] == majorities[None, :, :]) & cast[others, None, :]).sum(axis=2)
+        caucus[others] = np.argmax(sided, axis=1)
+
+    majority = majorities[caucus]
+    defined = cast & (majority != 0)
+    with_party = defined & (positions == majority)
+    unity_cast = defined & unity_votes
+    sitting = positions != 0
+    return {
+        "caucus": [MAJOR_PARTIES[c] for c in caucus.tolist()],
+        "votes_cast": cast.sum(axis=1).tolist(),
+        "missed_votes_pct": _share((positions == NOT_VOTING).sum(axis=1), sitting.sum(axis=1)),
+        "votes_with_party_pct": _share(with_party.sum(axis=1), defined.sum(axis=1)),
+        "party_unity_pct": _share((with_party & unity_votes).sum(axis=1), unity_cast.sum(axis=1)),
+        "party_unity_votes": int(unity_votes.sum()),
+    }
+
+
+class ChamberVotes:
+    """A chamber's vote matrix with agreement and party scores, computed once per stored version"""
+
+    def __init__(self, congress: int, chamber: str, version: float, members: List[tuple], positions: np.ndarray,
+                 votes: List[tuple]):
+        self.congress = congress
+        self.chamber = chamber
+        self.version = version
+        self.ids = [m[0] for m in members]
+        self.rows = {bioguide_id: i for i, bioguide_id in enumerate(self.ids)}
+        self.members = [{"bioguide_id": m[0], "name": m[1], "party": m[2], "state": m[3]} for m in members]
+        self.vote_count = len(votes)
+        self.agreement, self.shared = agreement(positions)
+        scores = party_scores(positions, np.array([m[2] for m in members], dtype=object))
+        header = {
+            "congress": congress, "chamber": chamber, "updated_at": version, "votes": self.vote_count,
+            "latest_vote": {"session": votes[-1][0], "number": votes[-1][1], "date": votes[-1][2]} if votes else None,
+        }
+        self.scores_body: PreparedBody = prepare_json({
+            **header,
+            "party_unity_votes": scores["party_unity_votes"],
+            "members": [
+                {**member, **{field: scores[field][i] for field in (
+                    "caucus", "votes_cast", "missed_votes_pct", "votes_with_party_pct", "party_unity_pct")}}
+                for i, member in enumerate(self.members)
+            ],
+        })
+        # All pairs as one square matrix in `members` order; null where a pair shared no yea/nay vote
+        rounded = np.round(self.agreement.astype(np.float64), 4).tolist()
+        self.pairs_body: PreparedBody = prepare_json({
+            **header,
+            "members": self.ids,
+            "agreement": [[None if v != v else v for v in row] for row in rounded],
+        })
+
+    def member(self, bioguide_id: str) -> Optional[dict]:
+        """One member's agreement with everyone else in the chamber, most in agreement first"""
+        row = self.rows.get(bioguide_id)
+        if row is None:
+            return None
+        share, shared = self.agreement[row], self.shared[row]
+        order = [i for i in np.argsort(-np.nan_to_num(share, nan=-1.0), kind="stable").tolist() if i != row]
+        return {
+            "congress": self.congress, "chamber": self.chamber, "updated_at": self.version, "votes": self.vote_count,
+            "member": self.members[row],
+            "agreement": [
+                {**self.members[i], "agreement": None if share[i] != share[i] else round(float(share[i]), 4),
+                 "shared_votes": int(shared[i])}
+                for i in order
+            ],
+        }
+
+
+class VoteDataNotReady(Exception):
+    """The chamber's votes have not been synced into the store yet"""
+
+
+def _senate_date(text: Optional[str]) -> Optional[str]:
+    # e.g. "January 9, 2025, 12:03 PM"
+    try:
+        return datetime.strptime((text or "").strip(), "%B %d, %Y, %I:%M %p").date().isoformat()
+    except ValueError:
+        return text
+
+
+class VoteService:
+    """Ingests House and Senate roll calls into the vote store and serves scores computed over the matrix"""
+
+    def __init__(self, congresses: Sequence[int] = VOTE_SYNC_CONGRESSES):
+        self.congresses = tuple(congresses)
+        self._store: Optional[VoteStore] = None
+        self._store_failed = False
+        self._chambers: Dict[Tuple[int, str], ChamberVotes] = {}
+        self._building: Dict[Tuple[int, str, float], asyncio.Future] = {}
+        self._sync_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._last_sync = 0.0
+        self._lease_owner = f"{os.getpid()}:{id(self)}"
+
+    def _open_store(self) -> Optional[VoteStore]:
+        if self._store is None and not self._store_failed:
+            try:
+                self._store = VoteStore()
+            except (OSError, sqlite3.Error) as e:
+                # Vote endpoints answer 503 rather than 500 until the process is restarted with a usable path
+                logger.warning("Vote store unavailable, vote scores disabled: %s", e)
+                self._store_failed = True
+        return self._store
+
+    async def _house_listing(self, congress: int, session: int) -> List[dict]:
+        client = upstream_clients.congress
+        items: List[dict] = []
+        offset = 0
+        while True:
+            response = await client.get(
+                f"/house-vote/{congress}/{session}", params={"offset": offset, "limit": VOTE_PAGE_SIZE}
+            )
+            if response.status_code == 404:
+                # The session has not started
+                return items
+            response.raise_for_status()
+            data = response.json()
+            page = data.get("houseRollCallVotes", [])
+            items.extend(page)
+            offset += VOTE_PAGE_SIZE
+            if not page or offset >= data.get("pagination", {}).get("count", 0):
+                return items
+
+    async def _house_vote(self, congress: int, item: dict) -> Vote:
+        session, number = int(item["sessionNumber"]), int(item["rollCallNumber"])
+        response = await upstream_clients.congress.get(f"/house-vote/{congress}/{session}/{number}/members")
+        response.raise_for_status()
+        data = response.json().get("houseRollCallVoteMemberVotes", {})
+        casts = {}
+        for r in data.get("results", []):
+            bioguide_id = r.get("bioguideID") or r.get("bioguideId")
+            if bioguide_id:
+                name = f"{r.get('lastName', '')}, {r.get('firstName', '')}".strip(", ")
+                casts[bioguide_id] = (cast_code(r.get("voteCast")), name, (r.get("voteParty") or "")[:1], r.get("voteState"))
+        return Vote(
+            session, number, (data.get("startDate") or item.get("startDate") or "")[:10] or None,
+            data.get("voteQuestion") or item.get("voteQuestion"), data.get("result") or item.get("result"),
+            item.get("updateDate"), casts,
+        )
+
+    async def _sync_house(self, store: VoteStore, congress: int) -> int:
+        """Fetch House roll calls that are new or whose updateDate moved since they were stored"""
+        known = await asyncio.to_thread(store.known, congress, "house")
+        stale = []
+        for session in SESSIONS:
+            for item in await self._house_listing(congress, session):
+                key = (int(item["sessionNumber"]), int(item["rollCallNumber"]))
+                if key not in known or known[key] != item.get("updateDate"):
+                    stale.append((key, item))
+        stale.sort(key=lambda s: s[0])
+        return await self._fetch_and_save(
+            store, congress, "house", [lambda i=item: self._house_vote(congress, i) for _, item in stale]
+        )
+
+    async def _senate_menu(self, congress: int, session: int) -> List[int]:
+        response = await upstream_clients.senate_votes.get(f"/vote{congress}{session}/vote_menu_{congress}_{session}.xml")
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+        return [int(n.text) for n in root.iter("vote_number") if n.text and n.text.strip().isdigit()]
+
+    async def _lis_ids(self) -> Dict[str, str]:
+        """Senate LIS member ID -> bioguide ID for current legislators"""
+        response = await upstream_clients.legislators.get(LEGISLATORS_FILE)
+        response.raise_for_status()
+        return {
+            ids["lis"]: ids["bioguide"]
+            for ids in (legislator.get("id", {}) for legislator in response.json())
+            if ids.get("lis") and ids.get("bioguide")
+        }
+
+    async def _senate_vote(self, congress: int, session: int, number: int, lis_ids: Dict[str, str]) -> Vote:
+        response = await upstream_clients.senate_votes.get(
+            f"/vote{congress}{session}/vote_{congress}_{session}_{number:05d}.xml"
+        )
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+        casts = {}
+        for m in root.iter("member"):
+            # Senators who have since left office are missing from legislators-current and are skipped
+            bioguide_id = lis_ids.get(m.findtext("lis_member_id", ""))
+            if bioguide_id:
+                name = f"{m.findtext('last_name', '')}, {m.findtext('first_name', '')}".strip(", ")
+                casts[bioguide_id] = (
+                    cast_code(m.findtext("vote_cast")), name, m.findtext("party", "")[:1], m.findtext("state"),
+                )
+        # Senate roll calls are not revised once posted, so they carry no updateDate
+        return Vote(
+            session, number, _senate_date(root.findtext("vote_date")), root.findtext("question"),
+            root.findtext("vote_result"), None, casts,
+        )
+
+    async def _sync_senate(self, store: VoteStore, congress: int) -> int:
+        """Fetch Senate roll calls not yet stored"""
+        known = await asyncio.to_thread(store.known, congress, "senate")
+        stale = []
+        for session in SESSIONS:
+            stale.extend((session, n) for n in await self._senate_menu(congress, session) if (session, n) not in known)
+        if not stale:
+            return 0
+        stale.sort()
+        lis_ids = await self._lis_ids()
+        return await self._fetch_and_save(
+            store, congress, "senate",
+            [lambda s=s, n=n: self._senate_vote(congress, s, n, lis_ids) for s, n in stale],
+        )
+
+    async def _fetch_and_save(self, store: VoteStore, congress: int, chamber: str, fetches: list) -> int:
+        """Run up to VOTES_PER_SYNC roll call fetches, saving them in batches as they complete"""
+        semaphore = asyncio.Semaphore(VOTE_FETCH_CONCURRENCY)
+
+        async def fetch(run) -> Vote:
+            async with semaphore:
+                return await run()
+
+        fetches = fetches[:VOTES_PER_SYNC]
+        saved = 0
+        errors: List[BaseException] = []
+        for start in range(0, len(fetches), VOTE_SAVE_BATCH):
+            results = await asyncio.gather(
+                *(fetch(run) for run in fetches[start:start + VOTE_SAVE_BATCH]), return_exceptions=True
+            )
+            # Failed roll calls stay unknown to the store, so the next sync fetches just those again
+            votes = [r for r in results if not isinstance(r, BaseException)]
+            errors.extend(r for r in results if isinstance(r, BaseException))
+            if votes:
+                await asyncio.to_thread(store.save, congress, chamber, votes)
+                saved += len(votes)
+        if errors:
+            logger.warning("Could not fetch %s of %s %s roll calls: %s", len(errors), len(fetches), chamber, errors[0])
+            if not saved:
+                raise errors[0]
+        return saved
+
+    async def _try_acquire_lease(self, lease: str) -> bool:
+        try:
+            return await asyncio.to_thread(shared_backend.acquire_lease, lease, self._lease_owner, VOTE_SYNC_LEASE_TTL)
+        except Exception:
+            # Without a working shared tier every worker syncs for itself
+            return True
+
+    async def sync(self, congress: int) -> Dict[str, int]:
+        """Bring both chambers of a Congress up to date; returns roll calls written per chamber"""
+        lease = f"votes:{congress}"
+        if not await self._try_acquire_lease(lease):
+            # Another worker is syncing this Congress into the same store
+            return {}
+        try:
+            store = self._open_store()
+            if store is None:
+                return {}
+            written = {}
+            with upstream_priority(BACKGROUND):
+                for chamber, run in (("house", self._sync_house), ("senate", self._sync_senate)):
+                    written[chamber] = await run(store, congress)
+                    await asyncio.to_thread(store.mark_synced, congress, chamber, written[chamber] > 0)
+            logger.info("Synced roll call votes for the %sth Congress: %s", congress, written)
+            return written
+        finally:
+            try:
+                await asyncio.to_thread(shared_backend.release_lease, lease, self._lease_owner)
+            except Exception:
+                pass
+
+    async def _sync_all(self) -> None:
+        try:
+            for congress in self.congresses:
+                await self.sync(congress)
+            self._last_sync = time.time()
+            self._failures = 0
+        except Exception:
+            self._failures += 1
+            raise
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Vote sync failed: %s", task.exception())
+
+    def _trigger_sync(self) -> asyncio.Task:
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.ensure_future(self._sync_all())
+            self._sync_task.add_done_callback(self._log_failure)
+        return self._sync_task
+
+    async def chamber(self, congress: int, chamber: str) -> ChamberVotes:
+        """The chamber's scores, rebuilt from the store only after a sync has changed its votes"""
+        store = self._open_store()
+        if store is None:
+            raise VoteDataNotReady("The vote store is unavailable on this server")
+        version = await asyncio.to_thread(store.version, congress, chamber)
+        if version is None:
+            self._trigger_sync()
+            raise VoteDataNotReady(f"{chamber.capitalize()} votes for the {congress}th Congress are still being ingested")
+        current = self._chambers.get((congress, chamber))
+        if current is not None and current.version == version:
+            return current
+
+        # Concurrent requests after a sync share one rebuild
+        key = (congress, chamber, version)
+        future = self._building.get(key)
+        if future is None:
+            async def build() -> ChamberVotes:
+                members, positions, votes = await asyncio.to_thread(store.load, congress, chamber)
+                built = await asyncio.to_thread(ChamberVotes, congress, chamber, version, members, positions, votes)
+                self._chambers[(congress, chamber)] = built
+                return built
+
+            future = self._building[key] = asyncio.ensure_future(build())
+            future.add_done_callback(lambda f: self._building.pop(key, None))
+        return await asyncio.shield(future)
+
+    def _next_sync_delay(self) -> float:
+        if self._failures:
+            return min(VOTE_SYNC_INTERVAL, VOTE_SYNC_RETRY_BACKOFF * 2 ** (self._failures - 1)) * random.uniform(0.5, 1.0)
+        if not self._last_sync:
+            return 0.0
+        return max(0.0, self._last_sync + VOTE_SYNC_INTERVAL - time.time()) + random.uniform(0, 30)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_sync_delay())
+            try:
+                await asyncio.shield(self._trigger_sync())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Logged by the sync task; the backoff is picked up from the failure count
+                pass
+
+    def start_background_sync(self) -> None:
+        if not VOTE_BACKGROUND_SYNC:
+            return
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._sync_loop())
+
+    async def stop_background_sync(self) -> None:
+        tasks = [t for t in (self._loop_task, self._sync_task) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._sync_task = None
+
+
+vote_service = VoteService()